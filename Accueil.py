@@ -8,19 +8,18 @@ st.set_page_config(
     page_icon="🌍",
     layout="wide"
 )
-import streamlit as st
-import base64
+from static_assets import asset_data_uri, optimized_asset
+import perf
+
+perf.page("accueil")  # mesures si ISUB_PERF=1 ou ?perf=1
 
 # -----------------------------
-# Fonction pour convertir image en base64
+# Logos : variantes redimensionnées (WebP), encodées une fois par version du fichier
 # -----------------------------
-def img_to_base64(path):
-    with open(path, "rb") as f:
-        data = f.read()
-    return base64.b64encode(data).decode()
-
-logo1_base64 = img_to_base64("assets/cameroun-seal.png")
-logo2_base64 = img_to_base64("assets/minepat-logo.png")
+with perf.stage("logos") as s:
+    logo1_uri = asset_data_uri("assets/cameroun-seal.png")
+    logo2_uri = asset_data_uri("assets/minepat-logo.png")
+    s.bytes = len(logo1_uri) + len(logo2_uri)
 
 # -----------------------------
 # Header fixe style administratif
@@ -77,9 +76,9 @@ st.markdown(f"""
     <div class="line1">République du Cameroun</div>
     <div class="line2">Paix – Travail – Patrie</div>
     <div class="line3">
-        <img src="data:image/png;base64,{logo1_base64}">
+        <img src="{logo1_uri}">
         Ministère de l’Économie, de la Planification et de l’Aménagement du Territoire (MINEPAT)
-        <img src="data:image/png;base64,{logo2_base64}">
+        <img src="{logo2_uri}">
     </div>
 </div>
 
@@ -195,7 +194,7 @@ st.markdown('<div class="section-title">Mot du Ministre</div>', unsafe_allow_htm
 
 col_min_photo, col_min_text = st.columns([1, 3])
 with col_min_photo:
-    st.image("assets/ministre.png", use_column_width=True)
+    st.image(optimized_asset("assets/ministre.png"), use_column_width=True)
 
 with col_min_text:
     st.markdown("""
@@ -217,7 +216,7 @@ st.markdown('<div class="section-title">Mot du Secrétaire Général</div>', uns
 
 col_sg_photo, col_sg_text = st.columns([1, 3])
 with col_sg_photo:
-    st.image("assets/secretaire.jpg", use_column_width=True)
+    st.image(optimized_asset("assets/secretaire.jpg"), use_column_width=True)
 
 with col_sg_text:
     st.markdown("""
@@ -239,7 +238,7 @@ st.markdown('<div class="section-title">Mot du Directeur Général de l’Écono
 
 col_dg_photo, col_dg_text = st.columns([1, 3])
 with col_dg_photo:
-    st.image("assets/directeur_general.jpg", use_column_width=True)
+    st.image(optimized_asset("assets/directeur_general.jpg"), use_column_width=True)
 
 with col_dg_text:
     st.markdown("""
@@ -305,3 +304,5 @@ st.markdown("""
     <p>© République du Cameroun — 2025</p>
 </div>
 """, unsafe_allow_html=True)
+
+perf.panel()
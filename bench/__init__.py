@@ -0,0 +1 @@
+"""Mesures de performance à l'échelle (python -m bench --help)."""
@@ -0,0 +1,151 @@
+"""
+Suite de mesures : chargement du classeur, find_column, clean_numeric, indicateurs,
+scénarios, balayage des hypothèses, classement, export Excel et construction des
+figures, pour plusieurs tailles de base.
+
+    python -m bench --sizes 10 100 1000          # compare à bench/baseline.json
+    python -m bench --sizes 10 100 1000 --save   # enregistre une nouvelle référence
+    python -m bench --sizes 10000 --repeat 1     # dimensionnement national
+
+Les fonctions mises en cache (memo.py) sont mesurées via `.uncached`.
+Une mesure est signalée en régression si elle dépasse la référence de plus de
+`--tolerance` (25 % par défaut) et d'au moins `--min-delta` secondes.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from bench.synthetic import workbook
+from charts import filiere_figure, group_by_filiere, small_multiples
+from dataset import _attach_snapshot, _parse, _publish_snapshot, file_digest
+from indicators import TC, compute_indicators
+from forecast import fit_models
+from montecarlo import Uncertainty, fan_chart
+from ranking import aggregates
+from scenarios import HORIZON_MAX, production_sweep, project_frame
+from utils import clean_numeric, clean_numeric_frame, find_column, to_excel_bytes
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+SIZES = (10, 100, 1000)
+PAGE = 10  # filières par page du tableau de bord
+
+
+def measure(func, repeat: int) -> float:
+    """Meilleur temps (secondes) sur `repeat` exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def cases(n_filieres: int, n_years: int):
+    """(nom, fonction) des mesures pour une taille de base donnée."""
+    path = workbook(n_filieres, n_years)
+    digest = file_digest(path)
+    ds = _parse(path, digest)
+    _publish_snapshot(ds)
+    schema = ds.schema
+    raw = pd.read_excel(path)  # colonnes brutes (texte mal formaté compris)
+    measures = [c for c in (schema.importation, schema.production, schema.cible) if c]
+    base = ds.frame[[schema.produit, schema.annee] + measures]
+    cols = {"annee": schema.annee, "importation": schema.importation, "production": schema.production,
+            "taux": TC, "cible": schema.cible}
+    groups = group_by_filiere(ds.frame, schema.produit, schema.annee)
+    page = {k: groups[k] for k in list(groups)[:PAGE]}
+    agg = aggregates.uncached(ds)
+    last = ds.frame.sort_values(schema.annee).drop_duplicates(schema.produit, keep="last").head(100)
+
+    return [
+        ("load_workbook", lambda: _parse(path, digest)),
+        ("attach_snapshot", lambda: _attach_snapshot(path, digest)),
+        ("find_column", lambda: [find_column(raw, k) for k in (["produit"], ["année", "annee"],
+                                                                ["import"], ["production"], ["cible"])]),
+        ("clean_numeric", lambda: clean_numeric(raw[schema.importation])),
+        ("clean_numeric_frame", lambda: clean_numeric_frame(raw, exclude=[schema.produit])),
+        ("select_page", lambda: ds.slices(ds.filieres[:PAGE], (1990, 2000))),
+        ("compute_indicators", lambda: compute_indicators(base, schema)),
+        ("project_frame", lambda: project_frame.uncached(ds.frame.dropna(subset=[TC]), schema.produit,
+                                                         schema.annee, {TC: TC}, HORIZON_MAX)),
+        ("forecast_fit", lambda: fit_models.uncached(ds, TC, (0.0, 1.0), jobs=1)),
+        ("fan_chart_100", lambda: fan_chart(tuple(last[schema.produit]), last[TC].fillna(0).to_numpy(),
+                                            last[schema.annee].to_numpy(), HORIZON_MAX, Uncertainty())),
+        ("sweep_50x50", lambda: production_sweep(ds, np.linspace(-0.05, 0.15, 50), np.linspace(-0.3, 0.1, 50),
+                                                 [HORIZON_MAX]).share_reaching(HORIZON_MAX)),
+        ("ranking_aggregates", lambda: aggregates.uncached(ds)),
+        ("ranking_query", lambda: agg.rank("TCAM du TC", (1995, 2005), PAGE)),
+        ("to_excel_bytes", lambda: to_excel_bytes.uncached(ds.frame)),
+        ("filiere_figure", lambda: filiere_figure.uncached(page[next(iter(page))], cols)),
+        ("small_multiples_page", lambda: small_multiples.uncached(page, cols)),
+    ]
+
+
+def run(sizes=SIZES, n_years: int = 50, repeat: int = 3, only=None, progress=print) -> dict:
+    results = {}
+    for n in sizes:
+        key = f"{n}x{n_years}"
+        results[key] = {}
+        for name, func in cases(n, n_years):
+            if only and name not in only:
+                continue
+            seconds = measure(func, repeat)
+            results[key][name] = seconds
+            if progress:
+                progress(f"{key:>10} {name:<22} {seconds * 1000:10.1f} ms")
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta: float) -> list:
+    """Liste des (taille, mesure, référence, actuel) en régression."""
+    regressions = []
+    for size, timings in results.items():
+        for name, seconds in timings.items():
+            ref = baseline.get(size, {}).get(name)
+            if ref is not None and seconds > ref * (1 + tolerance) and seconds - ref > min_delta:
+                regressions.append((size, name, ref, seconds))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="nombres de filières")
+    parser.add_argument("--years", type=int, default=50, help="années par filière (défaut : 50)")
+    parser.add_argument("--repeat", type=int, default=3, help="exécutions par mesure (meilleur temps)")
+    parser.add_argument("--only", nargs="+", help="mesures à exécuter")
+    parser.add_argument("--baseline", default=BASELINE, help="fichier de référence JSON")
+    parser.add_argument("--save", action="store_true", help="enregistrer les résultats comme référence")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="dépassement relatif toléré")
+    parser.add_argument("--min-delta", type=float, default=0.005, help="dépassement absolu toléré (s)")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.years, args.repeat, args.only)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+
+    if args.save:
+        merged = {size: dict(baseline.get(size, {}), **timings) for size, timings in results.items()}
+        merged = dict(baseline, **merged)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"machine": {"python": platform.python_version(), "platform": platform.platform(),
+                                   "cpus": os.cpu_count(), "numpy": np.__version__},
+                       "results": merged}, f, indent=2, sort_keys=True)
+        print(f"référence enregistrée dans {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance, args.min_delta)
+    for size, name, ref, seconds in regressions:
+        print(f"RÉGRESSION {size} {name} : {ref * 1000:.1f} ms -> {seconds * 1000:.1f} ms "
+              f"(+{(seconds / ref - 1) * 100:.0f} %)", file=sys.stderr)
+    if not baseline:
+        print("aucune référence : lancer avec --save pour en créer une", file=sys.stderr)
+    return 1 if regressions else 0
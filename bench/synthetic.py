@@ -0,0 +1,102 @@
+"""
+Classeurs synthétiques au format de BD_Global.xlsx, de 10 à 10 000 filières,
+avec une part de nombres saisis « à la française » (« 1 234 567,5 », « 12,5 % »,
+« 1.234,5 », cellules « n.d. » ou vides) comme dans les fichiers reçus des services.
+"""
+import os
+
+import numpy as np
+import xlsxwriter
+
+COLUMNS = ["produits", "Taux de couverture", "Taux d'import-substitution", "Année",
+           "Importation (en tonne)", "Production nationale (en tonne)",
+           "Demande nationale (en tonne)", "cible_piisah_production"]
+FIRST_YEAR = 1975
+CACHE_DIR = os.path.join(".cache", "bench")
+
+
+def _french(value: float, rng) -> str:
+    """Écriture « saisie à la main » d'un nombre."""
+    style = rng.integers(4)
+    if style == 0:
+        return f"{value:,.1f}".replace(",", " ").replace(".", ",")
+    if style == 1:
+        return f"{value:,.2f}".replace(",", " ").replace(".", ",")
+    if style == 2:
+        return f"{value:,.1f}".replace(",", "#").replace(".", ",").replace("#", ".")
+    return f"{value:.0f}"
+
+
+def synthetic_frame(n_filieres: int, n_years: int = 50, messy: float = 0.05, seed: int = 0) -> dict:
+    """
+    Colonnes du classeur (listes Python, une valeur par cellule).
+    `messy` : part des cellules numériques écrites comme du texte mal formaté.
+    """
+    rng = np.random.default_rng(seed)
+    n = n_filieres * n_years
+    produits = np.repeat([f"Filière {i:05d}" for i in range(n_filieres)], n_years)
+    annees = np.tile(np.arange(FIRST_YEAR, FIRST_YEAR + n_years), n_filieres)
+
+    t = np.tile(np.arange(n_years), n_filieres)
+    base_imp = np.repeat(rng.lognormal(11, 1.5, n_filieres), n_years)
+    base_prod = np.repeat(rng.lognormal(11, 1.5, n_filieres), n_years)
+    importation = np.round(base_imp * np.exp(0.01 * t + 0.1 * rng.standard_normal(n)))
+    production = np.round(base_prod * np.exp(0.03 * t + 0.1 * rng.standard_normal(n)))
+    production[rng.random(n) < 0.01] = 0.0
+    demande = importation + production
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tc = np.where(demande > 0, production / demande, np.nan)
+    cible = np.round(production * (1 + rng.uniform(0, 0.3, n)))
+
+    columns = {
+        "produits": produits.tolist(),
+        "Taux de couverture": tc,
+        "Taux d'import-substitution": 1 - tc,
+        "Année": annees.tolist(),
+        "Importation (en tonne)": importation,
+        "Production nationale (en tonne)": production,
+        "Demande nationale (en tonne)": demande,
+        "cible_piisah_production": cible,
+    }
+    for name in COLUMNS[1:]:
+        if name == "Année":
+            continue
+        values = [None if v != v else float(v) for v in columns[name]]
+        for i in np.flatnonzero(rng.random(n) < messy):
+            v = values[i]
+            roll = rng.random()
+            if roll < 0.05 or v is None:
+                values[i] = rng.choice(["n.d.", "", "-"])
+            elif name.startswith("Taux") and roll < 0.5:
+                values[i] = f"{v * 100:.1f} %".replace(".", ",")
+            else:
+                values[i] = _french(v, rng)
+        columns[name] = values
+    return columns
+
+
+def write_workbook(path: str, n_filieres: int, n_years: int = 50, messy: float = 0.05, seed: int = 0) -> str:
+    """Écrit le classeur en flux (mémoire constante) et renvoie son chemin."""
+    columns = synthetic_frame(n_filieres, n_years, messy, seed)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp.xlsx"
+    wb = xlsxwriter.Workbook(tmp, {"constant_memory": True, "strings_to_numbers": False})
+    ws = wb.add_worksheet("BD_Global")
+    ws.write_row(0, 0, COLUMNS)
+    data = [columns[c] for c in COLUMNS]
+    for r in range(len(data[0])):
+        for c, col in enumerate(data):
+            v = col[r]
+            if v is not None and v != "":
+                ws.write(r + 1, c, v)
+    wb.close()
+    os.replace(tmp, path)
+    return path
+
+
+def workbook(n_filieres: int, n_years: int = 50, messy: float = 0.05, seed: int = 0) -> str:
+    """Classeur synthétique mis en cache dans .cache/bench (généré une seule fois)."""
+    path = os.path.join(CACHE_DIR, f"bd_{n_filieres}x{n_years}_m{messy:g}_s{seed}.xlsx")
+    if not os.path.exists(path):
+        write_workbook(path, n_filieres, n_years, messy, seed)
+    return path
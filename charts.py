@@ -0,0 +1,109 @@
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from memo import memoize
+
+# Couleurs du tableau de bord
+COLORS = {
+    "Importation": "blue",
+    "Production": "orange",
+    "Taux de couverture": "green",
+    "Cible PIISAH": "red"
+}
+
+# Mise en page commune, construite une seule fois
+DASHBOARD_LAYOUT = go.Layout(
+    xaxis=dict(title="Année"),
+    yaxis=dict(
+        title="Importation / Production",
+        showgrid=True,
+        zeroline=True
+    ),
+    yaxis2=dict(
+        title="Taux de couverture",
+        overlaying="y",
+        side="right",
+        showgrid=False
+    ),
+    barmode='group',
+    template='plotly_white',
+    legend=dict(
+        orientation="v",
+        x=1.05,
+        y=1,
+        bordercolor="Black",
+        borderwidth=1
+    ),
+    margin=dict(l=50, r=80, t=40, b=40)
+)
+
+# Hauteur d'une filière dans la vue « petits multiples »
+FACET_HEIGHT = 320
+
+
+def group_by_filiere(df: pd.DataFrame, col_produits: str, col_annee: str) -> dict:
+    """Découpe le tableau filtré en une seule passe : {filière: lignes triées par année}."""
+    df = df.sort_values([col_produits, col_annee], kind="stable")
+    return {k: g for k, g in df.groupby(col_produits, sort=False, observed=True)}
+
+
+def filiere_traces(df_p: pd.DataFrame, cols: dict, show_import=True, show_prod=True, show_taux=True,
+                   showlegend=True) -> list:
+    """
+    Traces d'une filière : barres Importation/Production (axe y1), Taux (axe y2)
+    et Cible PIISAH si seule la production est affichée.
+    `cols` : colonnes "annee", "importation", "production", "taux", "cible" (éventuellement None).
+    """
+    x = df_p[cols["annee"]]
+    traces = []
+
+    # Diagrammes en bar pour Importation et Production
+    if show_import:
+        traces.append((go.Bar(x=x, y=df_p[cols["importation"]], name="Importation",
+                              marker_color=COLORS["Importation"], legendgroup="Importation",
+                              showlegend=showlegend), False))
+    if show_prod:
+        traces.append((go.Bar(x=x, y=df_p[cols["production"]], name="Production",
+                              marker_color=COLORS["Production"], legendgroup="Production",
+                              showlegend=showlegend), False))
+
+    # Ligne Taux avec axe Y séparé
+    if show_taux:
+        traces.append((go.Scatter(x=x, y=df_p[cols["taux"]], mode="lines+markers", name="Taux de couverture",
+                                  line=dict(color=COLORS["Taux de couverture"], width=3, dash='dot'),
+                                  marker=dict(size=6), legendgroup="Taux", showlegend=showlegend), True))
+
+    # Cible PIISAH si Importation et Taux décochés
+    if cols.get("cible") and not show_import and not show_taux and show_prod and len(df_p):
+        # Valeur fictive pour 2026 : 5% au-dessus de la dernière production
+        x_cible = list(x) + [2026]
+        y_cible = list(df_p[cols["cible"]]) + [df_p[cols["production"]].iloc[-1] * 1.05]
+        traces.append((go.Scatter(x=x_cible, y=y_cible, mode='lines+markers', name="Cible PIISAH",
+                                  line=dict(color=COLORS["Cible PIISAH"], dash='dash'), marker=dict(size=8),
+                                  legendgroup="Cible", showlegend=showlegend), False))
+    return traces
+
+
+@memoize
+def filiere_figure(df_p: pd.DataFrame, cols: dict, **show) -> go.Figure:
+    """Une figure par filière, avec la mise en page commune."""
+    fig = go.Figure(layout=DASHBOARD_LAYOUT)
+    for trace, secondary in filiere_traces(df_p, cols, **show):
+        trace.yaxis = "y2" if secondary else "y"
+        fig.add_trace(trace)
+    return fig
+
+
+@memoize
+def small_multiples(groups: dict, cols: dict, **show) -> go.Figure:
+    """Toutes les filières de `groups` dans une seule figure, une ligne par filière."""
+    names = list(groups)
+    fig = make_subplots(rows=len(names), cols=1, subplot_titles=[f"📌 {n}" for n in names],
+                        specs=[[{"secondary_y": True}]] * len(names), vertical_spacing=0.25 / len(names))
+    for row, name in enumerate(names, start=1):
+        for trace, secondary in filiere_traces(groups[name], cols, showlegend=(row == 1), **show):
+            fig.add_trace(trace, row=row, col=1, secondary_y=secondary)
+    fig.update_layout(barmode='group', template='plotly_white', height=FACET_HEIGHT * len(names),
+                      legend=DASHBOARD_LAYOUT.legend, margin=DASHBOARD_LAYOUT.margin)
+    return fig
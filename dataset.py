@@ -0,0 +1,441 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401
+except ImportError:  # instantanés Arrow désactivés
+    pa = None
+
+import perf
+from indicators import INDICATORS, compute_indicators
+from schema import Schema, resolve_schema, schema_from_dict, schema_to_dict
+from utils import clean_numeric_frame
+
+# Classeur, ou répertoire d'un magasin consolidé par ingest.py
+DATA_PATH = os.environ.get("ISUB_DATA", "BD_Global.xlsx")
+
+# Incrémenter dès que le nettoyage change : les instantanés existants sont alors reconstruits
+SIDECAR_VERSION = 9
+
+# Écart relatif maximal accepté pour stocker une mesure en float32. Par défaut (0), seules
+# les colonnes exactement représentables sont réduites (tonnages entiers < 2**24...) et les
+# ratios calculés restent en float64 ; 1e-6 accepte l'arrondi float32 (~7 chiffres, erreur
+# relative ≤ 6e-8) pour toutes les mesures ; valeur négative : aucune réduction
+FLOAT32_RTOL = float(os.environ.get("ISUB_FLOAT32_RTOL", "0"))
+
+# Période de surveillance du classeur (secondes), cf. watch_dataset
+WATCH_INTERVAL = float(os.environ.get("ISUB_WATCH_INTERVAL", "2"))
+
+logger = logging.getLogger("isub.dataset")
+
+
+@dataclass(frozen=True, eq=False)
+class Dataset:
+    """
+    Instantané nettoyé de la base de données, partagé entre pages et sessions.
+    Ne pas modifier `_frame` : utiliser `frame`, qui renvoie une vue indépendante.
+    Les colonnes sont résolues une fois par version dans `schema` et les indicateurs
+    (cf. indicators.py) sont déjà calculés ; `coerced` liste, par colonne, les valeurs
+    brutes que le nettoyage n'a pas pu convertir.
+    Les lignes sont triées par (filière, année) : `slices` et `select` extraient des
+    tranches contiguës par recherche dichotomique, sans parcourir tout le tableau.
+    Le tableau est compacté (cf. `compact_frame`) ; `compaction` en donne le bilan.
+    """
+    path: str
+    digest: str
+    schema: Schema
+    coerced: dict
+    _frame: pd.DataFrame = field(repr=False)
+    compaction: dict = field(default_factory=dict)
+
+    @property
+    def cache_key(self) -> str:
+        """Identifie le contenu (fichier + version du nettoyage) pour les caches dérivés."""
+        return f"{self.digest}:{SIDECAR_VERSION}"
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        # Copie superficielle : les données ne sont pas dupliquées,
+        # mais les ajouts de colonnes d'une page ne touchent pas l'instantané.
+        return self._frame.copy(deep=False)
+
+    def source_frame(self) -> pd.DataFrame:
+        """
+        Colonnes du classeur seulement (sans les indicateurs calculés), mesures en float64 :
+        valeurs exactes des cellules nettoyées tant que la compaction est sans perte.
+        """
+        out = self._frame[[c for c in self._frame.columns if c not in INDICATORS]].copy(deep=False)
+        for col in out.columns:
+            if out[col].dtype == "float32":
+                out[col] = out[col].astype("float64")
+        return out
+
+    @cached_property
+    def _index(self):
+        # Index des positions, construit une fois par version : {filière: (début, fin)} et années
+        produits = self._frame[self.schema.produit].to_numpy(dtype=object)
+        years = self._frame[self.schema.annee].to_numpy()
+        change = np.flatnonzero(produits[1:] != produits[:-1]) + 1
+        starts, stops = np.r_[0, change], np.r_[change, len(produits)]
+        offsets = {produits[a]: (int(a), int(b)) for a, b in zip(starts, stops) if b > a}
+        return offsets, years
+
+    @property
+    def filieres(self) -> tuple:
+        """Filières dans l'ordre du tri."""
+        return tuple(self._index[0])
+
+    def bounds(self, filiere, years=None) -> tuple:
+        """Positions [début, fin) des lignes d'une filière, restreintes à la plage `years` (incluse)."""
+        offsets, all_years = self._index
+        start, stop = offsets.get(filiere, (0, 0))
+        if years is not None and stop > start:
+            block = all_years[start:stop]
+            start, stop = (start + int(np.searchsorted(block, years[0], "left")),
+                           start + int(np.searchsorted(block, years[1], "right")))
+        return start, stop
+
+    def slices(self, filieres, years=None) -> dict:
+        """{filière: lignes triées par année} pour les filières ayant des données sur la plage."""
+        out = {}
+        for f in filieres:
+            start, stop = self.bounds(f, years)
+            if stop > start:
+                out[f] = self._frame.iloc[start:stop]
+        return out
+
+    def select(self, filieres=None, years=None) -> pd.DataFrame:
+        """Lignes des filières et de la plage d'années demandées, dans l'ordre du tri."""
+        names = self.filieres if filieres is None else filieres
+        spans = sorted(b for b in (self.bounds(f, years) for f in set(names)) if b[1] > b[0])
+        if not spans:
+            return self._frame.iloc[0:0]
+        return self._frame.iloc[np.concatenate([np.arange(a, b) for a, b in spans])]
+
+
+_lock = threading.Lock()
+_digests = {}    # chemin -> ((mtime_ns, taille), sha256)
+_snapshots = {}  # chemin -> Dataset (dernière version seulement)
+_watchers = {}   # chemin -> (thread, événement d'arrêt)
+
+
+def file_digest(path: str) -> str:
+    """Empreinte SHA-256 du contenu du fichier."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _version_file(path: str) -> str:
+    # Magasin consolidé : sa version est celle de son manifeste
+    if os.path.isdir(path):
+        from ingest import MANIFEST
+        return os.path.join(path, MANIFEST)
+    return path
+
+
+def source_digest(path: str) -> str:
+    """Empreinte du classeur, ou des partitions d'un magasin consolidé (cf. ingest.store_digest)."""
+    if os.path.isdir(path):
+        from ingest import store_digest
+        return store_digest(path)
+    return file_digest(path)
+
+
+def _current_digest(path: str) -> str:
+    # Le contenu n'est relu que si la date de modification ou la taille change
+    st = os.stat(_version_file(path))
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = _digests.get(path)
+    if cached and cached[0] == sig:
+        return cached[1]
+    digest = source_digest(path)
+    _digests[path] = (sig, digest)
+    return digest
+
+
+def snapshot_dir(path: str) -> str:
+    """Répertoire des instantanés Arrow du classeur (BD_Global.xlsx -> BD_Global.xlsx.snapshots)."""
+    return path + ".snapshots"
+
+
+def _pointer_path(path: str) -> str:
+    return os.path.join(snapshot_dir(path), "CURRENT")
+
+
+def read_pointer(path: str) -> dict:
+    """Version publiée : {"file", "digest", "version"} (vide si aucune)."""
+    try:
+        with open(_pointer_path(path), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _to_arrow(df: pd.DataFrame):
+    # Colonne par colonne : les NaN restent des valeurs (et non des nulls Arrow),
+    # ce qui permet la conversion sans copie à la lecture
+    arrays = {}
+    for c in df.columns:
+        col = df[c]
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            arrays[c] = pa.DictionaryArray.from_arrays(
+                pa.array(col.cat.codes.to_numpy()), pa.array(col.cat.categories.to_numpy(dtype=object)))
+        elif pd.api.types.is_numeric_dtype(col) and not pd.api.types.is_extension_array_dtype(col):
+            arrays[c] = pa.array(col.to_numpy())
+        else:
+            arrays[c] = pa.array(col, from_pandas=True)
+    return pa.table(arrays)
+
+
+def _attach_snapshot(path: str, digest: str):
+    """
+    Projette en mémoire (lecture seule) l'instantané publié s'il correspond à cette
+    version du classeur, sinon None. Les colonnes numériques pointent directement
+    dans le fichier : le cache de pages du système en garde une seule copie par machine.
+    """
+    pointer = read_pointer(path)
+    if pa is None or pointer.get("digest") != digest or pointer.get("version") != SIDECAR_VERSION:
+        return None
+    try:
+        source = pa.memory_map(os.path.join(snapshot_dir(path), pointer["file"]), "r")
+        table = pa.ipc.open_file(source).read_all()
+        info = json.loads((table.schema.metadata or {}).get(b"isub", b"{}"))
+        if info.get("digest") != digest:
+            return None
+        df = table.to_pandas(split_blocks=True)
+    except (OSError, KeyError, ValueError, pa.ArrowException):
+        return None  # instantané illisible : on repart du classeur
+    return Dataset(path=path, digest=digest, schema=schema_from_dict(info["schema"]),
+                   coerced=info["coerced"], _frame=df, compaction=info.get("compaction", {}))
+
+
+def _publish_snapshot(ds: Dataset, keep: int = 2):
+    """
+    Écrit l'instantané Arrow IPC puis bascule le pointeur CURRENT, chacun par
+    renommage atomique. Les anciennes versions au-delà de `keep` sont supprimées :
+    les lecteurs qui les projettent encore gardent leur mapping jusqu'à la fin.
+    """
+    if pa is None:
+        return
+    table = _to_arrow(ds._frame)
+    info = {"digest": ds.digest, "version": SIDECAR_VERSION,
+            "schema": schema_to_dict(ds.schema), "coerced": ds.coerced, "compaction": ds.compaction}
+    table = table.replace_schema_metadata({b"isub": json.dumps(info).encode()})
+
+    directory = snapshot_dir(ds.path)
+    name = f"{ds.digest[:16]}-v{SIDECAR_VERSION}.arrow"
+    target = os.path.join(directory, name)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    pointer_tmp = f"{_pointer_path(ds.path)}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, target)
+        with open(pointer_tmp, "w", encoding="utf-8") as f:
+            json.dump({"file": name, "digest": ds.digest, "version": SIDECAR_VERSION}, f)
+        os.replace(pointer_tmp, _pointer_path(ds.path))
+    except OSError:
+        # Répertoire en lecture seule : l'application fonctionne sans instantané
+        for leftover in (tmp, pointer_tmp):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        return
+
+    old = sorted((e for e in os.scandir(directory) if e.name.endswith(".arrow") and e.name != name),
+                 key=lambda e: e.stat().st_mtime, reverse=True)
+    for entry in old[keep - 1:]:
+        try:
+            os.remove(entry.path)
+        except OSError:  # Windows : fichier encore projeté par un lecteur
+            pass
+
+
+def compact_frame(df: pd.DataFrame, schema, rtol: float = FLOAT32_RTOL):
+    """
+    Représentation compacte partagée par toutes les sessions : filières en catégorie,
+    années entières en int16, mesures en float32 si chaque valeur reste à `rtol` près.
+    Renvoie (DataFrame, {"bytes_before", "bytes_after", "dtypes"}).
+    """
+    before = int(df.memory_usage(index=True, deep=True).sum())
+    out = df.copy(deep=False)
+    out[schema.produit] = out[schema.produit].astype("category")
+
+    years = out[schema.annee].to_numpy(dtype="float64")
+    if (len(years) and np.isfinite(years).all() and (years == np.round(years)).all()
+            and years.min() >= np.iinfo("int16").min and years.max() <= np.iinfo("int16").max):
+        out[schema.annee] = years.astype("int16")
+
+    if rtol >= 0:
+        for col in out.columns:
+            if col in (schema.produit, schema.annee) or not pd.api.types.is_numeric_dtype(out[col]) \
+                    or pd.api.types.is_bool_dtype(out[col]):
+                continue
+            values = out[col].to_numpy(dtype="float64")
+            narrow = values.astype("float32")
+            with np.errstate(invalid="ignore", over="ignore"):
+                err = np.abs(narrow.astype("float64") - values)
+            finite = np.isfinite(values)
+            if np.array_equal(np.isfinite(narrow), finite) and (err[finite] <= rtol * np.abs(values[finite])).all():
+                out[col] = narrow
+
+    after = int(out.memory_usage(index=True, deep=True).sum())
+    return out, {"bytes_before": before, "bytes_after": after,
+                 "dtypes": {str(c): str(t) for c, t in out.dtypes.items()}}
+
+
+def _read_source(path: str) -> pd.DataFrame:
+    if os.path.isdir(path):
+        from ingest import load_store
+        return load_store(path)
+    return pd.read_excel(path)
+
+
+def _parse(path: str, digest: str) -> Dataset:
+    with perf.stage("lecture Excel") as s:
+        df = _read_source(path)
+        s.rows = len(df)
+    df.columns = [str(c).strip() for c in df.columns]
+
+    schema = resolve_schema(df.columns).require("produit", "annee")
+    col_produits, col_annee = schema.produit, schema.annee
+
+    # Nettoyage (les colonnes déjà numériques ne sont pas reconverties)
+    with perf.stage("nettoyage") as s:
+        df, coerced = clean_numeric_frame(df, exclude=[col_produits])
+        df = df.dropna(subset=[col_produits, col_annee])
+        df[col_produits] = df[col_produits].astype(str).str.strip()
+        df = df.reset_index(drop=True)
+        s.rows = len(df)
+
+    # Indicateurs (TC, TIS, croissances...) calculés une fois par version
+    if schema.production and schema.importation:
+        with perf.stage("indicateurs"):
+            df = compute_indicators(df, schema)
+
+    # Tri (filière, année) sur lequel repose l'index de Dataset
+    df = df.sort_values([col_produits, col_annee], kind="stable").reset_index(drop=True)
+
+    with perf.stage("compaction") as s:
+        df, compaction = compact_frame(df, schema)
+        s.bytes = compaction["bytes_after"]
+
+    return Dataset(path=path, digest=digest, schema=schema, coerced=coerced, _frame=df,
+                   compaction=compaction)
+
+
+def _build(path: str, digest: str) -> Dataset:
+    with perf.stage("instantané Arrow"):
+        ds = _attach_snapshot(path, digest)
+    if ds is None:
+        ds = _parse(path, digest)
+        with perf.stage("publication instantané"):
+            _publish_snapshot(ds)
+            # Relecture projetée : ce processus partage lui aussi la copie du cache de pages
+            ds = _attach_snapshot(path, digest) or ds
+    return ds
+
+
+def load_dataset(path: str = DATA_PATH, watch: bool = False) -> Dataset:
+    """
+    Renvoie l'instantané nettoyé du fichier, chargé une seule fois par version
+    (chemin + date de modification/taille + empreinte du contenu).
+    Les processus d'une même machine projettent le même instantané Arrow (cf.
+    `_attach_snapshot`) ; seul le premier à voir une nouvelle version relit le classeur.
+    Avec `watch`, un thread surveille ensuite le fichier (cf. `watch_dataset`) et
+    les appels suivants renvoient directement le dernier instantané complet.
+    `path` peut aussi désigner un magasin consolidé par ingest.py (répertoire).
+    """
+    path = os.path.abspath(path)
+    ds = _snapshots.get(path)
+    if ds is not None and path in _watchers:
+        return ds  # tenu à jour en arrière-plan : aucune requête n'attend une relecture
+    with perf.stage("chargement"), _lock:
+        digest = _current_digest(path)
+        ds = _snapshots.get(path)
+        if ds is None or ds.digest != digest:
+            ds = _build(path, digest)
+            _snapshots[path] = ds
+    if watch:
+        watch_dataset(path)
+    return ds
+
+
+def _signature(path: str):
+    try:
+        st = os.stat(_version_file(path))
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _refresh(path: str, sig):
+    """Lit et valide la nouvelle version puis remplace l'instantané partagé."""
+    digest = source_digest(path)
+    current = _snapshots.get(path)
+    if current is None or current.digest != digest:
+        ds = _build(path, digest)  # ValueError si colonnes essentielles absentes
+        if ds._frame.empty:
+            raise ValueError("aucune ligne exploitable")
+        with _lock:
+            _digests[path] = (sig, digest)
+            _snapshots[path] = ds
+        logger.info("%s : nouvelle version %s chargée", path, digest[:12])
+    else:
+        with _lock:
+            _digests[path] = (sig, digest)
+
+
+def _watch(path: str, interval: float, stop: threading.Event):
+    # Référence : la version déjà chargée (une modification survenue entre-temps est vue au 1er tour)
+    last, pending = _digests.get(path, (None, None))[0], None
+    while not stop.wait(interval):
+        sig = _signature(path)
+        if sig is None or sig == last:
+            pending = None
+            continue
+        if sig != pending:
+            pending = sig  # écriture peut-être en cours : attendre une période stable
+            continue
+        try:
+            _refresh(path, sig)
+        except Exception as e:  # fichier invalide ou illisible : l'ancienne version reste servie
+            logger.warning("%s : nouvelle version ignorée (%s)", path, e)
+        last, pending = sig, None
+
+
+def watch_dataset(path: str = DATA_PATH, interval: float = WATCH_INTERVAL):
+    """
+    Démarre (une fois par processus et par fichier) un thread qui surveille le classeur.
+    Une modification stable pendant une période est relue et validée hors du
+    chemin des requêtes, puis l'instantané est remplacé d'un bloc ; les pages en
+    cours gardent la version qu'elles ont déjà obtenue.
+    """
+    path = os.path.abspath(path)
+    with _lock:
+        if path in _watchers:
+            return
+        stop = threading.Event()
+        thread = threading.Thread(target=_watch, args=(path, interval, stop),
+                                  name=f"isub-watch:{os.path.basename(path)}", daemon=True)
+        _watchers[path] = (thread, stop)
+    thread.start()
+
+
+def stop_watching(path: str = DATA_PATH):
+    entry = _watchers.pop(os.path.abspath(path), None)
+    if entry:
+        entry[1].set()
+        entry[0].join()
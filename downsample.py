@@ -0,0 +1,99 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from memo import memoize
+
+# Nombre maximal de points envoyés au navigateur par série (0 : pas de réduction)
+POINT_BUDGET = 2000
+
+
+def _as_float(values) -> np.ndarray:
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype("datetime64[ns]").astype("int64")
+    return values.astype("float64")
+
+
+def minmax_indices(y, budget: int) -> np.ndarray:
+    """
+    Indices conservés par seaux min/max : la série est découpée en (budget - 2)/2 seaux
+    de taille égale et l'on garde le minimum et le maximum de chacun, plus les
+    extrémités (au plus `budget` points). Entièrement vectorisé.
+    """
+    y = _as_float(y)
+    n = len(y)
+    if budget <= 0 or n <= budget:
+        return np.arange(n)
+    if budget < 4:  # pas de place pour un seau en plus des extrémités
+        return np.array([0, n - 1])[:budget]
+
+    n_buckets = (budget - 2) // 2
+    size = -(-n // n_buckets)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, size)
+    base = np.arange(n_buckets) * size
+
+    lo = np.argmin(np.where(np.isnan(buckets), np.inf, buckets), axis=1) + base
+    hi = np.argmax(np.where(np.isnan(buckets), -np.inf, buckets), axis=1) + base
+    idx = np.concatenate(([0, n - 1], lo, hi))
+    return np.unique(idx[idx < n])
+
+
+def lttb_indices(x, y, budget: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets : garde dans chaque seau le point formant le plus
+    grand triangle avec le point retenu précédemment et la moyenne du seau suivant.
+    Boucle sur les seaux seulement, le calcul à l'intérieur de chaque seau est vectorisé.
+    """
+    x, y = _as_float(x), _as_float(y)
+    n = len(y)
+    if budget <= 2 or n <= budget:
+        return np.arange(n)
+
+    every = (n - 2) / (budget - 2)
+    edges = (np.arange(budget - 1) * every).astype("int64") + 1  # edges[-1] == n - 1
+    idx = np.empty(budget, dtype="int64")
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # seaux entièrement vides (NaN)
+        for i in range(budget - 2):
+            lo, hi = edges[i], edges[i + 1]
+            nlo, nhi = (hi, edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+            avg_x, avg_y = x[nlo:nhi].mean(), np.nanmean(y[nlo:nhi])
+            area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+            a = lo + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+            idx[i + 1] = a
+    return np.unique(idx)
+
+
+def downsample_frame(df: pd.DataFrame, x_col: str, y_cols, budget: int = POINT_BUDGET,
+                     method: str = "minmax") -> pd.DataFrame:
+    """
+    Lignes de `df` (trié selon `x_col`) à tracer : union des points retenus pour chaque
+    série de `y_cols`. Renvoie `df` tel quel s'il tient dans le budget.
+    """
+    if budget <= 0 or len(df) <= budget:
+        return df
+    keep = []
+    for c in y_cols:
+        if method == "lttb":
+            keep.append(lttb_indices(df[x_col], df[c], budget))
+        else:
+            keep.append(minmax_indices(df[c], budget))
+    return df.iloc[np.unique(np.concatenate(keep))]
+
+
+@memoize
+def filiere_points(dataset, filiere, years: tuple, budget: int, y_cols: tuple,
+                   method: str = "minmax") -> pd.DataFrame:
+    """
+    Série réduite d'une filière sur une plage d'années, mise en cache par
+    (version des données, filière, plage, budget). Les données brutes restent
+    accessibles via `dataset.frame` (export).
+    """
+    start, stop = dataset.bounds(filiere, years)
+    return downsample_frame(dataset.frame.iloc[start:stop], dataset.schema.annee, y_cols, budget, method)
@@ -0,0 +1,201 @@
+"""
+Prévisions statistiques par filière, en complément des quatre scénarios normatifs :
+tendance linéaire, tendance log-linéaire, lissage exponentiel de Holt et AR(p)
+estimé par moindres carrés. Pour chaque filière, le modèle retenu est celui
+dont l'erreur de backtest (MAE sur les dernières années, ajusté sur les
+précédentes) est la plus faible ; il est ensuite réajusté sur toute la série.
+
+Les ajustements sont répartis sur un pool de processus pour les grandes bases
+et mis en cache par version des données (memo.py) : une page ne réajuste rien.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from memo import memoize
+
+MODELS = ("Naïf", "Tendance linéaire", "Tendance log", "Holt", "AR(1)", "AR(2)")
+HOLDOUT = 3                 # années réservées au backtest
+MIN_POINTS = 4              # en dessous : prévision naïve (dernière valeur)
+PARALLEL_MIN_FILIERES = 200  # en dessous, l'ajustement en série est plus rapide
+# Grille (alpha, beta) du lissage de Holt, évaluée d'un bloc
+_ALPHA, _BETA = (g.ravel() for g in np.meshgrid(np.linspace(0.1, 0.9, 9), np.linspace(0.1, 0.9, 9)))
+
+
+@dataclass(frozen=True)
+class Fit:
+    """Modèle retenu pour une filière ; `errors` : MAE de backtest de chaque candidat."""
+    filiere: str
+    model: str
+    params: tuple
+    errors: dict
+    last_year: int
+
+
+# -----------------------------
+# Modèles : fit(t, y) -> params, predict(params, steps) -> valeurs
+# (t : années observées, steps : années écoulées depuis la dernière)
+# -----------------------------
+def _fit_naive(t, y):
+    return (y[-1],)
+
+
+def _predict_naive(params, steps):
+    return np.full(len(steps), params[0], dtype="float64")
+
+
+def _fit_linear(t, y):
+    slope, intercept = np.polyfit(t - t[-1], y, 1)
+    return (intercept, slope)
+
+
+def _predict_linear(params, steps):
+    return params[0] + params[1] * steps
+
+
+def _fit_log(t, y):
+    if (y <= 0).any():
+        return None
+    slope, intercept = np.polyfit(t - t[-1], np.log(y), 1)
+    return (intercept, slope)
+
+
+def _predict_log(params, steps):
+    return np.exp(params[0] + params[1] * steps)
+
+
+def _fit_holt(t, y):
+    if len(y) < 3:
+        return None
+    # Toutes les combinaisons (alpha, beta) de la grille en parallèle, pas à pas dans le temps
+    level = np.full(len(_ALPHA), y[0])
+    trend = np.full(len(_ALPHA), y[1] - y[0])
+    sse = np.zeros(len(_ALPHA))
+    for value in y[1:]:
+        sse += (value - level - trend) ** 2
+        new_level = _ALPHA * value + (1 - _ALPHA) * (level + trend)
+        trend = _BETA * (new_level - level) + (1 - _BETA) * trend
+        level = new_level
+    best = int(np.argmin(sse))
+    return (float(level[best]), float(trend[best]))
+
+
+def _predict_holt(params, steps):
+    return params[0] + params[1] * steps
+
+
+def _fit_ar(p):
+    def fit(t, y):
+        if len(y) < p + 3:
+            return None
+        X = np.column_stack([np.ones(len(y) - p)] + [y[p - k - 1:len(y) - k - 1] for k in range(p)])
+        coefs, *_ = np.linalg.lstsq(X, y[p:], rcond=None)
+        return (tuple(coefs), tuple(y[-p:]))
+    return fit
+
+
+def _predict_ar(params, steps):
+    coefs, history = params
+    recent = list(history)
+    path = [history[-1]]  # pas 0 : dernière valeur observée
+    for _ in range(int(steps.max()) if len(steps) else 0):
+        value = coefs[0] + sum(c * h for c, h in zip(coefs[1:], reversed(recent)))
+        path.append(value)
+        recent = recent[1:] + [value]
+    return np.asarray(path, dtype="float64")[steps.astype(int)]
+
+
+_ENGINES = {
+    "Naïf": (_fit_naive, _predict_naive),
+    "Tendance linéaire": (_fit_linear, _predict_linear),
+    "Tendance log": (_fit_log, _predict_log),
+    "Holt": (_fit_holt, _predict_holt),
+    "AR(1)": (_fit_ar(1), _predict_ar),
+    "AR(2)": (_fit_ar(2), _predict_ar),
+}
+
+
+def predict(fit: Fit, years, bounds=None) -> np.ndarray:
+    """Valeurs prévues pour `years` (NaN avant la dernière année observée)."""
+    steps = np.asarray(years, dtype="float64") - fit.last_year
+    values = _ENGINES[fit.model][1](fit.params, np.maximum(steps, 0)).astype("float64")
+    if bounds is not None:
+        values = np.clip(values, *bounds)
+    return np.where(steps >= 0, values, np.nan)
+
+
+def select_model(filiere, years, values, bounds=None, models=MODELS, holdout: int = HOLDOUT) -> Fit:
+    """Backtest de chaque modèle sur les `holdout` dernières années, puis ajustement du meilleur."""
+    keep = ~np.isnan(values)
+    t, y = np.asarray(years, dtype="float64")[keep], np.asarray(values, dtype="float64")[keep]
+    if len(y) == 0:
+        return Fit(filiere, "Naïf", (np.nan,), {}, int(years[-1]) if len(years) else 0)
+
+    holdout = min(holdout, len(y) - MIN_POINTS)
+    errors = {}
+    if holdout >= 1:
+        for name in models:
+            fit_fn, predict_fn = _ENGINES[name]
+            params = fit_fn(t[:-holdout], y[:-holdout])
+            if params is None:
+                continue
+            pred = predict_fn(params, t[-holdout:] - t[-holdout - 1])
+            if bounds is not None:
+                pred = np.clip(pred, *bounds)
+            if np.isfinite(pred).all():
+                errors[name] = float(np.mean(np.abs(pred - y[-holdout:])))
+    # Réajustement sur toute la série : un modèle valide sur l'apprentissage peut ne plus
+    # l'être (valeur nulle récente pour la tendance log...), on passe alors au suivant
+    for name in sorted(errors, key=errors.get):
+        params = _ENGINES[name][0](t, y)
+        if params is not None:
+            return Fit(filiere, name, params, errors, int(t[-1]))
+    return Fit(filiere, "Naïf", _fit_naive(t, y), errors, int(t[-1]))
+
+
+def _fit_frame(df: pd.DataFrame, col_produits: str, col_annee: str, column: str, bounds) -> list:
+    fits = []
+    for name, g in df.groupby(col_produits, sort=False, observed=True):
+        fits.append(select_model(name, g[col_annee].to_numpy(), g[column].to_numpy(dtype="float64"), bounds))
+    return fits
+
+
+@memoize
+def fit_models(dataset, column: str, bounds=None, jobs: int = None) -> dict:
+    """
+    {filière: Fit} pour la colonne `column` de toutes les filières, mis en cache par
+    version des données. Au-delà de PARALLEL_MIN_FILIERES filières, l'ajustement est
+    réparti sur `jobs` processus (tous les cœurs par défaut).
+    """
+    names = list(dataset.filieres)
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(names)))
+    if jobs == 1 or len(names) < PARALLEL_MIN_FILIERES:
+        fits = _fit_frame(dataset.frame, dataset.schema.produit, dataset.schema.annee, column, bounds)
+    else:
+        # Chaque processus reçoit sa tranche de cette version des données (et non le chemin
+        # du classeur, qui peut avoir été rechargé entre-temps) : les ajustements
+        # correspondent toujours à la clé du cache
+        schema = dataset.schema
+        chunks = [dataset.select(list(c))[[schema.produit, schema.annee, column]]
+                  for c in np.array_split(np.array(names, dtype=object), jobs * 4)]
+        n = len(chunks)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            parts = pool.map(_fit_frame, chunks, [schema.produit] * n, [schema.annee] * n,
+                             [column] * n, [bounds] * n)
+            fits = [f for part in parts for f in part]
+    return {f.filiere: f for f in fits}
+
+
+def forecast_table(dataset, column: str, horizon: int, bounds=None, jobs: int = None) -> pd.DataFrame:
+    """Prévisions (format long : filière, modèle, année, prévision) jusqu'à `horizon`."""
+    rows = []
+    for name, fit in fit_models(dataset, column, bounds, jobs).items():
+        years = np.arange(fit.last_year, max(horizon, fit.last_year) + 1)
+        rows.append(pd.DataFrame({"filière": name, "modèle": fit.model, "année": years,
+                                  "prévision": predict(fit, years, bounds)}))
+    if not rows:
+        return pd.DataFrame(columns=["filière", "modèle", "année", "prévision"])
+    return pd.concat(rows, ignore_index=True)
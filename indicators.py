@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+# Colonnes calculées, ajoutées au jeu de données à son chargement
+TC = "TC"                                   # production / (production + importation)
+TIS = "TIS"                                 # importation / (production + importation)
+GROWTH_IMPORT = "Croissance importation"    # variation annuelle (annualisée si années manquantes)
+GROWTH_PROD = "Croissance production"
+GROWTH_TC = "Croissance TC"
+CAGR_TC = "TCAM TC"                         # taux de croissance annuel moyen depuis la 1re année
+GAP_TARGET = "Écart cible"                  # cible PIISAH - production (en tonnes)
+TARGET_RATIO = "Atteinte cible"             # production / cible PIISAH
+
+INDICATORS = [TC, TIS, GROWTH_IMPORT, GROWTH_PROD, GROWTH_TC, CAGR_TC, GAP_TARGET, TARGET_RATIO]
+
+
+def safe_ratio(num, den) -> np.ndarray:
+    """num / den, NaN lorsque le dénominateur est nul ou manquant (jamais d'infini)."""
+    num = np.asarray(num, dtype="float64")
+    den = np.asarray(den, dtype="float64")
+    out = np.full(np.broadcast(num, den).shape, np.nan)
+    np.divide(num, den, out=out, where=(den != 0) & ~np.isnan(den))
+    return out
+
+
+def annualised(ratio, years) -> np.ndarray:
+    """Taux annuel équivalent ratio^(1/années) - 1 ; NaN si la durée n'est pas positive."""
+    ratio = np.asarray(ratio, dtype="float64")
+    years = np.asarray(years, dtype="float64")
+    out = np.full(np.broadcast(ratio, years).shape, np.nan)
+    ok = (years > 0) & (ratio >= 0)
+    np.power(ratio, 1 / np.where(ok, years, 1), out=out, where=ok)
+    return out - 1
+
+
+def compute_indicators(df: pd.DataFrame, schema) -> pd.DataFrame:
+    """
+    Calcule TC, TIS, croissances annuelles, TCAM et écart à la cible pour chaque
+    (filière, année) en un seul passage vectorisé. L'ordre des lignes est conservé.
+    Un marché nul (production + importation = 0) donne TC et TIS indéfinis (NaN).
+    """
+    schema.require("produit", "annee", "production", "importation")
+    out = df.copy(deep=False)
+
+    prod = df[schema.production].to_numpy(dtype="float64")
+    imp = df[schema.importation].to_numpy(dtype="float64")
+    total = prod + imp
+    tc = safe_ratio(prod, total)
+    out[TC] = tc
+    out[TIS] = safe_ratio(imp, total)
+
+    # Tri (filière, année) pour les calculs entre années successives d'une même filière
+    codes = pd.factorize(df[schema.produit])[0]
+    years = df[schema.annee].to_numpy(dtype="float64")
+    order = np.lexsort((years, codes))
+    g, y = codes[order], years[order]
+    first = np.r_[True, g[1:] != g[:-1]]
+    first_pos = np.maximum.accumulate(np.where(first, np.arange(len(g)), 0))
+
+    gap = np.r_[np.nan, np.diff(y)]
+    gap[first] = np.nan
+    since_first = y - y[first_pos]
+
+    def scatter(sorted_values):
+        res = np.empty_like(sorted_values)
+        res[order] = sorted_values
+        return res
+
+    def growth(values):
+        v = values[order]
+        return scatter(annualised(safe_ratio(v, np.r_[np.nan, v[:-1]]), gap))
+
+    out[GROWTH_IMPORT] = growth(imp)
+    out[GROWTH_PROD] = growth(prod)
+    out[GROWTH_TC] = growth(tc)
+    tc_sorted = tc[order]
+    out[CAGR_TC] = scatter(annualised(safe_ratio(tc_sorted, tc_sorted[first_pos]), since_first))
+
+    if schema.cible:
+        cible = df[schema.cible].to_numpy(dtype="float64")
+        out[GAP_TARGET] = cible - prod
+        out[TARGET_RATIO] = safe_ratio(prod, cible)
+    else:
+        out[GAP_TARGET] = np.nan
+        out[TARGET_RATIO] = np.nan
+    return out
@@ -0,0 +1,231 @@
+"""
+Ingestion incrémentale de plusieurs classeurs (un par année et par source : douanes,
+enquêtes de production de l'INS...) vers un magasin consolidé au format Parquet.
+
+Seuls les classeurs nouveaux ou modifiés sont relus : un manifeste conserve, pour
+chaque fichier, sa date de modification, sa taille, son empreinte et sa partition.
+
+    isub ingest data/sources data/consolide
+
+Le magasin se charge ensuite comme un classeur (cf. dataset.load_dataset) :
+
+    isub --data data/consolide indicators --out indicateurs.parquet
+    ISUB_DATA=data/consolide streamlit run Accueil.py
+"""
+import glob
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import load_workbook
+
+from dataset import file_digest
+from schema import resolve_schema
+from utils import clean_numeric_frame
+
+MANIFEST = "manifest.json"
+CHUNK_ROWS = 10_000
+
+# Noms des colonnes du magasin consolidé (ceux de BD_Global.xlsx)
+CANONICAL_COLUMNS = {
+    "produit": "produits",
+    "annee": "Année",
+    "importation": "Importation (en tonne)",
+    "production": "Production nationale (en tonne)",
+    "taux": "Taux de couverture",
+    "cible": "cible_piisah_production",
+}
+SOURCE_COLUMN = "source"
+
+
+class IngestError(Exception):
+    """Échec de lecture d'un classeur ; le message commence par son chemin."""
+
+
+@dataclass
+class IngestReport:
+    added: list = field(default_factory=list)
+    updated: list = field(default_factory=list)
+    unchanged: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    coerced: dict = field(default_factory=dict)  # fichier -> {colonne: valeurs rejetées}
+    skipped: dict = field(default_factory=dict)  # fichier -> feuilles sans colonnes filière/année
+
+
+def iter_chunks(path: str, chunk_rows: int = CHUNK_ROWS):
+    """
+    Lit un classeur en flux (openpyxl en lecture seule) et renvoie des couples
+    (nom de feuille, DataFrame de `chunk_rows` lignes au plus), feuille par feuille.
+    La première ligne non vide d'une feuille sert d'en-tête.
+    """
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            header, rows = None, []
+            for row in ws.iter_rows(values_only=True):
+                if header is None:
+                    if any(v is not None for v in row):
+                        header = [str(v).strip() if v is not None else "" for v in row]
+                    continue
+                if all(v is None for v in row):
+                    continue
+                rows.append(row[:len(header)])
+                if len(rows) >= chunk_rows:
+                    yield ws.title, pd.DataFrame(rows, columns=header)
+                    rows = []
+            if header is not None and rows:
+                yield ws.title, pd.DataFrame(rows, columns=header)
+    finally:
+        wb.close()
+
+
+def normalize_chunk(df: pd.DataFrame, source: str):
+    """Renomme les colonnes reconnues vers les noms canoniques et nettoie les nombres."""
+    schema = resolve_schema(df.columns).require("produit", "annee")
+    mapping = {col: CANONICAL_COLUMNS[name] for name, col in schema.as_dict().items() if col}
+    df = df[list(mapping)].rename(columns=mapping)
+    df, coerced = clean_numeric_frame(df, exclude=[CANONICAL_COLUMNS["produit"]])
+    df = df.dropna(subset=[CANONICAL_COLUMNS["produit"], CANONICAL_COLUMNS["annee"]])
+    df[CANONICAL_COLUMNS["produit"]] = df[CANONICAL_COLUMNS["produit"]].astype(str).str.strip()
+    df[SOURCE_COLUMN] = source
+    return df, coerced
+
+
+def _empty_part() -> pd.DataFrame:
+    columns = {c: pd.Series(dtype="float64") for c in CANONICAL_COLUMNS.values()}
+    columns[CANONICAL_COLUMNS["produit"]] = pd.Series(dtype="str")
+    columns[SOURCE_COLUMN] = pd.Series(dtype="str")
+    return pd.DataFrame(columns)
+
+
+def _write_part(path: str, source: str, out_path: str) -> tuple:
+    parts, coerced, skipped = [_empty_part()], {}, []
+    for sheet, chunk in iter_chunks(path):
+        if sheet in skipped:
+            continue
+        try:
+            part, bad = normalize_chunk(chunk, source)
+        except ValueError:
+            # Feuille de notes, de métadonnées... : pas de colonnes filière/année
+            skipped.append(sheet)
+            continue
+        parts.append(part)
+        for col, values in bad.items():
+            coerced.setdefault(col, set()).update(values)
+    df = pd.concat(parts, ignore_index=True)
+    # Colonnes absentes de ce classeur (ex. production dans un fichier des douanes)
+    df = df[list(_empty_part().columns)]
+    df[CANONICAL_COLUMNS["annee"]] = df[CANONICAL_COLUMNS["annee"]].astype("int64")
+
+    tmp = f"{out_path}.{os.getpid()}.tmp"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp)
+    os.replace(tmp, out_path)
+    return len(df), {c: sorted(v) for c, v in coerced.items()}, skipped
+
+
+def _load_manifest(store_dir: str) -> dict:
+    path = os.path.join(store_dir, MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(store_dir: str, manifest: dict):
+    path = os.path.join(store_dir, MANIFEST)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def ingest(sources_dir: str, store_dir: str, pattern: str = "*.xlsx") -> IngestReport:
+    """
+    Met à jour le magasin `store_dir` à partir des classeurs de `sources_dir`.
+    Les fichiers inchangés (même date/taille, ou même empreinte) ne sont pas relus ;
+    les partitions des fichiers supprimés sont retirées. Les feuilles sans colonnes
+    filière/année sont ignorées (`report.skipped`) ; un classeur illisible lève
+    IngestError, après enregistrement du manifeste des fichiers déjà traités.
+    """
+    parts_dir = os.path.join(store_dir, "parts")
+    os.makedirs(parts_dir, exist_ok=True)
+    manifest = _load_manifest(store_dir)
+    report = IngestReport()
+
+    files = sorted(p for p in glob.glob(os.path.join(sources_dir, "**", pattern), recursive=True)
+                   if not os.path.basename(p).startswith("~$"))  # fichiers de verrou Excel
+    seen = set()
+    try:
+        for path in files:
+            key = os.path.relpath(path, sources_dir)
+            seen.add(key)
+            st = os.stat(path)
+            entry = manifest.get(key)
+            if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                report.unchanged.append(key)
+                continue
+
+            digest = file_digest(path)
+            if entry and entry["digest"] == digest:
+                entry.update(mtime_ns=st.st_mtime_ns, size=st.st_size)
+                report.unchanged.append(key)
+                continue
+
+            part = f"{os.path.splitext(key.replace(os.sep, '__'))[0]}-{digest[:12]}.parquet"
+            try:
+                rows, coerced, skipped = _write_part(path, key, os.path.join(parts_dir, part))
+            except Exception as e:
+                raise IngestError(f"{path} : {e}") from e
+            if entry and entry["part"] != part:
+                _remove_part(parts_dir, entry["part"])
+            (report.updated if entry else report.added).append(key)
+            if coerced:
+                report.coerced[key] = coerced
+            if skipped:
+                report.skipped[key] = skipped
+            manifest[key] = {"digest": digest, "mtime_ns": st.st_mtime_ns, "size": st.st_size,
+                             "part": part, "rows": rows}
+
+        for key in sorted(set(manifest) - seen):
+            _remove_part(parts_dir, manifest.pop(key)["part"])
+            report.removed.append(key)
+    finally:
+        # Les fichiers déjà traités restent acquis même si un classeur échoue
+        _save_manifest(store_dir, manifest)
+    return report
+
+
+def _remove_part(parts_dir: str, part: str):
+    try:
+        os.remove(os.path.join(parts_dir, part))
+    except FileNotFoundError:
+        pass
+
+
+def store_digest(store_dir: str) -> str:
+    """Empreinte du contenu du magasin : change dès qu'une partition est ajoutée, remplacée ou retirée."""
+    parts = sorted((key, e["part"]) for key, e in _load_manifest(store_dir).items())
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def load_store(store_dir: str, merge: bool = True) -> pd.DataFrame:
+    """
+    Relit le magasin consolidé. Avec `merge`, les lignes d'une même (filière, année)
+    issues de sources différentes sont fusionnées (première valeur renseignée par colonne).
+    """
+    manifest = _load_manifest(store_dir)
+    paths = [os.path.join(store_dir, "parts", e["part"]) for _, e in sorted(manifest.items())]
+    if not paths:
+        return _empty_part()
+    df = pd.concat([pd.read_parquet(p) for p in paths], ignore_index=True)
+    if merge:
+        keys = [CANONICAL_COLUMNS["produit"], CANONICAL_COLUMNS["annee"]]
+        df = (df.drop(columns=SOURCE_COLUMN)
+                .groupby(keys, as_index=False, sort=True)
+                .first())
+    return df
+
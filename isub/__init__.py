@@ -0,0 +1,30 @@
+"""
+API Python sans Streamlit : chargement, indicateurs et scénarios.
+
+    from isub import load_dataset, indicator_table, scenario_table
+    ds = load_dataset("BD_Global.xlsx")
+    scenario_table(ds, horizon=2035).to_parquet("resultats.parquet")
+
+Installation (commande `isub` et modules importables hors du dépôt) :
+
+    pip install -e .
+    isub --data BD_Global.xlsx indicators --all --out indicateurs.parquet
+
+Sans installation, depuis la racine du dépôt : python -m isub --help
+"""
+from dataset import DATA_PATH, Dataset, load_dataset
+from forecast import MODELS, Fit, fit_models, forecast_table
+from indicators import INDICATORS, compute_indicators
+from montecarlo import Uncertainty, dataset_fan_charts
+from scenarios import HORIZON_MAX, SCENARIOS, Projection, Scenario, project_frame
+
+from isub.batch import indicator_table, scenario_table
+
+__all__ = [
+    "DATA_PATH", "Dataset", "load_dataset",
+    "MODELS", "Fit", "fit_models", "forecast_table",
+    "INDICATORS", "compute_indicators",
+    "Uncertainty", "dataset_fan_charts",
+    "HORIZON_MAX", "SCENARIOS", "Projection", "Scenario", "project_frame",
+    "indicator_table", "scenario_table",
+]
@@ -0,0 +1,5 @@
+import sys
+
+from isub.cli import main
+
+sys.exit(main())
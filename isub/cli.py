@@ -0,0 +1,117 @@
+import argparse
+import os
+import sys
+
+from dataset import DATA_PATH, load_dataset
+from isub.batch import PARALLEL_MIN_FILIERES, indicator_table, scenario_table
+from scenarios import HORIZON_MAX
+from utils import to_excel_bytes, widen_floats
+
+
+def write_table(df, out):
+    """Écrit selon l'extension (.parquet, .csv, .xlsx, .json) ; CSV sur la sortie standard sinon."""
+    ext = os.path.splitext(out or "")[1].lower()
+    if ext != ".parquet":
+        df = widen_floats(df)  # formats texte : 707247360 plutôt que 7.0724736e+08
+    if not out or out == "-":
+        df.to_csv(sys.stdout, index=False)
+        return
+    if ext == ".parquet":
+        df.to_parquet(out, index=False)
+    elif ext == ".xlsx":
+        with open(out, "wb") as f:
+            f.write(to_excel_bytes(df))
+    elif ext == ".json":
+        df.to_json(out, orient="records", force_ascii=False, indent=2)
+    else:
+        df.to_csv(out, index=False)
+    print(f"{len(df)} lignes écrites dans {out}", file=sys.stderr)
+
+
+def _filieres(args):
+    return None if args.all or not args.filiere else args.filiere
+
+
+def cmd_indicators(args):
+    write_table(indicator_table(load_dataset(args.data), _filieres(args)), args.out)
+
+
+def cmd_scenarios(args):
+    ds = load_dataset(args.data)
+    write_table(scenario_table(ds, args.horizon, _filieres(args), jobs=args.jobs), args.out)
+
+
+def cmd_reports(args):
+    from reports import generate_reports
+
+    _, failures = generate_reports(args.data, args.out_dir, args.horizon, _filieres(args), jobs=args.jobs,
+                                   progress=lambda line: print(line, file=sys.stderr))
+    if failures:
+        sys.exit(f"{len(failures)} note(s) en échec : {', '.join(failures)}")
+
+
+def cmd_serve(args):
+    from isub.server import serve
+
+    serve(args.data, args.host, args.port)
+
+
+def cmd_ingest(args):
+    from ingest import IngestError, ingest
+
+    try:
+        r = ingest(args.sources, args.store)
+    except IngestError as e:
+        sys.exit(f"échec de l'ingestion : {e}")
+    print(f"ajoutés : {len(r.added)}, modifiés : {len(r.updated)}, "
+          f"inchangés : {len(r.unchanged)}, supprimés : {len(r.removed)}")
+    for key, sheets in r.skipped.items():
+        print(f"{key} : feuilles ignorées (sans colonnes filière/année) : {', '.join(sheets)}", file=sys.stderr)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="isub", description="Indicateurs et scénarios d'import-substitution.")
+    parser.add_argument("--data", default=DATA_PATH,
+                        help=f"classeur, ou magasin consolidé par `isub ingest` (défaut : {DATA_PATH})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_selection(p):
+        p.add_argument("--all", action="store_true", help="toutes les filières (défaut)")
+        p.add_argument("--filiere", action="append", help="filière à traiter (option répétable)")
+        p.add_argument("--out", help="fichier de sortie .parquet, .csv, .xlsx ou .json (défaut : CSV sur stdout)")
+
+    p = sub.add_parser("indicators", help="TC, TIS, croissances et écart à la cible par filière et année")
+    add_selection(p)
+    p.set_defaults(func=cmd_indicators)
+
+    p = sub.add_parser("scenarios", help="projections des quatre scénarios standards")
+    add_selection(p)
+    p.add_argument("--horizon", type=int, default=2035, help=f"dernière année projetée (≤ {HORIZON_MAX} conseillé)")
+    p.add_argument("--jobs", type=int, default=1,
+                   help=f"nombre de processus, utilisés à partir de {PARALLEL_MIN_FILIERES} filières (défaut : 1)")
+    p.set_defaults(func=cmd_scenarios)
+
+    p = sub.add_parser("reports", help="une note PDF par filière")
+    p.add_argument("--all", action="store_true", help="toutes les filières (défaut)")
+    p.add_argument("--filiere", action="append", help="filière à traiter (option répétable)")
+    p.add_argument("--out-dir", default="rapports", help="répertoire des PDF (défaut : rapports)")
+    p.add_argument("--horizon", type=int, default=2030, help="dernière année des scénarios")
+    p.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="nombre de processus")
+    p.set_defaults(func=cmd_reports)
+
+    p = sub.add_parser("serve", help="API HTTP/JSON locale (filières, séries, indicateurs, scénarios)")
+    p.add_argument("--host", default="127.0.0.1", help="adresse d'écoute (défaut : 127.0.0.1)")
+    p.add_argument("--port", type=int, default=8502, help="port (défaut : 8502)")
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("ingest", help="ingestion incrémentale d'un répertoire de classeurs")
+    p.add_argument("sources", help="répertoire des classeurs .xlsx")
+    p.add_argument("store", help="répertoire du magasin consolidé")
+    p.set_defaults(func=cmd_ingest)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    args.func(args)
+    return 0
@@ -0,0 +1,179 @@
+"""
+Service HTTP/JSON local pour les autres systèmes du ministère :
+
+    GET /filieres
+    GET /series?filiere=Riz                 (filiere répétable, toutes par défaut)
+    GET /indicators?filiere=Riz
+    GET /scenarios?horizon=2035&filiere=Riz
+
+    python -m isub serve --port 8502
+
+Chaque réponse porte un ETag dérivé de l'empreinte des données et de la requête :
+un GET conditionnel (If-None-Match) répond 304 sans rien recalculer, et les corps
+JSON déjà produits sont servis depuis un cache en mémoire.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from dataset import DATA_PATH, load_dataset
+from isub.batch import indicator_table, scenario_table
+from scenarios import HORIZON_MAX
+from utils import widen_floats
+
+CACHE_ITEMS = 256
+DEFAULT_HORIZON = 2035
+
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ResponseCache:
+    """LRU borné : (version des données, requête) -> (ETag, corps JSON)."""
+
+    def __init__(self, max_items: int = CACHE_ITEMS):
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+        return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+
+def _records(df) -> list:
+    # to_json convertit NaN en null et les types numpy en nombres JSON
+    return json.loads(widen_floats(df).to_json(orient="records", force_ascii=False, double_precision=15))
+
+
+def _filieres(dataset, query) -> list:
+    names = query.get("filiere")
+    if not names:
+        return None
+    known = set(dataset.filieres)
+    unknown = [n for n in names if n not in known]
+    if unknown:
+        raise ApiError(HTTPStatus.NOT_FOUND, f"filière inconnue : {', '.join(unknown)}")
+    return names
+
+
+def get_filieres(dataset, query) -> dict:
+    return {"filieres": list(dataset.filieres)}
+
+
+def get_series(dataset, query) -> dict:
+    schema = dataset.schema
+    df = indicator_table(dataset, _filieres(dataset, query))
+    measures = [c for c in (schema.importation, schema.production, schema.cible) if c]
+    return {"colonnes": {"filiere": schema.produit, "annee": schema.annee},
+            "donnees": _records(df[[schema.produit, schema.annee] + measures])}
+
+
+def get_indicators(dataset, query) -> dict:
+    schema = dataset.schema
+    df = indicator_table(dataset, _filieres(dataset, query))
+    return {"colonnes": {"filiere": schema.produit, "annee": schema.annee}, "donnees": _records(df)}
+
+
+def get_scenarios(dataset, query) -> dict:
+    try:
+        horizon = int(query.get("horizon", [DEFAULT_HORIZON])[0])
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "horizon doit être une année") from None
+    if horizon > HORIZON_MAX:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"horizon maximal : {HORIZON_MAX}")
+    df = scenario_table(dataset, horizon, _filieres(dataset, query))
+    return {"horizon": horizon, "donnees": _records(df)}
+
+
+ROUTES = {
+    "/filieres": get_filieres,
+    "/series": get_series,
+    "/indicators": get_indicators,
+    "/scenarios": get_scenarios,
+}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "isub"
+    data_path = DATA_PATH
+    cache = ResponseCache()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        route = ROUTES.get(url.path.rstrip("/") or "/")
+        if route is None:
+            return self._send_error(HTTPStatus.NOT_FOUND, f"chemin inconnu : {url.path}")
+        query = parse_qs(url.query)
+        try:
+            dataset = load_dataset(self.data_path)  # empreinte mise en cache : un simple stat()
+        except (OSError, ValueError) as e:  # fichier absent, illisible ou colonnes essentielles absentes
+            return self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, f"données indisponibles : {e}")
+
+        # L'ETag ne dépend que de la version des données et de la requête normalisée :
+        # une revalidation ne touche ni au cache ni aux calculs
+        request_key = json.dumps([url.path.rstrip("/"), sorted(query.items())], ensure_ascii=False)
+        etag = '"' + hashlib.sha256(f"{dataset.cache_key}|{request_key}".encode()).hexdigest()[:32] + '"'
+        if etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._send_cache_headers(etag)
+            self.end_headers()
+            return
+
+        body = self.cache.get(etag)
+        if body is None:
+            try:
+                body = json.dumps(route(dataset, query), ensure_ascii=False).encode("utf-8")
+            except ApiError as e:
+                return self._send_error(e.status, str(e))
+            except Exception as e:  # jamais de connexion fermée sans réponse JSON
+                self.log_error("%s : %r", url.path, e)
+                return self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"erreur interne : {e}")
+            self.cache.set(etag, body)
+        self._send_json(HTTPStatus.OK, body, etag)
+
+    def _send_json(self, status, body: bytes, etag=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self._send_cache_headers(etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_cache_headers(self, etag: str):
+        # Identiques pour 200 et 304
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")  # toujours revalider via l'ETag
+
+    def _send_error(self, status, message: str):
+        self._send_json(status, json.dumps({"erreur": message}, ensure_ascii=False).encode("utf-8"))
+
+
+def serve(data_path: str = DATA_PATH, host: str = "127.0.0.1", port: int = 8502):
+    """Lance le service jusqu'à interruption (Ctrl+C)."""
+    handler = type("Handler", (ApiHandler,), {"data_path": data_path})
+    load_dataset(data_path, watch=True)  # premier chargement, puis relectures en arrière-plan
+    with ThreadingHTTPServer((host, port), handler) as httpd:
+        print(f"API isub sur http://{host}:{port}/filieres", flush=True)
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
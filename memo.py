@@ -0,0 +1,228 @@
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Répertoire partagé par tous les processus de la machine
+CACHE_DIR = os.environ.get("ISUB_CACHE_DIR", os.path.join(".cache", "memo"))
+MEMORY_ITEMS = 128               # entrées gardées en mémoire par processus
+MEMORY_BYTES = 64 * 1024 * 1024  # taille maximale du cache mémoire de chaque processus
+DISK_BYTES = 512 * 1024 * 1024   # taille maximale du cache sur disque
+EVICT_TO = 0.8                   # l'éviction descend sous cette fraction de `max_bytes`
+
+
+class MemoStore:
+    """
+    Cache adressé par contenu : LRU borné (en entrées et en octets) en mémoire devant un
+    répertoire de fichiers pickle (écriture atomique, éviction des moins récemment utilisés
+    au-delà de `max_bytes`). Les valeurs de plus de `max_memory_bytes` / 8 (exports
+    Excel, Parquet...) ne sont gardées que sur disque, pour ne pas les dupliquer dans
+    chaque processus.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, max_items: int = MEMORY_ITEMS,
+                 max_bytes: int = DISK_BYTES, max_memory_bytes: int = MEMORY_BYTES):
+        self.directory = directory
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self._memory = OrderedDict()  # clé -> (valeur, taille)
+        self._memory_bytes = 0
+        self._disk_bytes = None       # estimation, resynchronisée à chaque éviction
+        self._lock = threading.Lock()
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".pkl")
+
+    def _remember(self, key, value, size: int):
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key)[1]
+        if size > self.max_memory_bytes // 8:
+            return
+        self._memory[key] = (value, size)
+        self._memory_bytes += size
+        while len(self._memory) > self.max_items or self._memory_bytes > self.max_memory_bytes:
+            self._memory_bytes -= self._memory.popitem(last=False)[1][1]
+
+    def get(self, key: str):
+        """Renvoie (trouvé, valeur)."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return True, self._memory[key][0]
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+                size = f.tell()
+            os.utime(path)  # date d'accès pour l'éviction LRU
+        except (OSError, EOFError, pickle.UnpicklingError):
+            with self._lock:
+                self.counters["misses"] += 1
+            return False, None
+        with self._lock:
+            self.counters["disk_hits"] += 1
+            self._remember(key, value, size)
+        return True, value
+
+    def set(self, key: str, value):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+            os.replace(tmp, path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            # Disque indisponible ou valeur non sérialisable : cache mémoire seulement
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            with self._lock:
+                self._remember(key, value, sys.getsizeof(value))
+            return
+        with self._lock:
+            self._remember(key, value, size)
+            if self._disk_bytes is not None:
+                self._disk_bytes += size
+            full = self._disk_bytes is None or self._disk_bytes > self.max_bytes
+        # Parcours du répertoire seulement au premier appel et au-delà de la limite
+        if full:
+            self._evict()
+
+    def _evict(self):
+        """Supprime les fichiers les moins récemment utilisés jusqu'à EVICT_TO × max_bytes."""
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".pkl"):
+                    try:
+                        st = os.stat(os.path.join(root, name))
+                    except FileNotFoundError:  # supprimé par un autre processus
+                        continue
+                    files.append((st.st_mtime, st.st_size, os.path.join(root, name)))
+        total = sum(size for _, size, _ in files)
+        if total > self.max_bytes:
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes * EVICT_TO:
+                    break
+                try:
+                    os.remove(path)
+                    self.counters["evictions"] += 1
+                except FileNotFoundError:
+                    pass
+                total -= size
+        with self._lock:
+            self._disk_bytes = total
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.counters, memory_items=len(self._memory), memory_bytes=self._memory_bytes)
+
+
+store = MemoStore()
+
+
+def _fingerprint(value):
+    """Représentation stable et légère d'un argument pour la clé de cache."""
+    cache_key = getattr(value, "cache_key", None)
+    if isinstance(cache_key, str):  # Dataset : la version des données suffit
+        return ("dataset", cache_key)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        h = pd.util.hash_pandas_object(value, index=True).to_numpy()
+        names = list(value.columns) if isinstance(value, pd.DataFrame) else [value.name]
+        return ("pandas", type(value).__name__, repr(names), repr(list(np.atleast_1d(value.dtypes))),
+                hashlib.sha256(h.tobytes()).hexdigest())
+    if isinstance(value, np.ndarray):
+        return ("ndarray", value.dtype.str, value.shape, hashlib.sha256(value.tobytes()).hexdigest())
+    if isinstance(value, dict):
+        return ("dict", tuple((k, _fingerprint(v)) for k, v in sorted(value.items(), key=lambda kv: repr(kv[0]))))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_fingerprint(v) for v in value))
+    return value
+
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _local_module(obj):
+    """Module du dépôt (à côté de memo.py) qui définit `obj`, None pour les bibliothèques."""
+    module = obj if inspect.ismodule(obj) else inspect.getmodule(obj)
+    path = getattr(module, "__file__", None)
+    if path and os.path.dirname(os.path.abspath(path)) == _ROOT:
+        return module
+    return None
+
+
+def code_hash(module) -> str:
+    """
+    Empreinte du source de `module` et, de proche en proche, des modules du dépôt dont il
+    utilise des fonctions, classes ou constantes (SCENARIOS, fonctions auxiliaires...).
+    """
+    seen, todo = {}, [module]
+    while todo:
+        mod = todo.pop()
+        if mod.__name__ in seen:
+            continue
+        try:
+            seen[mod.__name__] = inspect.getsource(mod)
+        except (OSError, TypeError):
+            seen[mod.__name__] = ""
+        for value in list(vars(mod).values()):
+            dep = _local_module(value)
+            if dep is not None and dep.__name__ not in seen:
+                todo.append(dep)
+    h = hashlib.sha256()
+    for name in sorted(seen):
+        h.update(f"{name}\0{seen[name]}\0".encode())
+    return h.hexdigest()
+
+
+def memoize(func=None, *, memo_store=None, version=None):
+    """
+    Décorateur : met en cache le résultat selon (données, fonction, paramètres).
+    Les valeurs par défaut sont liées avant le calcul de la clé, qui inclut aussi
+    l'empreinte du code du module et des modules du dépôt qu'il utilise (code_hash) :
+    modifier la fonction, un auxiliaire ou une constante invalide les anciens résultats.
+    `version` permet d'invalider explicitement pour une cause extérieure au code.
+    """
+    if func is None:
+        return functools.partial(memoize, memo_store=memo_store, version=version)
+
+    signature = inspect.signature(func)
+    code_id = []  # calculé au premier appel, une fois tous les modules importés
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        target = memo_store or store
+        if not code_id:
+            module = inspect.getmodule(func)
+            code_id.append(f"{func.__module__}.{func.__qualname__}:{version}:"
+                           f"{code_hash(module) if module else ''}")
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        payload = (code_id[0], _fingerprint(dict(bound.arguments)))
+        key = hashlib.sha256(pickle.dumps(payload, protocol=4)).hexdigest()
+        found, value = target.get(key)
+        if found:
+            return value
+        value = func(*args, **kwargs)
+        target.set(key, value)
+        return value
+
+    wrapper.uncached = func
+    return wrapper
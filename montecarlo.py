@@ -0,0 +1,113 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from indicators import TIS
+from memo import memoize
+
+
+@dataclass(frozen=True)
+class Uncertainty:
+    """Paramètres du tirage : croissance annuelle ~ N(growth, volatility), chocs de Bernoulli."""
+    growth: float = 0.015       # croissance annuelle moyenne (scénario de référence)
+    volatility: float = 0.05    # écart-type de la croissance annuelle
+    shock_prob: float = 0.10    # probabilité annuelle d'un choc
+    shock_size: float = -0.03   # effet multiplicatif d'un choc
+    draws: int = 10_000
+    seed: int = 0
+
+
+QUANTILES = (5, 50, 95)
+
+
+def simulate(start, n_steps: int, params: Uncertainty = Uncertainty()) -> np.ndarray:
+    """
+    Tire `params.draws` trajectoires pour chaque valeur de départ, toutes en un bloc.
+    Renvoie un tableau float32 (tirages, F, n_steps + 1) ; le pas 0 vaut `start`.
+    """
+    start = np.asarray(start, dtype="float32")
+    rng = np.random.default_rng(params.seed)
+    shape = (params.draws, start.shape[0], n_steps)
+
+    log_growth = rng.standard_normal(shape, dtype="float32")
+    log_growth *= params.volatility
+    log_growth += params.growth
+    np.log1p(log_growth, out=log_growth)
+    if params.shock_prob > 0:
+        shocks = rng.random(shape, dtype="float32") < params.shock_prob
+        log_growth += shocks * np.float32(np.log1p(params.shock_size))
+
+    paths = np.empty(shape[:2] + (n_steps + 1,), dtype="float32")
+    paths[..., 0] = 0
+    np.cumsum(log_growth, axis=-1, out=paths[..., 1:])
+    np.exp(paths, out=paths)
+    paths *= start[None, :, None]
+    return paths
+
+
+@dataclass(frozen=True, eq=False)
+class FanChart:
+    """Bandes de percentiles (quantile × filière × pas) et probabilité d'atteindre la cible."""
+    filieres: tuple
+    last_year: np.ndarray
+    quantiles: tuple
+    bands: np.ndarray
+    prob_target: np.ndarray  # (F,), NaN si pas de cible
+
+    def band(self, filiere, horizon=None):
+        """Années et {percentile: valeurs} pour une filière, jusqu'à `horizon` si précisé."""
+        i = self.filieres.index(filiere)
+        years = self.last_year[i] + np.arange(self.bands.shape[-1])
+        keep = years <= horizon if horizon is not None else slice(None)
+        return years[keep], {q: self.bands[k, i][keep] for k, q in enumerate(self.quantiles)}
+
+
+def fan_chart(filieres, start, last_year, horizon: int, params: Uncertainty = Uncertainty(),
+              target=None, quantiles=QUANTILES) -> FanChart:
+    """
+    Simule puis résume les trajectoires de chaque filière depuis sa dernière année.
+    P(cible) = part des tirages supérieurs ou égaux à la cible à l'horizon.
+    """
+    last_year = np.asarray(last_year, dtype="int64")
+    if not len(last_year):  # aucune filière (ex. TIS ou production jamais renseignés)
+        return FanChart(filieres=(), last_year=last_year, quantiles=tuple(quantiles),
+                        bands=np.empty((len(quantiles), 0, 1)), prob_target=np.empty(0))
+    steps = np.maximum(horizon - last_year, 0)
+    paths = simulate(start, max(int(steps.max()), 1), params)
+    bands = np.percentile(paths, quantiles, axis=0)
+
+    prob = np.full(len(filieres), np.nan)
+    if target is not None:
+        target = np.asarray(target, dtype="float64")
+        at_horizon = paths[:, np.arange(len(filieres)), steps]
+        ok = ~np.isnan(target)
+        prob[ok] = (at_horizon[:, ok] >= target[ok]).mean(axis=0)
+    return FanChart(filieres=tuple(filieres), last_year=np.asarray(last_year), quantiles=tuple(quantiles),
+                    bands=bands, prob_target=prob)
+
+
+@memoize
+def dataset_fan_charts(dataset, horizon: int, params: Uncertainty = Uncertainty()) -> dict:
+    """
+    Bandes d'incertitude de toutes les filières d'un jeu de données, pour le TIS
+    et la production (comparée à la cible PIISAH). Mis en cache par
+    (version des données, horizon, paramètres).
+    """
+    schema = dataset.schema
+    df = dataset.frame.dropna(subset=[TIS, schema.production])
+    last = (df.sort_values([schema.produit, schema.annee], kind="stable")
+              .drop_duplicates(schema.produit, keep="last"))
+    filieres = tuple(last[schema.produit])
+    last_year = last[schema.annee].to_numpy(dtype="int64")
+
+    target = None
+    if schema.cible:
+        # Dernière cible renseignée de chaque filière
+        cibles = df.dropna(subset=[schema.cible]).groupby(schema.produit, observed=True)[schema.cible].last()
+        target = cibles.reindex(list(filieres)).to_numpy(dtype="float64")
+
+    return {
+        TIS: fan_chart(filieres, last[TIS].to_numpy(), last_year, horizon, params),
+        "Production": fan_chart(filieres, last[schema.production].to_numpy(), last_year, horizon,
+                                params, target=target),
+    }
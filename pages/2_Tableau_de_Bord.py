@@ -1,47 +1,55 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
 import os
-from utils import find_column, clean_numeric
+import perf
+from dataset import DATA_PATH, load_dataset
+from indicators import TC
+from charts import filiere_figure, small_multiples
+from downsample import POINT_BUDGET, filiere_points
+from utils import selection_csv_bytes
 
 st.set_page_config(page_title="Tableau de Bord", page_icon="📊", layout="wide")
+perf.page("tableau_de_bord")  # mesures si ISUB_PERF=1 ou ?perf=1
 
 # -----------------------------
 # Chargement des données
 # -----------------------------
-file_path = "BD_Global.xlsx"
+file_path = DATA_PATH  # classeur ou magasin consolidé (variable ISUB_DATA)
 if not os.path.exists(file_path):
-    st.error("⚠️ Fichier BD_Global.xlsx introuvable.")
+    st.error(f"⚠️ Données introuvables : {file_path}")
     st.stop()
 
-df = pd.read_excel(file_path)
-df.columns = [str(c).strip() for c in df.columns]
+# Chargé et nettoyé une seule fois par version du fichier (partagé entre sessions) ;
+# les versions suivantes sont relues en arrière-plan
+dataset = load_dataset(file_path, watch=True)
+df = dataset.frame
 
-# Détection colonnes
-col_produits = find_column(df, ["produit", "produits", "filière"])
-col_annee = find_column(df, ["année", "annee"])
-col_import = find_column(df, ["Importation"])
-col_prod = find_column(df, ["Production nationale"])
-col_taux = find_column(df, ["taux"])
-col_cible = find_column(df, ["cible_piisah_production"])
-
-# Nettoyage
-for c in df.columns:
-    if c not in [col_produits, col_annee]:
-        df[c] = clean_numeric(df[c])
-df = df.dropna(subset=[col_produits, col_annee])
+# Colonnes (résolues une fois par version du fichier)
+schema = dataset.schema
+col_produits = schema.produit
+col_annee = schema.annee
+col_import = schema.importation
+col_prod = schema.production
+col_taux = TC  # calculé au chargement, identique pour toutes les pages
+col_cible = schema.cible
 
 # -----------------------------
 # Sidebar - filtres
 # -----------------------------
 st.sidebar.header("🔎 Filtres")
-produits = sorted(df[col_produits].unique())
+produits = list(dataset.filieres)
 selected = st.sidebar.multiselect("Filières :", produits, default=produits[:3])
 
 min_y, max_y = int(df[col_annee].min()), int(df[col_annee].max())
 years = st.sidebar.slider("Années :", min_y, max_y, (min_y, max_y))
 
-df_f = df[(df[col_produits].isin(selected)) & (df[col_annee].between(years[0], years[1]))]
+mode = st.sidebar.radio("Affichage :", ["Petits multiples", "Une figure par filière"])
+per_page = st.sidebar.number_input("Filières par page :", min_value=1, max_value=50, value=6, step=1)
+budget = st.sidebar.number_input("Points max par série (0 = tous) :", min_value=0, value=POINT_BUDGET, step=500)
+
+# Tranches contiguës de l'instantané trié (recherche dichotomique, pas de masque sur tout le tableau)
+with perf.stage("filtrage") as s:
+    groups = dataset.slices(selected, years)
+    s.rows = sum(len(g) for g in groups.values())
 
 # -----------------------------
 # Page
@@ -53,99 +61,53 @@ show_import = st.checkbox("Importation", value=True)
 show_prod = st.checkbox("Production", value=True)
 show_taux = st.checkbox("Taux de couverture", value=True)
 
-# Couleurs
-colors = {
-    "Importation": "blue",
-    "Production": "orange",
-    "Taux de couverture": "green",
-    "Cible PIISAH": "red"
-}
-
-for produit in selected:
-    st.subheader(f"📌 Filière : {produit}")
-    df_p = df_f[df_f[col_produits] == produit].sort_values(col_annee)
-
-    fig = go.Figure()
-
-    # Diagrammes en bar pour Importation et Production
-    if show_import:
-        fig.add_trace(go.Bar(
-            x=df_p[col_annee],
-            y=df_p[col_import],
-            name="Importation",
-            marker_color=colors["Importation"],
-            yaxis="y1"
-        ))
-
-    if show_prod:
-        fig.add_trace(go.Bar(
-            x=df_p[col_annee],
-            y=df_p[col_prod],
-            name="Production",
-            marker_color=colors["Production"],
-            yaxis="y1"
-        ))
-
-    # Ligne Taux avec axe Y séparé
-    if show_taux:
-        fig.add_trace(go.Scatter(
-            x=df_p[col_annee],
-            y=df_p[col_taux],
-            mode="lines+markers",
-            name="Taux de couverture",
-            line=dict(color=colors["Taux de couverture"], width=3, dash='dot'),
-            marker=dict(size=6),
-            yaxis="y2"
-        ))
-
-    # Cible PIISAH si Importation et Taux décochés
-    if col_cible:
-    # Créer une valeur fictive pour 2026
-        df_cible = pd.DataFrame({
-            col_annee: [2026],
-            col_produits: [produit],
-            col_cible: [df_p[col_prod].iloc[-1] * 1.05]  # valeur fictive 5% au-dessus de la dernière production
-        })
-
-    # Fusion avec df_p uniquement si nécessaire
-        df_p_cible = pd.concat([df_p, df_cible], ignore_index=True)
-
-        if not show_import and not show_taux and show_prod:
-            fig.add_trace(go.Scatter(
-                x=df_p_cible[col_annee],
-                y=df_p_cible[col_cible],
-                mode='lines+markers',
-                name="Cible PIISAH",
-                line=dict(color=colors["Cible PIISAH"], dash='dash'),
-                marker=dict(size=8),
-                yaxis="y1"
-            ))
-
-
-    # Layout avec axes multiples
-    fig.update_layout(
-        xaxis=dict(title="Année"),
-        yaxis=dict(
-            title="Importation / Production",
-            showgrid=True,
-            zeroline=True
-        ),
-        yaxis2=dict(
-            title="Taux de couverture",
-            overlaying="y",
-            side="right",
-            showgrid=False
-        ),
-        barmode='group',
-        template='plotly_white',
-        legend=dict(
-            orientation="v",
-            x=1.05,
-            y=1,
-            bordercolor="Black",
-            borderwidth=1
-        ),
-        margin=dict(l=50, r=80, t=40, b=40)
-    )
-
-    st.plotly_chart(fig, use_container_width=True)
+# Colonnes utilisées par les graphiques
+cols = {"annee": col_annee, "importation": col_import, "production": col_prod,
+        "taux": col_taux, "cible": col_cible}
+show = dict(show_import=show_import, show_prod=show_prod, show_taux=show_taux)
+
+to_plot = [p for p in selected if p in groups]
+
+# Pagination : seules les filières de la page courante sont construites et envoyées
+n_pages = max(1, -(-len(to_plot) // per_page))
+if n_pages > 1:
+    page = st.number_input(f"Page (sur {n_pages}) :", min_value=1, max_value=n_pages, value=1, step=1)
+else:
+    page = 1
+page_items = to_plot[(page - 1) * per_page:page * per_page]
+
+# Séries longues (mensuelles, trimestrielles) réduites au budget de points ;
+# les données brutes restent disponibles à l'export ci-dessous
+with perf.stage("réduction des points") as s:
+    for produit in page_items:
+        if budget and len(groups[produit]) > budget:
+            groups[produit] = filiere_points(dataset, produit, tuple(years), int(budget),
+                                             (col_import, col_prod, col_taux))
+    s.rows = sum(len(groups[p]) for p in page_items)
+
+if not page_items:
+    st.info("Aucune donnée pour la sélection.")
+elif mode == "Petits multiples":
+    with perf.stage("figure") as s:
+        fig = s.payload(small_multiples({p: groups[p] for p in page_items}, cols, **show))
+    with perf.stage("envoi figure"):
+        st.plotly_chart(fig, use_container_width=True)
+else:
+    for produit in page_items:
+        st.subheader(f"📌 Filière : {produit}")
+        with perf.stage(f"figure {produit}") as s:
+            fig = s.payload(filiere_figure(groups[produit], cols, **show))
+        with perf.stage(f"envoi figure {produit}"):
+            st.plotly_chart(fig, use_container_width=True)
+
+# Mis en cache par (version des données, sélection) : rien n'est reconstruit aux reruns
+with perf.stage("export CSV") as s:
+    csv_bytes = s.payload(selection_csv_bytes(dataset, selected, years))
+st.download_button(
+    label="Télécharger les données filtrées (CSV)",
+    data=csv_bytes,
+    file_name="tableau_de_bord_filtre.csv",
+    mime="text/csv"
+)
+
+perf.panel()
@@ -1,44 +1,51 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from utils import find_column, clean_numeric
+from dataset import DATA_PATH, load_dataset
+from indicators import TC, TIS
+from scenarios import HORIZON_MAX, SCENARIOS, dataset_projection, production_sweep
+from downsample import POINT_BUDGET, filiere_points
+from montecarlo import Uncertainty, dataset_fan_charts
+from forecast import HOLDOUT, fit_models, predict
 import os
+import perf
 
 st.set_page_config(page_title="Scénarios", page_icon="📈", layout="wide")
+perf.page("scenarios")  # mesures si ISUB_PERF=1 ou ?perf=1
 
 st.title("📈 Scénarios de projections – Import Substitution")
 
 # -----------------------------
 # Chargement des données
 # -----------------------------
-file_path = "BD_Global.xlsx"
+file_path = DATA_PATH  # classeur ou magasin consolidé (variable ISUB_DATA)
 
 if not os.path.exists(file_path):
-    st.error("⚠️ Fichier BD_Global.xlsx introuvable.")
+    st.error(f"⚠️ Données introuvables : {file_path}")
     st.stop()
 
-df = pd.read_excel(file_path)
-df.columns = [str(c).strip() for c in df.columns]
+# Chargé et nettoyé une seule fois par version du fichier (partagé entre sessions) ;
+# les versions suivantes sont relues en arrière-plan
+dataset = load_dataset(file_path, watch=True)
+df = dataset.frame
 
-# Colonnes principales
-col_produits = find_column(df, ["produit", "filière"])
-col_annee = find_column(df, ["année"])
-col_taux = find_column(df, ["taux"])
+# Colonnes principales (résolues une fois par version du fichier)
+schema = dataset.schema
+col_produits = schema.produit
+col_annee = schema.annee
+col_taux = TIS  # calculé au chargement, comme dans l'API et la CLI (isub)
 
 # Colonnes TC (production / importation)
-col_prod = find_column(df, ["production", "prod"])
-col_imp = find_column(df, ["importation", "import"])
+col_prod = schema.production
+col_imp = schema.importation
 
-df[col_taux] = clean_numeric(df[col_taux])
-df[col_annee] = clean_numeric(df[col_annee])
-df[col_prod] = clean_numeric(df[col_prod])
-df[col_imp] = clean_numeric(df[col_imp])
+with perf.stage("filtrage") as s:
+    df = df.dropna(subset=[col_produits, col_annee, col_taux, col_prod, col_imp])
 
-df = df.dropna(subset=[col_produits, col_annee, col_taux, col_prod, col_imp])
-
-# Calcul du taux de couverture
-df["TC"] = df[col_prod] / (df[col_prod] + df[col_imp])
-df["TC"] = df["TC"].fillna(0)
+    # Taux de couverture : calculé au chargement (indicators.py), marché nul -> 0
+    df[TC] = df[TC].fillna(0)
+    s.rows = len(df)
 
 # -----------------------------
 # Sidebar choix
@@ -62,60 +69,52 @@ if default_horizon < year_max:  # sécurité si 2026 < dernière année du datas
 horizon = st.sidebar.slider(
     "Horizon de projection :",
     year_max,
-    year_max + 2,
+    max(HORIZON_MAX, year_max + 2),
     value=default_horizon  # <-- valeur par défaut
 )
 
+with st.sidebar.expander("🎲 Incertitude (Monte Carlo)"):
+    mc_volatility = st.slider("Volatilité annuelle :", 0.0, 0.30, 0.05, step=0.01)
+    mc_shock_prob = st.slider("Probabilité annuelle de choc :", 0.0, 0.5, 0.10, step=0.05)
+    mc_draws = st.select_slider("Nombre de tirages :", [1_000, 5_000, 10_000, 20_000], value=10_000)
+    mc_seed = st.number_input("Graine aléatoire :", value=0, step=1)
+
+with st.sidebar.expander("🧭 Balayage des hypothèses"):
+    sw_growth = st.slider("Croissance annuelle :", -0.10, 0.20, (-0.02, 0.10), step=0.01)
+    sw_shock = st.slider("Choc la première année :", -0.50, 0.20, (-0.20, 0.05), step=0.01)
+    sw_grid = st.select_slider("Points par axe :", [10, 20, 30, 50], value=50)
+
 # -----------------------------
 # Sous-ensemble produit
 # -----------------------------
 df_p = df[df[col_produits] == produit_sel].sort_values(col_annee)
 
-# Dernière valeur observée
-last_year = df_p[col_annee].max()
-last_value = df_p[df_p[col_annee] == last_year][col_taux].values[0]
-
-# Dernier TC
-last_TC = df_p[df_p[col_annee] == last_year]["TC"].values[0]
-
-years_proj = list(range(last_year, horizon + 1))
-n_years = len(years_proj)
+# Historique réduit au budget de points s'il est trop long (données infra-annuelles)
+if len(df_p) > POINT_BUDGET:
+    df_p = filiere_points(dataset, produit_sel, (year_min, year_max), POINT_BUDGET, (col_taux, TC))
 
 # -----------------------------
-# Scénarios pour le taux d’IS
+# Scénarios pour le taux d’IS et le Taux de Couverture
+# Projection de toutes les filières en un seul calcul vectorisé, à partir de la
+# dernière valeur observée de chaque filière (une fois par version des données et horizon)
 # -----------------------------
-def scenario_reference(start, n):
-    return [start * (1 + 0.015)**i for i in range(n)]
-
-def scenario_optimal(start, n):
-    return [start * (1 + 0.06)**i for i in range(n)]
-
-def choc_exogene(start, n):
-    vals, v = [], start
-    for i in range(n):
-        if i == 0:
-            v *= 0.97
-        else:
-            v *= 1.02
-        vals.append(v)
-    return vals
-
-def choc_endogene(start, n):
-    return [start * (1 + 0.005*i) for i in range(n)]
+with perf.stage("projection") as s:
+    projection = dataset_projection(dataset, horizon)
+    s.rows = len(projection.filieres)
 
-sc_ref = scenario_reference(last_value, n_years)
-sc_opt = scenario_optimal(last_value, n_years)
-sc_exo = choc_exogene(last_value, n_years)
-sc_endo = choc_endogene(last_value, n_years)
+years_proj, sc = projection.series(TIS, produit_sel)
+_, tc = projection.series(TC, produit_sel)
+sc_ref, sc_opt, sc_exo, sc_endo = sc.values()
+TC_ref, TC_opt, TC_exo, TC_endo = tc.values()
 
 # -----------------------------
-# Scénarios pour le Taux de Couverture
-# Même logique de croissance appliquée au dernier TC
+# Prévision statistique : modèle choisi par backtest pour chaque filière,
+# ajusté une fois par version des données (cache partagé, pas à chaque rerun)
 # -----------------------------
-TC_ref = scenario_reference(last_TC, n_years)
-TC_opt = scenario_optimal(last_TC, n_years)
-TC_exo = choc_exogene(last_TC, n_years)
-TC_endo = choc_endogene(last_TC, n_years)
+RATIO = (0.0, 1.0)
+with perf.stage("prévision"):
+    fit_tis = fit_models(dataset, col_taux, RATIO).get(produit_sel)
+    fit_tc = fit_models(dataset, TC, RATIO).get(produit_sel)
 
 # -----------------------------
 # 📊 Graphique 1 : Import-substitution
@@ -134,15 +133,21 @@ fig.add_trace(go.Scatter(x=years_proj, y=sc_ref, name="Référence", mode="lines
 fig.add_trace(go.Scatter(x=years_proj, y=sc_opt, name="Optimal", mode="lines", line=dict(dash="dot")))
 fig.add_trace(go.Scatter(x=years_proj, y=sc_exo, name="Choc exogène", mode="lines", line=dict(dash="dashdot")))
 fig.add_trace(go.Scatter(x=years_proj, y=sc_endo, name="Choc endogène", mode="lines", line=dict(dash="longdash")))
+if fit_tis is not None:
+    years_fc = list(range(fit_tis.last_year, horizon + 1))
+    fig.add_trace(go.Scatter(x=years_fc, y=predict(fit_tis, years_fc, RATIO), name=f"Prévision ({fit_tis.model})",
+                             mode="lines", line=dict(color="black", width=2)))
 
 fig.update_layout(
     title=f"Scénarios du taux d’import-substitution – {produit_sel}",
     xaxis_title="Année",
-    yaxis_title="Taux d'import-substitution (%)",
+    yaxis_title="TIS (ratio)",
     template="plotly_white"
 )
 
-st.plotly_chart(fig, use_container_width=True)
+with perf.stage("envoi figure TIS") as s:
+    s.payload(fig)
+    st.plotly_chart(fig, use_container_width=True)
 # -----------------------------
 # 📊 Graphique 2 : Taux de couverture nationale
 # -----------------------------
@@ -150,7 +155,7 @@ fig_TC = go.Figure()
 
 fig_TC.add_trace(go.Scatter(
     x=df_p[col_annee],
-    y=df_p["TC"],
+    y=df_p[TC],
     mode="lines+markers",
     name="TC Historique",
     line=dict(width=3, color="#0047AB")   # bleu foncé
@@ -188,6 +193,11 @@ fig_TC.add_trace(go.Scatter(
     line=dict(dash="longdash", color="#B22222")  # rouge sombre
 ))
 
+if fit_tc is not None:
+    years_fc = list(range(fit_tc.last_year, horizon + 1))
+    fig_TC.add_trace(go.Scatter(x=years_fc, y=predict(fit_tc, years_fc, RATIO), name=f"TC Prévision ({fit_tc.model})",
+                                mode="lines", line=dict(color="black", width=2)))
+
 fig_TC.update_layout(
     title=f"Scénarios du Taux de Couverture Nationale – {produit_sel}",
     xaxis_title="Année",
@@ -195,6 +205,108 @@ fig_TC.update_layout(
     template="plotly_white",
 )
 
-st.plotly_chart(fig_TC, use_container_width=True)
+with perf.stage("envoi figure TC") as s:
+    s.payload(fig_TC)
+    st.plotly_chart(fig_TC, use_container_width=True)
+
+if fit_tc is not None and fit_tc.errors:
+    st.caption(f"Prévision du TC : modèle « {fit_tc.model} », retenu parmi {len(fit_tc.errors)} pour son "
+               f"erreur absolue moyenne de {fit_tc.errors[fit_tc.model]:.3f} sur les {HOLDOUT} dernières "
+               "années observées (ajusté sur les années précédentes).")
+
+# -----------------------------
+# 🎲 Graphique 3 : Bandes d'incertitude (Monte Carlo)
+# Tirages vectorisés pour toutes les filières, mis en cache par paramètres
+# -----------------------------
+st.subheader("🎲 Incertitude des projections (Monte Carlo)")
+
+params = Uncertainty(volatility=mc_volatility, shock_prob=mc_shock_prob,
+                     draws=int(mc_draws), seed=int(mc_seed))
+with perf.stage("Monte Carlo") as s:
+    fans = dataset_fan_charts(dataset, horizon, params)
+    s.rows = params.draws
 
+years_mc, bands = fans[TIS].band(produit_sel, horizon)
+low, mid, high = bands.values()
 
+fig_mc = go.Figure()
+
+fig_mc.add_trace(go.Scatter(
+    x=df_p[col_annee],
+    y=df_p[col_taux],
+    mode="lines+markers",
+    name="Historique",
+    line=dict(width=3, color="#0047AB")
+))
+
+fig_mc.add_trace(go.Scatter(x=years_mc, y=high, mode="lines", line=dict(width=0), showlegend=False))
+fig_mc.add_trace(go.Scatter(
+    x=years_mc,
+    y=low,
+    mode="lines",
+    line=dict(width=0),
+    fill="tonexty",
+    fillcolor="rgba(46, 139, 87, 0.25)",
+    name="Intervalle 5 % – 95 %"
+))
+fig_mc.add_trace(go.Scatter(x=years_mc, y=mid, mode="lines", name="Médiane", line=dict(dash="dash", color="#2E8B57")))
+
+fig_mc.update_layout(
+    title=f"Bandes d'incertitude du taux d’import-substitution – {produit_sel}",
+    xaxis_title="Année",
+    yaxis_title="TIS (ratio)",
+    template="plotly_white",
+)
+
+with perf.stage("envoi figure Monte Carlo") as s:
+    s.payload(fig_mc)
+    st.plotly_chart(fig_mc, use_container_width=True)
+
+i_sel = fans["Production"].filieres.index(produit_sel)
+prob = fans["Production"].prob_target[i_sel]
+if pd.notna(prob):  # NaN si pas de cible PIISAH
+    st.metric(f"Probabilité d'atteindre la cible PIISAH de production en {horizon}", f"{prob:.0%}")
+
+# -----------------------------
+# 🧭 Graphique 4 : Balayage croissance × choc × année (production face à la cible PIISAH)
+# Toute la grille évaluée en un seul calcul diffusé ; les cartes en sont des coupes
+# -----------------------------
+st.subheader("🧭 Sensibilité aux hypothèses de croissance et de choc")
+
+growth_grid = np.linspace(*sw_growth, sw_grid)
+shock_grid = np.linspace(*sw_shock, sw_grid)
+with perf.stage("balayage") as s:
+    sweep_years = np.arange(year_max, max(HORIZON_MAX, horizon) + 1)
+    cube = production_sweep(dataset, growth_grid, shock_grid, sweep_years, [produit_sel])
+    share = production_sweep(dataset, growth_grid, shock_grid, [horizon]).share_reaching(horizon)
+    s.rows = len(dataset.filieres) * sw_grid * sw_grid
+
+
+def sweep_heatmap(z, title, colorbar, **kwargs):
+    fig_sw = go.Figure(go.Heatmap(x=shock_grid, y=growth_grid, z=z, colorbar=dict(title=colorbar), **kwargs))
+    # Scénarios standards à croissance composée, placés sur la grille
+    std = [sc for sc in SCENARIOS if not sc.linear]
+    fig_sw.add_trace(go.Scatter(x=[sc.shock for sc in std], y=[sc.growth for sc in std], text=[sc.name for sc in std],
+                                mode="markers+text", textposition="top center", showlegend=False,
+                                marker=dict(color="black", symbol="x", size=9)))
+    fig_sw.update_layout(title=title, xaxis_title="Choc la première année", yaxis_title="Croissance annuelle",
+                         xaxis_tickformat=".0%", yaxis_tickformat=".1%", template="plotly_white")
+    return fig_sw
+
+
+if produit_sel in cube.filieres and not np.isnan(cube.target[0]):
+    col_ratio, col_year = st.columns(2)
+    with col_ratio:
+        st.plotly_chart(sweep_heatmap(cube.ratio(produit_sel, horizon), f"Production / cible en {horizon} – {produit_sel}",
+                                      "ratio", colorscale="RdYlGn", zmid=1), use_container_width=True)
+    with col_year:
+        st.plotly_chart(sweep_heatmap(cube.reach_year(produit_sel), f"Année d'atteinte de la cible – {produit_sel}",
+                                      "année", colorscale="Viridis_r"), use_container_width=True)
+else:
+    st.info(f"Pas de cible PIISAH de production pour {produit_sel}.")
+
+if not np.isnan(share).all():
+    st.plotly_chart(sweep_heatmap(share, f"Part des filières atteignant leur cible en {horizon}", "part",
+                                  colorscale="Blues", zmin=0, zmax=1), use_container_width=True)
+
+perf.panel()
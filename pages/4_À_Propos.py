@@ -1,12 +1,15 @@
 import streamlit as st
-import pandas as pd
-from utils import to_excel_bytes
+from functools import partial
+from utils import dataset_export_bytes
+from dataset import DATA_PATH, load_dataset
 import os
+import perf
 
 # --------------------------------------------
 # CONFIG PAGE
 # --------------------------------------------
 st.set_page_config(page_title="À propos", page_icon="ℹ️", layout="wide")
+perf.page("a_propos")  # mesures si ISUB_PERF=1 ou ?perf=1
 
 # --------------------------------------------
 # TITRE
@@ -64,9 +67,24 @@ st.latex(r"TC = \frac{Production}{Production + Importation}")
 st.write("Taux d’import-substitution :")
 st.latex(r"TIS = \frac{Importation}{Importation + Production}")
 
+st.write("""
+Sont calculés en même temps, une seule fois au chargement des données : la croissance annuelle
+des importations, de la production et du TC, le taux de croissance annuel moyen (TCAM) du TC
+et l’écart à la cible PIISAH. Lorsque Production + Importation = 0, TC et TIS sont indéfinis.
+""")
+
 st.markdown("#### • Construction des séries historiques")
 st.write("Les données sont triées par filière puis par année pour permettre les projections.")
 
+st.markdown("#### • Classement des filières")
+st.write("""
+La page Classement ordonne les filières sur la période choisie selon le niveau de TC
+(production et importations cumulées sur la période), le TCAM du TC et la croissance annuelle
+moyenne des importations entre la première et la dernière année observées, ou l’écart à la
+cible PIISAH la dernière année disponible. Les cumuls annuels sont préparés une fois au
+chargement : changer de période ne relit pas les données brutes.
+""")
+
 st.markdown("#### • Génération des scénarios de projection")
 st.write("Les scénarios sont construits à partir de la dernière valeur observée dans la filière.")
 
@@ -106,6 +124,29 @@ Ces scénarios s’appliquent à :
 - le taux de couverture (ou contenu local)  
 """)
 
+st.markdown("### 🧭 Balayage des hypothèses")
+st.write("""
+Les taux ci-dessus ne sont que quatre points d’un espace plus large. La page Scénarios évalue
+en un seul calcul toute une grille de taux de croissance et de chocs de première année
+(jusqu’à 50 × 50 combinaisons), pour chaque filière et chaque année jusqu’à l’horizon :
+""")
+st.latex(r"V(t) = V_0 \times (1 + choc) \times (1 + croissance)^t")
+st.write("""
+Les cartes de chaleur indiquent, pour chaque combinaison, le rapport de la production projetée
+à la dernière cible PIISAH, l’année où cette cible est atteinte, et la part des filières qui
+l’atteignent à l’horizon choisi. Les scénarios standards y sont repérés par une croix.
+""")
+
+st.markdown("### 📐 Prévision statistique")
+st.write("""
+En complément des scénarios, une prévision est estimée sur l’historique de chaque filière.
+Six modèles sont comparés : dernière valeur (naïf), tendance linéaire, tendance log-linéaire,
+lissage exponentiel de Holt et modèles autorégressifs AR(1) et AR(2) estimés par moindres carrés.
+Chacun est ajusté sans les trois dernières années observées, puis évalué sur celles-ci ;
+le modèle à l’erreur absolue moyenne la plus faible est retenu et réajusté sur toute la série.
+Les taux prévus sont bornés entre 0 et 1.
+""")
+
 # --------------------------------------------
 # ⚠️ 4. LIMITES
 # --------------------------------------------
@@ -114,7 +155,8 @@ st.subheader("⚠️ Limites de l’application")
 st.markdown("""
 - Les données sont **actualisées périodiquement**.  
 - L'analyse couvre les **principales filières**, pas toutes.  
-- Les scénarios reposent sur des modèles simples (pas de modèle économétrique avancé).  
+- Les scénarios et le balayage des hypothèses sont normatifs ; la prévision statistique repose sur des modèles univariés
+  (tendances, lissage, AR) estimés sur des séries courtes, sans variables explicatives.  
 - Une connexion Internet est nécessaire pour les visualisations.  
 """)
 
@@ -123,17 +165,40 @@ st.markdown("""
 # --------------------------------------------
 st.subheader("📥 Télécharger la base de données")
 
-excel_path = "BD_Global.xlsx"
+excel_path = DATA_PATH
 
 if os.path.exists(excel_path):
-    df = pd.read_excel(excel_path)
-    excel_bytes = to_excel_bytes(df)
-
+    dataset = load_dataset(excel_path, watch=True)
+    # Fichiers construits seulement au clic (hors du rerun), une fois par version des données
+    # et par format : colonnes du classeur, nettoyées, à leur précision d'origine
     st.download_button(
         label="Télécharger la base de données Excel",
-        data=excel_bytes,
+        data=partial(dataset_export_bytes, dataset, "xlsx"),
         file_name="import_substitution.xlsx",
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
     )
+
+    # Formats adaptés aux gros extraits
+    st.download_button(
+        label="Télécharger en CSV (zip)",
+        data=partial(dataset_export_bytes, dataset, "csv.zip"),
+        file_name="import_substitution_csv.zip",
+        mime="application/zip"
+    )
+    st.download_button(
+        label="Télécharger en Parquet",
+        data=partial(dataset_export_bytes, dataset, "parquet"),
+        file_name="import_substitution.parquet",
+        mime="application/octet-stream"
+    )
+
+    # Une seule copie compacte en mémoire, partagée par toutes les sessions
+    if dataset.compaction:
+        after, before = (f"{dataset.compaction[k] / 1024:,.0f}".replace(",", " ")
+                         for k in ("bytes_after", "bytes_before"))
+        st.caption(f"Base en mémoire : {after} Ko ({before} Ko avant compaction), "
+                   "partagée par toutes les sessions.")
 else:
     st.warning("⚠️ Fichier de données non trouvé. Vérifiez le chemin.")
+
+perf.panel()
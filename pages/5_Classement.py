@@ -0,0 +1,97 @@
+import streamlit as st
+import plotly.graph_objects as go
+import os
+import perf
+from dataset import DATA_PATH, load_dataset
+from ranking import METRICS, aggregates
+from utils import widen_floats
+
+st.set_page_config(page_title="Classement", page_icon="🏆", layout="wide")
+perf.page("classement")  # mesures si ISUB_PERF=1 ou ?perf=1
+
+st.title("🏆 Classement et comparaison des filières")
+
+# -----------------------------
+# Chargement des données
+# -----------------------------
+file_path = DATA_PATH  # classeur ou magasin consolidé (variable ISUB_DATA)
+if not os.path.exists(file_path):
+    st.error(f"⚠️ Données introuvables : {file_path}")
+    st.stop()
+
+# Chargé et nettoyé une seule fois par version du fichier (partagé entre sessions) ;
+# les versions suivantes sont relues en arrière-plan
+dataset = load_dataset(file_path, watch=True)
+
+# Grille filière × année et sommes cumulées, calculées une fois par version des données
+with perf.stage("agrégats") as s:
+    agg = aggregates(dataset)
+    s.rows = len(agg.filieres)
+
+if not len(agg.years):
+    st.info("Aucune donnée à classer.")
+    st.stop()
+
+# -----------------------------
+# Sidebar - critères
+# -----------------------------
+st.sidebar.header("⚙️ Critères de classement")
+metric = st.sidebar.selectbox("Critère :", list(METRICS))
+min_y, max_y = int(agg.years[0]), int(agg.years[-1])
+years = st.sidebar.slider("Années :", min_y, max_y, (min_y, max_y))
+order = st.sidebar.radio("Afficher :", ["Meilleures filières", "Moins bonnes filières"])
+top_n = st.sidebar.number_input("Nombre de filières :", min_value=1, max_value=max(1, len(agg.filieres)),
+                                value=min(10, len(agg.filieres)), step=1)
+
+# Chaque plage d'années : quelques lectures dans les sommes cumulées, O(filières)
+with perf.stage("classement") as s:
+    table = agg.rank(metric, years, int(top_n), best=order == "Meilleures filières")
+    s.rows = len(agg.filieres)
+
+# -----------------------------
+# 📊 Graphique
+# -----------------------------
+fmt, high_is_good = METRICS[metric]
+st.caption(f"{metric} sur {years[0]}–{years[1]} : "
+           + ("une valeur élevée est favorable." if high_is_good else "une valeur faible est favorable."))
+
+if table.empty:
+    st.info("Aucune filière n'a de valeur pour ce critère sur la période.")
+else:
+    fig = go.Figure(go.Bar(
+        x=table[metric],
+        y=table["Filière"],
+        orientation="h",
+        marker_color="#2E8B57" if order == "Meilleures filières" else "#B22222",
+        texttemplate=f"%{{x:{fmt}}}",
+        textposition="outside",
+    ))
+    fig.update_layout(
+        title=f"{order} – {metric} ({years[0]}–{years[1]})",
+        xaxis_title=metric,
+        xaxis_tickformat=fmt,
+        yaxis=dict(autorange="reversed"),  # rang 1 en haut
+        height=max(300, 40 * len(table) + 120),
+        template="plotly_white",
+    )
+    with perf.stage("envoi figure") as s:
+        s.payload(fig)
+        st.plotly_chart(fig, use_container_width=True)
+
+# -----------------------------
+# Tableau comparatif (tous les critères)
+# -----------------------------
+st.subheader("📋 Comparaison sur tous les critères")
+table.index = range(1, len(table) + 1)
+formats = {m: "{:" + f + "}" for m, (f, _) in METRICS.items()} | {"Début": "{:.0f}", "Fin": "{:.0f}"}
+st.dataframe(table.style.format(formats, na_rep="–"), use_container_width=True)
+
+csv_bytes = widen_floats(agg.metrics(years)).to_csv(index=False).encode("utf-8")
+st.download_button(
+    label="Télécharger tous les critères (CSV)",
+    data=csv_bytes,
+    file_name=f"classement_{years[0]}_{years[1]}.csv",
+    mime="text/csv"
+)
+
+perf.panel()
@@ -0,0 +1,211 @@
+"""
+Mesures par exécution de page (chargement Excel, nettoyage, filtrage, figures,
+exports...), activées à la demande :
+
+- ISUB_PERF=1 dans l'environnement (toutes les sessions), ou
+- ?perf=1 dans l'URL de la page (session courante).
+
+Chaque exécution est alors ajoutée au journal JSON-lines (rotation par taille) avec
+les identifiants de session et de page, et résumée dans un panneau de la barre latérale.
+Désactivées, `stage()` et `timed()` ne font qu'une lecture de variable locale au thread.
+
+    with perf.stage("filtrage") as s:
+        df_f = ...
+        s.rows = len(df_f)
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from logging.handlers import RotatingFileHandler
+
+ENV_FLAG = "ISUB_PERF"
+LOG_PATH = os.environ.get("ISUB_PERF_LOG", os.path.join(".cache", "perf", "perf.jsonl"))
+LOG_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+
+_local = threading.local()
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def payload_size(obj) -> int:
+    """Taille approximative (octets) de ce qui est envoyé au navigateur ou téléchargé."""
+    if isinstance(obj, (bytes, bytearray, str)):
+        return len(obj)
+    if hasattr(obj, "memory_usage"):  # DataFrame / Series
+        usage = obj.memory_usage(index=True, deep=False)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if hasattr(obj, "to_json"):  # figure Plotly
+        return len(obj.to_json())
+    return 0
+
+
+class Stage:
+    """Étape mesurée ; `rows` et `bytes` sont facultatifs."""
+
+    __slots__ = ("name", "depth", "rows", "bytes", "seconds", "_run", "_start")
+
+    def __init__(self, run, name: str, rows=None):
+        self.name, self.rows, self.bytes, self.seconds = name, rows, None, None
+        self._run = run
+
+    def payload(self, obj):
+        measured = time.perf_counter()
+        self.bytes = payload_size(obj)
+        self._start += time.perf_counter() - measured  # la mesure de taille n'est pas comptée
+        return obj
+
+    def __enter__(self):
+        self.depth = self._run.depth
+        self._run.depth += 1
+        self._run.stages.append(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self._start
+        self._run.depth -= 1
+        return False
+
+    def as_dict(self) -> dict:
+        return {"stage": self.name, "depth": self.depth, "ms": round((self.seconds or 0) * 1000, 3),
+                "rows": self.rows, "bytes": self.bytes}
+
+
+class _NullStage:
+    """Étape factice renvoyée quand les mesures sont désactivées."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+    def payload(self, obj):
+        return obj
+
+
+_NULL = _NullStage()
+
+
+class Run:
+    """Une exécution de page (un « rerun » Streamlit)."""
+
+    def __init__(self, page: str, session: str):
+        self.page, self.session = page, session
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started = time.time()
+        self.start = time.perf_counter()
+        self.stages, self.depth = [], 0
+
+    def record(self) -> dict:
+        return {"ts": round(self.started, 3), "session": self.session, "page": self.page, "run": self.run_id,
+                "total_ms": round((time.perf_counter() - self.start) * 1000, 3),
+                "pid": os.getpid(), "stages": [s.as_dict() for s in self.stages]}
+
+
+def stage(name: str, rows=None):
+    """Contexte de mesure d'une étape (sans effet si aucune exécution n'est suivie)."""
+    run = getattr(_local, "run", None)
+    if run is None:
+        return _NULL
+    return Stage(run, name, rows)
+
+
+def timed(name: str = None):
+    """Décorateur : mesure chaque appel comme une étape."""
+    def decorate(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, "run", None) is None:
+                return func(*args, **kwargs)
+            with stage(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def start(page: str, session: str = "-"):
+    """Commence le suivi d'une exécution dans le thread courant."""
+    _local.run = Run(page, session)
+    return _local.run
+
+
+def finish():
+    """Termine le suivi et renvoie l'enregistrement (None si inactif)."""
+    run = getattr(_local, "run", None)
+    _local.run = None
+    if run is None:
+        return None
+    record = run.record()
+    _log(record)
+    return record
+
+
+def _log(record: dict):
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            try:
+                os.makedirs(os.path.dirname(LOG_PATH) or ".", exist_ok=True)
+                handler = RotatingFileHandler(LOG_PATH, maxBytes=LOG_BYTES, backupCount=LOG_BACKUPS,
+                                              encoding="utf-8")
+            except OSError:
+                return  # répertoire en lecture seule : panneau seulement
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _logger = logging.getLogger("isub.perf")
+            _logger.propagate = False
+            _logger.setLevel(logging.INFO)
+            _logger.addHandler(handler)
+    _logger.info(json.dumps(record, ensure_ascii=False))
+
+
+# -----------------------------
+# Intégration Streamlit
+# -----------------------------
+def enabled() -> bool:
+    if os.environ.get(ENV_FLAG, "").lower() in ("1", "true", "yes"):
+        return True
+    import streamlit as st
+
+    try:
+        return st.query_params.get("perf") == "1"
+    except Exception:  # hors d'une session Streamlit
+        return False
+
+
+def page(name: str):
+    """À appeler en tête de page : suit l'exécution si les mesures sont activées."""
+    if not enabled():
+        _local.run = None
+        return None
+    import streamlit as st
+
+    session = st.session_state.setdefault("_perf_session", uuid.uuid4().hex[:12])
+    return start(name, session)
+
+
+def panel():
+    """À appeler en fin de page : journalise l'exécution et affiche le panneau."""
+    record = finish()
+    if record is None:
+        return
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander(f"⏱️ Performance — {record['total_ms']:.0f} ms", expanded=True):
+        rows = [{"étape": " " * s["depth"] + s["stage"], "ms": s["ms"],
+                 "lignes": s["rows"], "octets": s["bytes"]} for s in record["stages"]]
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+        st.caption(f"session {record['session']} · exécution {record['run']} · journal : {LOG_PATH}")
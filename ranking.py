@@ -0,0 +1,133 @@
+"""
+Classement des filières sur une plage d'années quelconque.
+
+Les séries sont rangées une fois par version des données dans une grille dense
+(filière × année) accompagnée de sommes cumulées et des indices de la dernière /
+prochaine année observée : chaque plage du curseur se résout alors en O(filières)
+par quelques lectures de tableaux, sans réagréger les lignes brutes.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from indicators import annualised, safe_ratio
+from memo import memoize
+
+# Critères de classement : libellé -> (unité d'affichage, un score élevé est favorable)
+METRICS = {
+    "Niveau de TC": (".1%", True),
+    "TCAM du TC": (".2%", True),
+    "Croissance des importations": (".2%", False),
+    "Écart à la cible": (",.0f", False),
+}
+
+
+def _prev_valid(valid: np.ndarray) -> np.ndarray:
+    """Indice de la dernière colonne valide à gauche (incluse), -1 si aucune."""
+    idx = np.where(valid, np.arange(valid.shape[1]), -1)
+    return np.maximum.accumulate(idx, axis=1)
+
+
+def _next_valid(valid: np.ndarray) -> np.ndarray:
+    """Indice de la prochaine colonne valide à droite (incluse), n si aucune."""
+    n = valid.shape[1]
+    idx = np.where(valid, np.arange(n), n)
+    return np.minimum.accumulate(idx[:, ::-1], axis=1)[:, ::-1]
+
+
+@dataclass(frozen=True, eq=False)
+class Aggregates:
+    """
+    Grille (filière × année) et ses agrégats préfixés ; `cum_*` ont une colonne de plus
+    que la grille (cum[:, j] = somme des années d'indice < j).
+    """
+    filieres: tuple
+    years: np.ndarray        # (Y,) années consécutives
+    production: np.ndarray   # (F, Y) NaN si l'année manque
+    importation: np.ndarray
+    cible: np.ndarray
+    tc: np.ndarray
+    cum_production: np.ndarray  # (F, Y + 1)
+    cum_importation: np.ndarray
+    prev_market: np.ndarray  # (F, Y) dernière année avec production et importation
+    next_market: np.ndarray
+    prev_cible: np.ndarray   # (F, Y) dernière année avec production et cible
+
+    def _columns(self, years) -> tuple:
+        lo, hi = (int(np.clip(y - self.years[0], 0, len(self.years) - 1)) for y in years)
+        return lo, hi
+
+    def _at(self, values: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        # values[f, idx[f]], NaN lorsque l'indice sort de la grille
+        ok = (idx >= 0) & (idx < values.shape[1])
+        out = np.full(len(idx), np.nan)
+        out[ok] = values[np.flatnonzero(ok), idx[ok]]
+        return out
+
+    def metrics(self, years) -> pd.DataFrame:
+        """Tous les critères de classement pour la plage d'années `years` = (début, fin)."""
+        lo, hi = self._columns(years)
+        prod = self.cum_production[:, hi + 1] - self.cum_production[:, lo]
+        imp = self.cum_importation[:, hi + 1] - self.cum_importation[:, lo]
+
+        # Première et dernière années observées dans la plage
+        first, last = self.next_market[:, lo], self.prev_market[:, hi]
+        first = np.where(first <= hi, first, -1)
+        last = np.where(last >= lo, last, -1)
+        span = np.where((first >= 0) & (last >= 0), last - first, np.nan)
+
+        target = self.prev_cible[:, hi]
+        target = np.where(target >= lo, target, -1)
+        return pd.DataFrame({
+            "Filière": list(self.filieres),
+            "Niveau de TC": safe_ratio(prod, prod + imp),
+            "TCAM du TC": annualised(safe_ratio(self._at(self.tc, last), self._at(self.tc, first)), span),
+            "Croissance des importations": annualised(
+                safe_ratio(self._at(self.importation, last), self._at(self.importation, first)), span),
+            "Écart à la cible": self._at(self.cible, target) - self._at(self.production, target),
+            "Début": np.where(first >= 0, self.years[0] + first, np.nan),
+            "Fin": np.where(last >= 0, self.years[0] + last, np.nan),
+        })
+
+    def rank(self, metric: str, years, n: int = 10, best: bool = True) -> pd.DataFrame:
+        """Les `n` meilleures (ou moins bonnes) filières selon `metric` ; NaN exclus."""
+        table = self.metrics(years).dropna(subset=[metric])
+        high_is_good = METRICS[metric][1]
+        table = table.sort_values(metric, ascending=best != high_is_good, kind="stable")
+        return table.head(n).reset_index(drop=True)
+
+
+@memoize
+def aggregates(dataset) -> Aggregates:
+    """Grille et sommes cumulées de toutes les filières, une fois par version des données."""
+    schema = dataset.schema
+    df = dataset.frame
+    # Plusieurs lignes par année (données infra-annuelles) : volumes sommés, cible la plus récente
+    grouped = df.groupby([schema.produit, schema.annee], observed=True, sort=False)
+    yearly = grouped[[schema.production, schema.importation]].sum(min_count=1)
+    if schema.cible:
+        yearly[schema.cible] = grouped[schema.cible].last()
+
+    names = list(dataset.filieres)
+    years = np.arange(int(df[schema.annee].min()), int(df[schema.annee].max()) + 1) if len(df) else np.arange(0)
+    rows = pd.Index(names).get_indexer(yearly.index.get_level_values(0).astype(object))
+    cols = yearly.index.get_level_values(1).to_numpy(dtype="int64") - (years[0] if len(years) else 0)
+
+    def grid(column):
+        out = np.full((len(names), len(years)), np.nan)
+        if column:
+            out[rows, cols] = yearly[column].to_numpy(dtype="float64")
+        return out
+
+    prod, imp, cible = grid(schema.production), grid(schema.importation), grid(schema.cible)
+    market = ~np.isnan(prod) & ~np.isnan(imp)
+    zero = np.zeros((len(names), 1))
+    return Aggregates(
+        filieres=tuple(names), years=years, production=prod, importation=imp, cible=cible,
+        tc=safe_ratio(prod, prod + imp),
+        cum_production=np.hstack([zero, np.cumsum(np.where(market, prod, 0), axis=1)]),
+        cum_importation=np.hstack([zero, np.cumsum(np.where(market, imp, 0), axis=1)]),
+        prev_market=_prev_valid(market), next_market=_next_valid(market),
+        prev_cible=_prev_valid(~np.isnan(prod) & ~np.isnan(cible)),
+    )
@@ -0,0 +1,236 @@
+"""
+Notes PDF par filière (graphique du tableau de bord, scénarios de TC, tableau des
+indicateurs), générées en parallèle avec les polices DejaVu fournies dans
+dejavu-sans.zip (accents garantis, sans installation de police).
+
+    python -m isub reports --out-dir rapports --horizon 2030
+"""
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from io import BytesIO
+
+import numpy as np
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.legends import Legend
+from reportlab.graphics.charts.lineplots import LinePlot
+from reportlab.graphics.shapes import Drawing
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from dataset import DATA_PATH, load_dataset
+from indicators import GAP_TARGET, GROWTH_PROD, TC, TIS
+from scenarios import SCENARIOS, project_frame
+from schema import normalize
+
+# Archive livrée avec le code : utilisable quel que soit le répertoire courant
+FONTS_ZIP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dejavu-sans.zip")
+FONT, FONT_BOLD = "DejaVuSans", "DejaVuSans-Bold"
+
+SCENARIO_COLORS = [colors.HexColor(c) for c in ("#2E8B57", "#FF8C00", "#800080", "#B22222")]
+
+_fonts_loaded = False
+
+
+def register_fonts(zip_path: str = FONTS_ZIP):
+    """Enregistre les polices DejaVu lues directement dans l'archive (une fois par processus)."""
+    global _fonts_loaded
+    if _fonts_loaded:
+        return
+    with zipfile.ZipFile(zip_path) as zf:
+        for name in (FONT, FONT_BOLD):
+            pdfmetrics.registerFont(TTFont(name, BytesIO(zf.read(f"{name}.ttf"))))
+    pdfmetrics.registerFontFamily(FONT, normal=FONT, bold=FONT_BOLD)
+    _fonts_loaded = True
+
+
+def _styles():
+    return {
+        "title": ParagraphStyle("title", fontName=FONT_BOLD, fontSize=18, leading=22,
+                                textColor=colors.HexColor("#003366"), spaceAfter=4),
+        "subtitle": ParagraphStyle("subtitle", fontName=FONT, fontSize=10, textColor=colors.grey),
+        "h2": ParagraphStyle("h2", fontName=FONT_BOLD, fontSize=13, leading=16,
+                             textColor=colors.HexColor("#003366"), spaceBefore=10, spaceAfter=6),
+        "body": ParagraphStyle("body", fontName=FONT, fontSize=9, leading=12),
+    }
+
+
+def _legend(items, x, y):
+    legend = Legend()
+    legend.x, legend.y = x, y
+    legend.fontName, legend.fontSize = FONT, 7
+    legend.alignment = "right"
+    legend.columnMaximum = 1  # une entrée par colonne : légende horizontale
+    legend.dxTextSpace = 4
+    legend.deltax = 10
+    legend.autoXPadding = 12
+    legend.colorNamePairs = items
+    return legend
+
+
+def _bar_chart(years, imports, production) -> Drawing:
+    """Importation et production par année (équivalent statique du tableau de bord)."""
+    d = Drawing(17 * cm, 6.5 * cm)
+    chart = VerticalBarChart()
+    chart.x, chart.y, chart.width, chart.height = 45, 35, 17 * cm - 60, 6.5 * cm - 60
+    chart.data = [np.nan_to_num(imports).tolist(), np.nan_to_num(production).tolist()]
+    chart.categoryAxis.categoryNames = [str(int(y)) for y in years]
+    chart.categoryAxis.labels.fontName = chart.valueAxis.labels.fontName = FONT
+    chart.categoryAxis.labels.fontSize = chart.valueAxis.labels.fontSize = 7
+    chart.valueAxis.labelTextFormat = lambda v: f"{v:,.0f}".replace(",", " ")
+    chart.bars[0].fillColor = colors.blue
+    chart.bars[1].fillColor = colors.orange
+    chart.barSpacing, chart.groupSpacing = 1, 6
+    d.add(chart)
+    d.add(_legend([(colors.blue, "Importation"), (colors.orange, "Production")], 45, 6.5 * cm - 8))
+    return d
+
+
+def _scenario_chart(hist_years, hist_tc, years, scenario_values) -> Drawing:
+    """TC historique et projections des quatre scénarios."""
+    d = Drawing(17 * cm, 6.5 * cm)
+    plot = LinePlot()
+    plot.x, plot.y, plot.width, plot.height = 45, 35, 17 * cm - 60, 6.5 * cm - 60
+    series = [list(zip(hist_years, hist_tc))]
+    series += [[(x, y) for x, y in zip(years, v) if y == y] for v in scenario_values]
+    plot.data = [s for s in series if s]
+    plot.lines[0].strokeColor = colors.HexColor("#0047AB")
+    plot.lines[0].strokeWidth = 2
+    for i, c in enumerate(SCENARIO_COLORS, start=1):
+        plot.lines[i].strokeColor = c
+        plot.lines[i].strokeDashArray = [3, 2]
+    plot.xValueAxis.labels.fontName = plot.yValueAxis.labels.fontName = FONT
+    plot.xValueAxis.labels.fontSize = plot.yValueAxis.labels.fontSize = 7
+    plot.xValueAxis.labelTextFormat = "%d"
+    plot.yValueAxis.labelTextFormat = "%.2f"
+    d.add(plot)
+    items = [(colors.HexColor("#0047AB"), "TC historique")]
+    items += [(c, s.name) for c, s in zip(SCENARIO_COLORS, SCENARIOS)]
+    d.add(_legend(items, 45, 6.5 * cm - 8))
+    return d
+
+
+def _fmt(value, pattern):
+    return "–" if value != value else pattern.format(value).replace(",", " ")
+
+
+def build_report(dataset, filiere, horizon: int, out_path: str) -> str:
+    """Écrit la note PDF d'une filière et renvoie son chemin."""
+    register_fonts()
+    schema = dataset.schema
+    start, stop = dataset.bounds(filiere)
+    df = dataset.frame.iloc[start:stop]
+    styles = _styles()
+
+    years = df[schema.annee].to_numpy()
+    projection = project_frame(df.dropna(subset=[TC]), schema.produit, schema.annee, {TC: TC}, horizon)
+    if filiere in projection.filieres:
+        proj_years, tc = projection.series(TC, filiere)
+    else:  # TC jamais défini (marché nul) : historique seul
+        proj_years, tc = np.arange(0), {}
+
+    rows = [["Année", "Importation (t)", "Production (t)", "TC", "TIS", "Croiss. prod.", "Écart cible (t)"]]
+    for _, r in df.iterrows():
+        rows.append([str(int(r[schema.annee])), _fmt(r[schema.importation], "{:,.0f}"),
+                     _fmt(r[schema.production], "{:,.0f}"), _fmt(r[TC], "{:.3f}"), _fmt(r[TIS], "{:.3f}"),
+                     _fmt(r[GROWTH_PROD] * 100, "{:+.1f} %"), _fmt(r[GAP_TARGET], "{:,.0f}")])
+    table = Table(rows, repeatRows=1)
+    table.setStyle(TableStyle([
+        ("FONTNAME", (0, 0), (-1, -1), FONT),
+        ("FONTNAME", (0, 0), (-1, 0), FONT_BOLD),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#003366")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#EEF3F8")]),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.HexColor("#BBBBBB")),
+    ]))
+
+    story = [
+        Paragraph(f"Note d’import-substitution — {filiere}", styles["title"]),
+        Paragraph(f"MINEPAT — Direction Générale de l’Économie · édition du {date.today():%d/%m/%Y}",
+                  styles["subtitle"]),
+        Paragraph("Importation et production nationale", styles["h2"]),
+        _bar_chart(years, df[schema.importation].to_numpy(), df[schema.production].to_numpy()),
+        Paragraph(f"Taux de couverture : historique et scénarios jusqu’en {horizon}", styles["h2"]),
+        _scenario_chart(years.tolist(), df[TC].fillna(0).tolist(), proj_years.tolist(), list(tc.values())),
+        Paragraph("Indicateurs", styles["h2"]),
+        table,
+        Spacer(1, 8),
+        Paragraph("TC = Production / (Production + Importation) ; TIS = Importation / (Production + Importation). "
+                  "Scénarios : référence +1,5 %/an, optimal +6 %/an, choc exogène −3 % puis +2 %/an, "
+                  "choc endogène +0,5 %·t.", styles["body"]),
+    ]
+    SimpleDocTemplate(out_path, pagesize=A4, leftMargin=2 * cm, rightMargin=2 * cm,
+                      topMargin=1.5 * cm, bottomMargin=1.5 * cm,
+                      title=f"Import-substitution — {filiere}").build(story)
+    return out_path
+
+
+def report_filename(filiere) -> str:
+    return "note_" + (normalize(filiere).replace(" ", "_") or "sans_nom") + ".pdf"
+
+
+def report_filenames(filieres) -> dict:
+    """
+    {filière: nom de fichier}, sans doublon : les filières qui ne diffèrent que par la casse,
+    les accents ou la ponctuation reçoivent un suffixe (note_riz.pdf, note_riz-2.pdf...).
+    """
+    names, taken = {}, set()
+    for filiere in filieres:
+        base = report_filename(filiere)[:-len(".pdf")]
+        name, n = base + ".pdf", 1
+        while name in taken:  # "-" n'apparaît jamais dans un nom normalisé
+            n += 1
+            name = f"{base}-{n}.pdf"
+        taken.add(name)
+        names[filiere] = name
+    return names
+
+
+def _worker(data_path: str, filiere, horizon: int, out_path: str):
+    start = time.perf_counter()
+    path = build_report(load_dataset(data_path), filiere, horizon, out_path)
+    return filiere, path, time.perf_counter() - start
+
+
+def generate_reports(data_path: str = DATA_PATH, out_dir: str = "rapports", horizon: int = 2030,
+                     filieres=None, jobs: int = None, progress=print) -> tuple:
+    """
+    Génère une note par filière sur un pool de processus (polices chargées une fois
+    par processus). `progress` reçoit une ligne par note terminée ou en échec ;
+    l'échec d'une note n'interrompt pas les autres. Deux filières ne partagent
+    jamais un fichier (cf. `report_filenames`).
+    Renvoie le couple (résultats, échecs) : [(filière, chemin, secondes)] et
+    {filière: message d'erreur}.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    dataset = load_dataset(data_path)
+    names = list(dict.fromkeys(filieres)) if filieres else list(dataset.filieres)
+    paths = {f: os.path.join(out_dir, name) for f, name in report_filenames(names).items()}
+    start = time.perf_counter()
+    results, failures = [], {}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=register_fonts) as pool:
+        futures = {pool.submit(_worker, dataset.path, f, horizon, paths[f]): f for f in names}
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                filiere, path, seconds = future.result()
+            except Exception as e:
+                failures[futures[future]] = f"{type(e).__name__}: {e}"
+                if progress:
+                    progress(f"[{done}/{len(names)}] {futures[future]} : échec ({failures[futures[future]]})")
+                continue
+            results.append((filiere, path, seconds))
+            if progress:
+                progress(f"[{done}/{len(names)}] {filiere} : {seconds:.2f} s -> {path}")
+    if progress:
+        progress(f"{len(results)} notes en {time.perf_counter() - start:.2f} s"
+                 + (f", {len(failures)} en échec" if failures else ""))
+    return results, failures
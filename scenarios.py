@@ -0,0 +1,190 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from indicators import TC, TIS
+from memo import memoize
+
+# Horizon maximal proposé dans l'interface (le calcul ne dépend pas de la longueur)
+HORIZON_MAX = 2050
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    Trajectoire V(t) = V0 × (1 + choc) × (1 + croissance)^t × (1 + linéaire × t),
+    t = 0 correspondant à la dernière année observée.
+    """
+    name: str
+    growth: float = 0.0   # croissance annuelle composée
+    shock: float = 0.0    # choc dès la première année (-0.03 : baisse de 3 %)
+    linear: float = 0.0   # croissance linéaire par an
+
+
+# Les quatre scénarios standards (cf. page « À propos »)
+SCENARIOS = (
+    Scenario("Référence", growth=0.015),
+    Scenario("Optimal", growth=0.06),
+    Scenario("Choc exogène", growth=0.02, shock=-0.03),
+    Scenario("Choc endogène", linear=0.005),
+)
+
+
+def trajectory(start, t, growth, shock=0.0, linear=0.0) -> np.ndarray:
+    """Formule de `Scenario`, diffusée (broadcast) sur des tableaux de formes compatibles."""
+    values = start * (1 + shock) * (1 + growth) ** t * (1 + linear * t)
+    return np.where(t >= 0, values, np.nan)
+
+
+def project(start, steps, scenarios=SCENARIOS) -> np.ndarray:
+    """
+    Projette chaque valeur de départ selon chaque scénario, en forme fermée.
+    `start` : (F,) ; `steps` : (T,) ou (F, T) années écoulées depuis V0.
+    Renvoie un tableau (F, scénarios, T) ; les pas négatifs donnent NaN.
+    """
+    start = np.asarray(start, dtype="float64")
+    t = np.asarray(steps, dtype="float64")
+    t = np.broadcast_to(t, (start.shape[0], t.shape[-1]))[:, None, :]
+
+    growth = np.array([s.growth for s in scenarios])[None, :, None]
+    shock = np.array([s.shock for s in scenarios])[None, :, None]
+    linear = np.array([s.linear for s in scenarios])[None, :, None]
+    return trajectory(start[:, None, None], t, growth, shock, linear)
+
+
+@dataclass(frozen=True, eq=False)
+class Projection:
+    """Projections denses (filière × scénario × année) pour une ou plusieurs séries."""
+    filieres: tuple
+    scenarios: tuple
+    years: np.ndarray
+    last_year: np.ndarray
+    values: dict  # nom de série -> tableau (F, S, T)
+
+    def series(self, name: str, filiere):
+        """Années projetées et {scénario: valeurs} pour une filière (à partir de sa dernière année)."""
+        i = self.filieres.index(filiere)
+        keep = self.years >= self.last_year[i]
+        data = self.values[name][i][:, keep]
+        return self.years[keep], {s.name: data[j] for j, s in enumerate(self.scenarios)}
+
+    def to_frame(self) -> pd.DataFrame:
+        """Format long : filière, scénario, année, une colonne par série."""
+        f, s, t = np.meshgrid(np.arange(len(self.filieres)), np.arange(len(self.scenarios)),
+                              np.arange(len(self.years)), indexing="ij")
+        out = pd.DataFrame({
+            "filière": np.asarray(self.filieres, dtype=object)[f.ravel()],
+            "scénario": np.array([sc.name for sc in self.scenarios], dtype=object)[s.ravel()],
+            "année": self.years[t.ravel()],
+        })
+        for name, arr in self.values.items():
+            out[name] = arr.ravel()
+        return out.dropna(subset=list(self.values)).reset_index(drop=True)
+
+
+@memoize
+def project_frame(df: pd.DataFrame, col_produits: str, col_annee: str, columns: dict,
+                  horizon: int, scenarios=SCENARIOS) -> Projection:
+    """
+    Projette toutes les filières de `df` jusqu'à `horizon` à partir de leur dernière
+    année observée. `columns` associe un nom de série à sa colonne ({"TC": "TC", ...}).
+    """
+    last = (df.sort_values([col_produits, col_annee], kind="stable")
+              .drop_duplicates(col_produits, keep="last"))
+    last_year = last[col_annee].to_numpy(dtype="int64")
+    if not len(last):  # aucune valeur observée (ex. TC entièrement indéfini)
+        return Projection(filieres=(), scenarios=tuple(scenarios), years=np.arange(0), last_year=last_year,
+                          values={name: np.empty((0, len(scenarios), 0)) for name in columns})
+    years = np.arange(last_year.min(), max(horizon, last_year.max()) + 1)
+    steps = years[None, :] - last_year[:, None]
+
+    values = {name: project(last[col].to_numpy(), steps, scenarios) for name, col in columns.items()}
+    return Projection(filieres=tuple(last[col_produits]), scenarios=tuple(scenarios),
+                      years=years, last_year=last_year, values=values)
+
+
+@memoize
+def dataset_projection(dataset, horizon: int, scenarios=SCENARIOS) -> Projection:
+    """
+    Projections TIS et TC de toutes les filières (page Scénarios), mises en cache par
+    (version des données, horizon) : la clé ne hache que l'empreinte du jeu de données.
+    Lignes retenues : TIS, production et importation renseignés ; TC indéfini (marché nul) -> 0.
+    """
+    schema = dataset.schema
+    df = dataset.frame.dropna(subset=[schema.produit, schema.annee, TIS, schema.production, schema.importation])
+    df[TC] = df[TC].fillna(0)
+    return project_frame.uncached(df, schema.produit, schema.annee, {TIS: TIS, TC: TC}, horizon, scenarios)
+
+
+# -----------------------------
+# Balayage des hypothèses : croissance × choc × année, pour toutes les filières
+# -----------------------------
+@dataclass(frozen=True, eq=False)
+class SweepCube:
+    """
+    Valeurs projetées `values` (filière × croissance × choc × année) et cible de chaque
+    filière ; les méthodes renvoient des coupes prêtes pour une carte de chaleur.
+    """
+    filieres: tuple
+    growth: np.ndarray
+    shock: np.ndarray
+    years: np.ndarray
+    values: np.ndarray  # (F, G, S, T) float32
+    target: np.ndarray  # (F,) NaN si pas de cible
+
+    def _year(self, year) -> int:
+        j = int(np.searchsorted(self.years, year))
+        if j == len(self.years) or self.years[j] != year:
+            span = f"{self.years[0]}–{self.years[-1]}" if len(self.years) else "aucune année"
+            raise ValueError(f"année {year} hors du balayage ({span})")
+        return j
+
+    def ratio(self, filiere, year) -> np.ndarray:
+        """(G, S) : valeur projetée / cible pour une filière et une année."""
+        i, j = self.filieres.index(filiere), self._year(year)
+        return self.values[i, :, :, j] / self.target[i]
+
+    def reach_year(self, filiere) -> np.ndarray:
+        """(G, S) : première année où la cible est atteinte (NaN si jamais sur la période)."""
+        i = self.filieres.index(filiere)
+        ok = self.values[i] >= self.target[i]
+        first = np.argmax(ok, axis=-1)
+        return np.where(ok.any(axis=-1), self.years[first], np.nan)
+
+    def share_reaching(self, year) -> np.ndarray:
+        """(G, S) : part des filières ayant une cible qui l'atteignent en `year`."""
+        j = self._year(year)
+        has = ~np.isnan(self.target)
+        if not has.any():
+            return np.full(self.values.shape[1:3], np.nan)
+        return (self.values[has, :, :, j] >= self.target[has, None, None]).mean(axis=0)
+
+
+def sweep(filieres, start, last_year, target, growth, shock, years) -> SweepCube:
+    """
+    Évalue toute la grille croissance × choc pour toutes les filières et toutes les
+    années demandées en un seul calcul diffusé (F × G × S × T valeurs, en float32).
+    """
+    start = np.asarray(start, dtype="float64")[:, None, None, None]
+    years = np.asarray(years, dtype="int64")
+    t = (years[None, :] - np.asarray(last_year, dtype="int64")[:, None])[:, None, None, :]
+    growth = np.asarray(growth, dtype="float64")
+    shock = np.asarray(shock, dtype="float64")
+    values = trajectory(start, t, growth[None, :, None, None], shock[None, None, :, None])
+    return SweepCube(filieres=tuple(filieres), growth=growth, shock=shock, years=years,
+                     values=values.astype("float32"), target=np.asarray(target, dtype="float64"))
+
+
+def production_sweep(dataset, growth, shock, years, filieres=None) -> SweepCube:
+    """Balayage de la production nationale de chaque filière face à sa dernière cible PIISAH."""
+    schema = dataset.schema
+    df = dataset.select(filieres).dropna(subset=[schema.production])
+    last = df.drop_duplicates(schema.produit, keep="last")  # lignes triées par (filière, année)
+    names = tuple(last[schema.produit])
+    target = np.full(len(names), np.nan)
+    if schema.cible:
+        cibles = df.dropna(subset=[schema.cible]).groupby(schema.produit, observed=True)[schema.cible].last()
+        target = cibles.reindex(list(names)).to_numpy(dtype="float64")
+    return sweep(names, last[schema.production].to_numpy(), last[schema.annee].to_numpy(),
+                 target, growth, shock, years)
@@ -0,0 +1,88 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Optional
+
+# Table canonique des alias : champ logique -> alias, du plus spécifique au plus général.
+# Les champs sont résolus dans cet ordre et une colonne attribuée n'est plus candidate
+# pour les suivants (ex. "cible_piisah_production" n'est pas prise pour "production").
+ALIASES = {
+    "cible": ["cible piisah production", "cible piisah", "cible"],
+    "produit": ["produit", "filiere"],
+    "annee": ["annee", "year"],
+    "importation": ["importation", "import"],
+    "production": ["production nationale", "production", "prod"],
+    "taux": ["taux de couverture", "taux"],
+}
+
+
+def normalize(name) -> str:
+    """Minuscules, sans accents ni ponctuation : "Année " -> "annee"."""
+    text = unicodedata.normalize("NFKD", str(name))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", text.lower()).split())
+
+
+@dataclass(frozen=True)
+class Schema:
+    """Correspondance champ logique -> colonne physique d'un jeu de données."""
+    produit: Optional[str] = None
+    annee: Optional[str] = None
+    importation: Optional[str] = None
+    production: Optional[str] = None
+    taux: Optional[str] = None
+    cible: Optional[str] = None
+    # Champs sans colonne, et paires (champ, colonnes) quand plusieurs colonnes correspondaient
+    missing: tuple = ()
+    ambiguous: tuple = ()
+
+    def as_dict(self) -> dict:
+        return {f: getattr(self, f) for f in ALIASES}
+
+    def require(self, *names):
+        """Lève ValueError si l'un des champs demandés n'a pas de colonne."""
+        absent = [n for n in names if getattr(self, n) is None]
+        if absent:
+            raise ValueError(f"Colonnes introuvables : {', '.join(absent)}")
+        return self
+
+
+def resolve_schema(columns) -> Schema:
+    """
+    Associe chaque champ logique à une colonne. Les noms sont comparés après
+    normalisation (accents, casse, ponctuation) ; le premier alias qui correspond
+    à au moins une colonne libre l'emporte.
+    """
+    normalized = [(c, normalize(c)) for c in columns]
+    mapping, missing, ambiguous = {}, [], []
+    taken = set()
+
+    for name, aliases in ALIASES.items():
+        for alias in aliases:
+            matches = [c for c, n in normalized if c not in taken and alias in n]
+            if matches:
+                mapping[name] = matches[0]
+                taken.add(matches[0])
+                if len(matches) > 1:
+                    ambiguous.append((name, tuple(matches)))
+                break
+        else:
+            missing.append(name)
+
+    return Schema(missing=tuple(missing), ambiguous=tuple(ambiguous), **mapping)
+
+
+def schema_from_dict(data: dict) -> Schema:
+    """Reconstruit un Schema sérialisé (métadonnées de l'instantané Arrow)."""
+    return Schema(
+        missing=tuple(data.get("missing", ())),
+        ambiguous=tuple((k, tuple(v)) for k, v in data.get("ambiguous", {}).items()),
+        **{k: data.get(k) for k in ALIASES},
+    )
+
+
+def schema_to_dict(schema: Schema) -> dict:
+    data = schema.as_dict()
+    data["missing"] = list(schema.missing)
+    data["ambiguous"] = {k: list(v) for k, v in schema.ambiguous}
+    return data
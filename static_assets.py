@@ -0,0 +1,87 @@
+"""
+Variantes optimisées des images de la page d'accueil (redimensionnées à la taille
+d'affichage et recompressées en WebP), construites une fois par version de fichier.
+
+    python static_assets.py   # pré-construit toutes les variantes (ex. au déploiement)
+"""
+import base64
+import hashlib
+import mimetypes
+import os
+from functools import lru_cache
+
+try:
+    from PIL import Image
+except ImportError:  # sans Pillow, les fichiers d'origine sont servis
+    Image = None
+
+BUILD_DIR = os.path.join(".cache", "assets")
+WEBP_QUALITY = 82
+
+# Largeur de construction (en pixels) : le double de la largeur affichée, pour les écrans haute densité
+LOGO_WIDTH = 100       # logos du bandeau, affichés à 50 px
+PORTRAIT_WIDTH = 480   # portraits, colonne de ~240 px
+
+ASSETS = {
+    "assets/cameroun-seal.png": LOGO_WIDTH,
+    "assets/minepat-logo.png": LOGO_WIDTH,
+    "assets/ministre.png": PORTRAIT_WIDTH,
+    "assets/secretaire.jpg": PORTRAIT_WIDTH,
+    "assets/directeur_general.jpg": PORTRAIT_WIDTH,
+}
+
+
+def _digest(path: str) -> str:
+    # Haché ici plutôt que via dataset.file_digest : la page d'accueil n'importe ni pandas ni pyarrow
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+@lru_cache(maxsize=64)
+def _build(path: str, mtime_ns: int, size: int, width: int) -> str:
+    if Image is None:
+        return path
+    stem = os.path.splitext(os.path.basename(path))[0]
+    out = os.path.join(BUILD_DIR, f"{stem}-{_digest(path)[:12]}-{width}.webp")
+    if os.path.exists(out):
+        return out
+
+    with Image.open(path) as im:
+        im = im.convert("RGBA" if "A" in im.getbands() else "RGB")
+        if im.width > width:
+            im = im.resize((width, round(im.height * width / im.width)), Image.LANCZOS)
+        os.makedirs(BUILD_DIR, exist_ok=True)
+        tmp = f"{out}.{os.getpid()}.tmp"
+        im.save(tmp, format="WEBP", quality=WEBP_QUALITY, method=6)
+    os.replace(tmp, out)
+    return out
+
+
+def optimized_asset(path: str, width: int = None) -> str:
+    """Chemin de la variante optimisée de `path` (construite au premier appel)."""
+    width = width or ASSETS.get(path, PORTRAIT_WIDTH)
+    st = os.stat(path)
+    try:
+        return _build(path, st.st_mtime_ns, st.st_size, width)
+    except OSError:
+        return path  # répertoire de construction non inscriptible
+
+
+@lru_cache(maxsize=64)
+def _data_uri(path: str, mtime_ns: int, size: int) -> str:
+    mime = mimetypes.guess_type(path)[0] or "image/webp"
+    with open(path, "rb") as f:
+        return f"data:{mime};base64,{base64.b64encode(f.read()).decode()}"
+
+
+def asset_data_uri(path: str, width: int = None) -> str:
+    """URI data: de la variante optimisée, encodée une seule fois par version du fichier."""
+    built = optimized_asset(path, width)
+    st = os.stat(built)
+    return _data_uri(built, st.st_mtime_ns, st.st_size)
+
+
+if __name__ == "__main__":
+    for src, w in ASSETS.items():
+        dst = optimized_asset(src, w)
+        print(f"{src} ({os.path.getsize(src) // 1024} Ko) -> {dst} ({os.path.getsize(dst) // 1024} Ko)")
@@ -0,0 +1,35 @@
+import os
+import tempfile
+
+# Cache memo.py isolé, avant tout import des modules qui le lisent
+os.environ.setdefault("ISUB_CACHE_DIR", tempfile.mkdtemp(prefix="isub-memo-"))
+
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from bench.synthetic import write_workbook  # noqa: E402
+from dataset import load_dataset  # noqa: E402
+
+SMALL = pd.DataFrame({
+    "produits": ["Riz"] * 4 + ["Blé"] * 3,
+    "Année": [2020, 2021, 2022, 2023, 2021, 2022, 2023],
+    "Taux de couverture": [0.2, 0.25, 0.3, 0.35, 0.1, 0.1, 0.2],
+    "Importation (en tonne)": ["800", "750", "1 400", "650", 900.0, 0.0, 800.0],
+    "Production nationale (en tonne)": [200.0, 250.0, "600,0", 350.0, 100.0, 0.0, 200.0],
+    "cible_piisah_production": [300.0, 300.0, 600.0, 700.0, None, 150.0, 250.0],
+})
+
+
+@pytest.fixture(scope="session")
+def small_dataset(tmp_path_factory):
+    """Deux filières aux valeurs connues (texte à la française, marché nul compris)."""
+    path = tmp_path_factory.mktemp("small") / "BD.xlsx"
+    SMALL.to_excel(path, index=False)
+    return load_dataset(str(path))
+
+
+@pytest.fixture(scope="session")
+def synthetic_dataset(tmp_path_factory):
+    """Classeur synthétique de bench/ : 12 filières × 20 ans, 5 % de cellules mal saisies."""
+    path = tmp_path_factory.mktemp("synthetic") / "BD.xlsx"
+    return load_dataset(write_workbook(str(path), 12, 20))
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from isub import batch
+from isub.batch import indicator_table, scenario_table
+from isub.cli import build_parser
+
+
+def test_scenarios_stay_in_process_below_threshold(synthetic_dataset, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("aucun processus attendu")
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", no_pool)
+    df = scenario_table(synthetic_dataset, 2030, jobs=8)
+    assert df["filière"].nunique() == len(synthetic_dataset.filieres)
+    assert build_parser().parse_args(["scenarios"]).jobs == 1
+
+
+def test_parallel_scenarios_match_serial(synthetic_dataset, monkeypatch):
+    serial = scenario_table(synthetic_dataset, 2030)
+    monkeypatch.setattr(batch, "PARALLEL_MIN_FILIERES", 1)
+    parallel = scenario_table(synthetic_dataset, 2030, jobs=2)
+    pd.testing.assert_frame_equal(parallel, serial)
+
+
+def test_indicator_table_selection(small_dataset):
+    df = indicator_table(small_dataset, ["Riz"])
+    assert df["produits"].unique().tolist() == ["Riz"] and df["Année"].is_monotonic_increasing
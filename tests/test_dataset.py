@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from dataset import compact_frame
+from indicators import INDICATORS
+from schema import resolve_schema
+
+
+def _frame():
+    return pd.DataFrame({
+        "produits": ["Riz", "Riz", "Blé"],
+        "Année": [2022.0, 2023.0, 2023.0],
+        "Importation (en tonne)": [12799.0, 744500.0, 304149.0],        # entiers exacts en float32
+        "Production nationale (en tonne)": [140327504.5, 1.0, 2.0],    # non représentable
+        "TC": [0.1, 0.2, 0.3],
+    })
+
+
+def test_default_compaction_is_lossless():
+    df = _frame()
+    out, info = compact_frame(df, resolve_schema(df.columns), rtol=0)
+    assert out["Importation (en tonne)"].dtype == "float32"
+    assert out["Production nationale (en tonne)"].dtype == "float64"
+    assert out["TC"].dtype == "float64"
+    assert out["Année"].dtype == "int16"
+    assert isinstance(out["produits"].dtype, pd.CategoricalDtype)
+    for col in ("Importation (en tonne)", "Production nationale (en tonne)", "TC"):
+        assert np.array_equal(out[col].astype("float64"), df[col])
+    assert info["bytes_after"] <= info["bytes_before"]
+
+
+def test_tolerance_and_opt_out():
+    df = _frame()
+    schema = resolve_schema(df.columns)
+    lossy, _ = compact_frame(df, schema, rtol=1e-6)
+    assert lossy["TC"].dtype == "float32"
+    none, _ = compact_frame(df, schema, rtol=-1)
+    assert none["Importation (en tonne)"].dtype == "float64"
+
+
+def test_source_frame_has_workbook_columns_at_full_precision(small_dataset):
+    src = small_dataset.source_frame()
+    assert not set(INDICATORS) & set(src.columns)
+    assert all(src[c].dtype != "float32" for c in src.columns)
+    riz = src[src["produits"] == "Riz"].set_index("Année")
+    assert riz.loc[2022, "Importation (en tonne)"] == 1400.0
+    assert riz.loc[2022, "Production nationale (en tonne)"] == 600.0
+
+
+def test_synthetic_workbook_cleaning(synthetic_dataset):
+    ds = synthetic_dataset
+    assert len(ds.filieres) == 12
+    # Cellules « n.d. » / « - » signalées, le reste converti
+    assert all(v in ("n.d.", "-") for values in ds.coerced.values() for v in values)
+    assert ds.frame["Importation (en tonne)"].notna().mean() > 0.9
+
+
+def test_sorted_index_bounds_and_select(small_dataset):
+    ds = small_dataset
+    assert ds.filieres == ("Blé", "Riz")
+    assert ds.bounds("Blé") == (0, 3)
+    assert ds.bounds("Riz") == (3, 7)
+    assert ds.bounds("Riz", (2021, 2022)) == (4, 6)
+    assert ds.bounds("Riz", (2030, 2040)) == (7, 7)
+    assert ds.bounds("Inconnue") == (0, 0)
+
+    df = ds.select(["Riz", "Blé"], (2022, 2023))
+    assert list(zip(df["produits"], df["Année"])) == [("Blé", 2022), ("Blé", 2023), ("Riz", 2022), ("Riz", 2023)]
+    assert len(ds.select()) == 7
+    assert ds.select(["Inconnue"]).empty
+    assert list(ds.slices(["Riz", "Blé"], (2020, 2020))) == ["Riz"]
+
+
+def test_frame_is_a_shallow_copy(small_dataset):
+    df = small_dataset.frame
+    df["extra"] = 1
+    assert "extra" not in small_dataset.frame.columns
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from downsample import downsample_frame, filiere_points, lttb_indices, minmax_indices
+
+
+def _series(n=10_000, seed=0):
+    rng = np.random.default_rng(seed)
+    y = np.cumsum(rng.standard_normal(n))
+    y[1234] = y.max() + 50   # pic isolé
+    y[8765] = y.min() - 50   # creux isolé
+    return np.arange(n, dtype="float64"), y
+
+
+@pytest.mark.parametrize("budget", [1, 2, 3, 4, 5, 100, 999, 2000])
+def test_minmax_respects_budget_and_keeps_extremes(budget):
+    x, y = _series()
+    idx = minmax_indices(y, budget)
+    assert len(idx) <= budget
+    assert np.all(np.diff(idx) > 0)
+    if budget >= 2:
+        assert idx[0] == 0 and idx[-1] == len(y) - 1
+    if budget >= 4:
+        assert {1234, 8765} <= set(idx)
+
+
+@pytest.mark.parametrize("budget", [3, 10, 100, 2000])
+def test_lttb_respects_budget_and_keeps_extremes(budget):
+    x, y = _series()
+    idx = lttb_indices(x, y, budget)
+    assert len(idx) <= budget
+    assert np.all(np.diff(idx) > 0)
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    if budget >= 10:
+        assert {1234, 8765} <= set(idx)
+
+
+def test_short_series_and_nan_buckets():
+    assert minmax_indices(np.arange(5.0), 10).tolist() == list(range(5))
+    assert lttb_indices(np.arange(5.0), np.arange(5.0), 10).tolist() == list(range(5))
+    y = np.full(1000, np.nan)
+    y[500] = 1.0
+    assert 500 in minmax_indices(y, 100) and 500 in lttb_indices(np.arange(1000.0), y, 100)
+
+
+def test_downsample_frame_keeps_union_of_series():
+    x, y = _series()
+    df = pd.DataFrame({"x": x, "a": y, "b": -y[::-1]})
+    out = downsample_frame(df, "x", ["a", "b"], budget=100)
+    assert len(out) <= 200 and out.index.is_monotonic_increasing
+    assert {1234, 8765, len(y) - 1 - 1234, len(y) - 1 - 8765} <= set(out.index)
+    assert downsample_frame(df, "x", ["a"], budget=0) is df
+
+
+def test_filiere_points_within_budget(synthetic_dataset):
+    ds = synthetic_dataset
+    name = ds.filieres[0]
+    cols = (ds.schema.production,)
+    assert len(filiere_points(ds, name, (1975, 1994), 8, cols)) <= 8
+    full = filiere_points(ds, name, (1975, 1994), 0, cols)
+    assert full["Année"].tolist() == list(range(1975, 1995))
@@ -0,0 +1,69 @@
+import zipfile
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import _iter_rows, dataset_export_bytes, to_csv_zip_bytes, to_excel_bytes, to_parquet_bytes
+
+
+def _frame():
+    return pd.DataFrame({
+        "produits": ["Riz", "Blé", "Mil"],
+        "Année": np.array([2021, 2022, 2023], dtype="int16"),
+        "Importation": np.array([0.1, np.nan, 707247360.0], dtype="float32"),
+        "TC": [0.25, 1 / 3, np.nan],
+    })
+
+
+def test_excel_round_trip_with_sheets():
+    df = _frame()
+    data = to_excel_bytes({"Données": df, "a/b:c": df["TC"], "Note": "texte libre"})
+    sheets = pd.read_excel(BytesIO(data), sheet_name=None)
+    assert list(sheets) == ["Données", "a_b_c", "Note"]
+    got = sheets["Données"]
+    assert got["produits"].tolist() == ["Riz", "Blé", "Mil"]
+    assert got["Année"].tolist() == [2021, 2022, 2023]
+    # float32 élargi par l'écriture décimale la plus courte, cellules vides pour NaN
+    assert got["Importation"][0] == 0.1 and np.isnan(got["Importation"][1])
+    np.testing.assert_array_equal(got["TC"], df["TC"])
+    assert sheets["a_b_c"].columns.tolist() == ["TC"]
+    assert sheets["Note"].iloc[0, 0] == "texte libre"
+
+
+def test_csv_zip_round_trip():
+    df = _frame()
+    with zipfile.ZipFile(BytesIO(to_csv_zip_bytes({"Données": df, "Série": df["TC"]}))) as zf:
+        assert zf.namelist() == ["Données.csv", "Série.csv"]
+        got = pd.read_csv(zf.open("Données.csv"), sep=";", encoding="utf-8-sig")
+    assert got.columns.tolist() == df.columns.tolist()
+    assert got["Importation"].tolist()[::2] == [0.1, 707247360.0] and np.isnan(got["Importation"][1])
+    np.testing.assert_array_equal(got["TC"], df["TC"])
+
+
+def test_parquet_round_trip():
+    df = _frame()
+    pd.testing.assert_frame_equal(pd.read_parquet(BytesIO(to_parquet_bytes(df))), df)
+    assert pd.read_parquet(BytesIO(to_parquet_bytes(df["TC"]))).columns.tolist() == ["TC"]
+    with pytest.raises(TypeError):
+        to_parquet_bytes.uncached("texte")
+
+
+def test_rows_are_converted_by_chunks():
+    df = pd.DataFrame({"x": np.arange(7, dtype="float32"), "y": [None, "a", "b", "c", "d", "e", "f"]})
+    rows = list(_iter_rows([df["x"], df["y"]], chunk_rows=3))
+    assert rows == [(float(i), None if i == 0 else "abcdef"[i - 1]) for i in range(7)]
+
+
+def test_dataset_exports_are_keyed_on_the_dataset(small_dataset, monkeypatch):
+    src = small_dataset.source_frame()
+    got = pd.read_parquet(BytesIO(dataset_export_bytes(small_dataset, "parquet")))
+    pd.testing.assert_frame_equal(got, src.reset_index(drop=True), check_categorical=False, check_dtype=False)
+    assert dataset_export_bytes(small_dataset, "csv.zip")[:2] == b"PK"
+    # Second appel : servi par le cache, sans hacher le tableau
+    monkeypatch.setattr(pd.util, "hash_pandas_object", None)
+    assert pd.read_excel(BytesIO(dataset_export_bytes(small_dataset, "xlsx"))).shape == src.shape
+    assert dataset_export_bytes(small_dataset, "xlsx") == dataset_export_bytes(small_dataset, "xlsx")
+    with pytest.raises(ValueError, match="format"):
+        dataset_export_bytes.uncached(small_dataset, "ods")
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+import forecast
+from bench.synthetic import write_workbook
+from dataset import load_dataset
+from forecast import MODELS, fit_models, predict, select_model
+
+
+def test_select_model_picks_exact_linear_trend():
+    t = np.arange(2010, 2020.0)
+    fit = select_model("x", t, 100 + 5 * (t - 2010))
+    assert fit.model in ("Tendance linéaire", "Holt")
+    assert fit.errors[fit.model] == pytest.approx(0, abs=1e-9)
+    assert predict(fit, [2019, 2021]) == pytest.approx([145, 155])
+
+
+def test_refit_failure_falls_back_to_next_model():
+    # La tendance log gagne le backtest mais ne peut être réajustée (valeur nulle retenue)
+    t = np.arange(2010, 2020.0)
+    y = 0.01 * 1.5 ** np.arange(10)
+    y[-3] = 0
+    fit = select_model("x", t, y)
+    assert fit.params is not None
+    assert fit.model != "Tendance log"
+    assert np.isfinite(predict(fit, [2019, 2020])).all()
+
+
+def test_short_or_empty_series_are_naive():
+    fit = select_model("x", np.array([2020.0, 2021.0]), np.array([1.0, 2.0]))
+    assert fit.model == "Naïf"
+    assert predict(fit, [2020, 2021, 2023]) == pytest.approx([np.nan, 2.0, 2.0], nan_ok=True)
+    assert select_model("x", np.array([2020.0]), np.array([np.nan])).model == "Naïf"
+
+
+def test_predict_bounds_and_past_years():
+    t = np.arange(2010, 2020.0)
+    fit = select_model("x", t, np.linspace(0.5, 0.95, 10), models=MODELS)
+    values = predict(fit, [2015, 2019, 2030], bounds=(0.0, 1.0))
+    assert np.isnan(values[0])
+    assert 0 <= values[2] <= 1
+
+
+def test_parallel_fits_match_the_given_version(tmp_path, monkeypatch):
+    path = tmp_path / "BD.xlsx"
+    write_workbook(str(path), 6, 15)
+    ds = load_dataset(str(path))
+    column = ds.schema.production
+    serial = fit_models.uncached(ds, column, jobs=1)
+
+    # Le classeur change sur disque : les processus de travail ajustent quand même `ds`
+    write_workbook(str(path), 6, 15, seed=1)
+    monkeypatch.setattr(forecast, "PARALLEL_MIN_FILIERES", 1)
+    parallel = fit_models.uncached(ds, column, jobs=2)
+    assert list(parallel) == list(serial)
+    for name, fit in serial.items():
+        assert parallel[name].model == fit.model
+        years = np.arange(fit.last_year, fit.last_year + 5)
+        np.testing.assert_allclose(predict(parallel[name], years), predict(fit, years))
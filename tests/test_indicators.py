@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import (CAGR_TC, GAP_TARGET, GROWTH_IMPORT, GROWTH_PROD, TARGET_RATIO, TC, TIS,
+                        annualised, compute_indicators, safe_ratio)
+from schema import resolve_schema
+
+
+def _frame():
+    # Lignes volontairement désordonnées ; 2022 manque pour A (croissance annualisée sur 2 ans)
+    return pd.DataFrame({
+        "produits": ["A", "B", "A", "A", "B"],
+        "Année": [2023, 2020, 2020, 2021, 2021],
+        "Importation (en tonne)": [50.0, 0.0, 100.0, 121.0, 10.0],
+        "Production nationale (en tonne)": [150.0, 0.0, 100.0, 80.0, 30.0],
+        "cible_piisah_production": [200.0, np.nan, 100.0, 100.0, 0.0],
+    })
+
+
+def test_safe_ratio_and_annualised():
+    assert np.isnan(safe_ratio(1.0, 0.0)) and np.isnan(safe_ratio(1.0, np.nan))
+    assert annualised(1.21, 2) == pytest.approx(0.1)
+    assert np.isnan(annualised(1.5, 0)) and np.isnan(annualised(-1.0, 1))
+
+
+def test_compute_indicators():
+    df = _frame()
+    out = compute_indicators(df, resolve_schema(df.columns))
+    assert out["Année"].tolist() == df["Année"].tolist()  # ordre conservé
+
+    a23, b20, a20, a21, b21 = range(5)
+    assert out[TC][a20] == pytest.approx(0.5)
+    assert out[TC][a23] + out[TIS][a23] == pytest.approx(1)
+    assert np.isnan(out[TC][b20]) and np.isnan(out[TIS][b20])  # marché nul
+    assert np.isnan(out[GROWTH_IMPORT][a20])                  # première année
+    assert out[GROWTH_IMPORT][a21] == pytest.approx(0.21)
+    assert out[GROWTH_PROD][a23] == pytest.approx((150 / 80) ** 0.5 - 1)
+    assert out[CAGR_TC][a23] == pytest.approx((0.75 / 0.5) ** (1 / 3) - 1)
+    assert np.isnan(out[GROWTH_PROD][b21])                    # 0 -> 30 : indéfini
+    assert out[GAP_TARGET][a23] == 50 and out[TARGET_RATIO][a23] == pytest.approx(0.75)
+    assert np.isnan(out[TARGET_RATIO][b21])                   # cible nulle
@@ -0,0 +1,68 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from dataset import load_dataset
+from indicators import TC
+from ingest import MANIFEST, IngestError, ingest, load_store, store_digest
+
+
+def _workbook(path, notes=True):
+    data = pd.DataFrame({"Produits": ["Riz", "Blé"], "Année": [2023, 2023],
+                         "Importation (en tonne)": ["1 200,5", 300], "Production nationale (en tonne)": [50, 70]})
+    with pd.ExcelWriter(path) as writer:
+        data.to_excel(writer, sheet_name="Données", index=False)
+        if notes:
+            pd.DataFrame({"Remarque": ["Source : douanes"]}).to_excel(writer, sheet_name="Notes", index=False)
+
+
+def test_sheets_without_keys_are_skipped(tmp_path):
+    sources, store = tmp_path / "sources", tmp_path / "store"
+    sources.mkdir()
+    _workbook(sources / "douanes_2023.xlsx")
+
+    report = ingest(str(sources), str(store))
+    assert report.added == ["douanes_2023.xlsx"]
+    assert report.skipped == {"douanes_2023.xlsx": ["Notes"]}
+    df = load_store(str(store))
+    assert sorted(df["produits"]) == ["Blé", "Riz"]
+    assert df.set_index("produits").loc["Riz", "Importation (en tonne)"] == 1200.5
+
+    # Second passage : rien n'est relu
+    assert ingest(str(sources), str(store)).unchanged == ["douanes_2023.xlsx"]
+
+
+def test_unreadable_workbook_names_the_file_and_keeps_progress(tmp_path):
+    sources, store = tmp_path / "sources", tmp_path / "store"
+    sources.mkdir()
+    _workbook(sources / "a_bon.xlsx", notes=False)
+    (sources / "b_corrompu.xlsx").write_bytes(b"pas un classeur")
+
+    with pytest.raises(IngestError, match="b_corrompu.xlsx"):
+        ingest(str(sources), str(store))
+    with open(os.path.join(store, MANIFEST), encoding="utf-8") as f:
+        assert list(json.load(f)) == ["a_bon.xlsx"]
+
+
+def test_store_is_a_data_source(tmp_path):
+    sources, store = tmp_path / "sources", tmp_path / "store"
+    sources.mkdir()
+    _workbook(sources / "douanes_2023.xlsx")
+    ingest(str(sources), str(store))
+
+    ds = load_dataset(str(store))
+    assert ds.filieres == ("Blé", "Riz")
+    assert ds.select(["Riz"])["Importation (en tonne)"].tolist() == [1200.5]
+    assert TC in ds.frame.columns  # indicateurs calculés comme pour un classeur
+
+    # Nouvelle source : nouvelle version du magasin, relue au prochain chargement
+    pd.DataFrame({"produits": ["Mil"], "Année": [2023], "Importation (en tonne)": [10.0],
+                  "Production nationale (en tonne)": [5.0]}).to_excel(sources / "ins_2023.xlsx", index=False)
+    ingest(str(sources), str(store))
+    assert load_dataset(str(store)).filieres == ("Blé", "Mil", "Riz")
+    # Une réécriture du manifeste sans changement de partition ne change pas la version
+    digest = store_digest(str(store))
+    ingest(str(sources), str(store))
+    assert store_digest(str(store)) == digest
@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+
+from memo import MemoStore, memoize
+
+
+def _count_calls(store, default=2, **options):
+    calls = []
+
+    @memoize(memo_store=store, **options)
+    def scaled(x, factor=default):
+        calls.append(x)
+        return x * factor
+
+    return scaled, calls
+
+
+def test_defaults_are_bound_before_hashing(tmp_path):
+    store = MemoStore(str(tmp_path))
+    scaled, calls = _count_calls(store)
+    assert scaled(3) == scaled(3, 2) == scaled(x=3, factor=2) == 6
+    assert len(calls) == 1
+
+    # Même code, constante par défaut modifiée (ex. SCENARIOS) : pas de résultat périmé
+    store.clear_memory()
+    rescaled, _ = _count_calls(MemoStore(str(tmp_path)), default=10)
+    assert rescaled(3) == 30
+
+
+def test_version_invalidates(tmp_path):
+    store = MemoStore(str(tmp_path))
+    first, calls_first = _count_calls(store, version=1)
+    second, calls_second = _count_calls(store, version=2)
+    first(1)
+    second(1)
+    assert len(calls_first) == len(calls_second) == 1
+
+
+def test_large_values_stay_on_disk_only(tmp_path):
+    store = MemoStore(str(tmp_path), max_memory_bytes=8 * 1024)
+    store.set("a" * 64, b"x" * 4096)  # > max_memory_bytes / 8
+    store.set("b" * 64, b"y" * 100)
+    stats = store.stats()
+    assert stats["memory_items"] == 1
+    assert stats["memory_bytes"] <= 8 * 1024
+    found, value = store.get("a" * 64)
+    assert found and value == b"x" * 4096
+    assert store.stats()["disk_hits"] == 1
+
+
+def test_memory_lru_is_bounded_in_bytes(tmp_path):
+    store = MemoStore(str(tmp_path), max_memory_bytes=64 * 1024)
+    for i in range(50):
+        store.set(f"{i:064d}", np.zeros(512))  # ~4 Ko chacune
+    assert store.stats()["memory_bytes"] <= 64 * 1024
+    assert store.stats()["memory_items"] < 50
+
+
+def test_disk_eviction_keeps_size_bounded(tmp_path):
+    store = MemoStore(str(tmp_path), max_bytes=20 * 1024)
+    for i in range(40):
+        store.set(f"{i:064d}", b"z" * 1024)
+    total = sum(os.path.getsize(os.path.join(root, n))
+                for root, _, names in os.walk(tmp_path) for n in names)
+    assert total <= 20 * 1024
+    assert store.stats()["evictions"] > 0
+    # Les plus récentes sont conservées
+    assert store.get(f"{39:064d}")[0]
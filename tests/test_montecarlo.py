@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset import load_dataset
+from indicators import TIS
+from montecarlo import QUANTILES, Uncertainty, dataset_fan_charts, fan_chart
+
+
+def test_fan_charts_start_from_computed_tis(synthetic_dataset):
+    # Même TIS que l'API et la CLI : celui calculé au chargement, pas la colonne du classeur
+    fans = dataset_fan_charts.uncached(synthetic_dataset, 2000, Uncertainty(draws=200, volatility=0.0,
+                                                                            shock_prob=0.0))
+    df = synthetic_dataset.frame.dropna(subset=[TIS])
+    last = df.drop_duplicates(synthetic_dataset.schema.produit, keep="last").set_index(
+        synthetic_dataset.schema.produit)[TIS]
+    chart = fans[TIS]
+    for name in chart.filieres:
+        _, bands = chart.band(name)
+        assert bands[50][0] == pytest.approx(float(last[name]), rel=1e-6)
+
+
+def test_probability_of_reaching_target(synthetic_dataset):
+    fans = dataset_fan_charts.uncached(synthetic_dataset, 2010, Uncertainty(draws=500))
+    prob = fans["Production"].prob_target
+    assert ((prob >= 0) & (prob <= 1) | np.isnan(prob)).all()
+
+
+def test_no_filiere_gives_empty_fan_charts(tmp_path):
+    path = tmp_path / "BD.xlsx"
+    pd.DataFrame({"produits": ["Riz", "Mil"], "Année": [2022, 2023], "Importation (en tonne)": [10.0, 20.0],
+                  "Production nationale (en tonne)": [None, None]}).to_excel(path, index=False)
+    fans = dataset_fan_charts.uncached(load_dataset(str(path)), 2030)
+    for chart in fans.values():
+        assert chart.filieres == () and chart.prob_target.shape == (0,)
+    assert fan_chart((), [], [], 2030).bands.shape == (len(QUANTILES), 0, 1)
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ranking import METRICS, aggregates
+
+
+def _brute_force(dataset, years) -> pd.DataFrame:
+    """Critères recalculés ligne à ligne, filière par filière."""
+    s = dataset.schema
+    rows = []
+    for name in dataset.filieres:
+        df = dataset.select([name], years).astype({s.production: "float64", s.importation: "float64",
+                                                   s.cible: "float64"})
+        market = df.dropna(subset=[s.production, s.importation])
+        prod, imp = market[s.production].sum(), market[s.importation].sum()
+        row = {"Filière": name, "Niveau de TC": prod / (prod + imp) if prod + imp else np.nan,
+               "TCAM du TC": np.nan, "Croissance des importations": np.nan, "Écart à la cible": np.nan}
+        if len(market):
+            first, last = market.iloc[0], market.iloc[-1]
+            span = last[s.annee] - first[s.annee]
+            tc = market[s.production] / (market[s.production] + market[s.importation])
+            if span > 0:
+                if tc.iloc[0] > 0 and tc.iloc[-1] >= 0:
+                    row["TCAM du TC"] = (tc.iloc[-1] / tc.iloc[0]) ** (1 / span) - 1
+                if first[s.importation] > 0:
+                    row["Croissance des importations"] = \
+                        (last[s.importation] / first[s.importation]) ** (1 / span) - 1
+        with_target = df.dropna(subset=[s.production, s.cible])
+        if len(with_target):
+            row["Écart à la cible"] = with_target[s.cible].iloc[-1] - with_target[s.production].iloc[-1]
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize("years", [(1975, 1994), (1980, 1985), (1990, 1990), (1960, 1978)])
+def test_metrics_match_brute_force(synthetic_dataset, years):
+    got = aggregates(synthetic_dataset).metrics(years)
+    expected = _brute_force(synthetic_dataset, years)
+    for metric in METRICS:
+        np.testing.assert_allclose(got[metric].to_numpy(), expected[metric].to_numpy(dtype="float64"),
+                                   rtol=1e-9, err_msg=metric)
+
+
+def test_single_year_has_no_growth(synthetic_dataset):
+    table = aggregates(synthetic_dataset).metrics((1980, 1980))
+    assert table["TCAM du TC"].isna().all()
+    assert (table["Début"] == table["Fin"]).all()
+
+
+def test_rank_orders_and_drops_nan(small_dataset):
+    agg = aggregates(small_dataset)
+    best = agg.rank("Niveau de TC", (2020, 2023), n=2)
+    assert list(best["Filière"]) == ["Riz", "Blé"]
+    worst = agg.rank("Niveau de TC", (2020, 2023), n=1, best=False)
+    assert list(worst["Filière"]) == ["Blé"]
+    # Écart à la cible : une valeur faible est favorable ; Blé n'a pas de production en 2020
+    gap = agg.rank("Écart à la cible", (2020, 2020))
+    assert list(gap["Filière"]) == ["Riz"] and gap["Écart à la cible"].iloc[0] == 100.0
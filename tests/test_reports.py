@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset import load_dataset
+from indicators import TC
+from reports import build_report, generate_reports, report_filenames
+from scenarios import project_frame
+
+
+@pytest.fixture(scope="module")
+def zero_market(tmp_path_factory):
+    """« Vide » n'a ni production ni importation : TC jamais défini."""
+    path = tmp_path_factory.mktemp("reports") / "BD.xlsx"
+    pd.DataFrame({
+        "produits": ["Riz", "Riz", "Vide", "Vide"],
+        "Année": [2022, 2023, 2022, 2023],
+        "Importation (en tonne)": [800.0, 700.0, 0.0, 0.0],
+        "Production nationale (en tonne)": [200.0, 300.0, 0.0, 0.0],
+    }).to_excel(path, index=False)
+    return str(path)
+
+
+def test_project_frame_without_observations():
+    df = pd.DataFrame({"p": pd.Series([], dtype=object), "a": pd.Series([], dtype="int64"),
+                       TC: pd.Series([], dtype="float64")})
+    projection = project_frame.uncached(df, "p", "a", {TC: TC}, 2030)
+    assert projection.filieres == ()
+    assert projection.to_frame().empty
+
+
+def test_report_for_filiere_without_tc(zero_market, tmp_path):
+    ds = load_dataset(zero_market)
+    assert np.isnan(ds.select(["Vide"])[TC]).all()
+    out = build_report(ds, "Vide", 2030, str(tmp_path / "vide.pdf"))
+    assert (tmp_path / "vide.pdf").stat().st_size > 0 and out.endswith("vide.pdf")
+
+
+def test_failures_do_not_stop_the_batch(zero_market, tmp_path):
+    lines = []
+    results, failures = generate_reports(zero_market, str(tmp_path), 2030, ["Riz", "Vide", "Inconnue"],
+                                         jobs=1, progress=lines.append)
+    assert sorted(f for f, _, _ in results) == ["Riz", "Vide"]
+    assert list(failures) == ["Inconnue"]
+    assert "1 en échec" in lines[-1]
+
+
+def test_report_filenames_never_collide():
+    names = report_filenames(["Riz", "riz", "Rîz", "Riz paddy", "Riz-paddy", "???", "!!!"])
+    assert list(names.values()) == ["note_riz.pdf", "note_riz-2.pdf", "note_riz-3.pdf", "note_riz_paddy.pdf",
+                                    "note_riz_paddy-2.pdf", "note_sans_nom.pdf", "note_sans_nom-2.pdf"]
+
+
+def test_homonym_filieres_get_distinct_files(tmp_path):
+    path = tmp_path / "BD.xlsx"
+    pd.DataFrame({"produits": ["Maïs", "Mais"], "Année": [2023, 2023], "Importation (en tonne)": [10.0, 20.0],
+                  "Production nationale (en tonne)": [5.0, 6.0]}).to_excel(path, index=False)
+    results, failures = generate_reports(str(path), str(tmp_path / "notes"), 2030, jobs=1, progress=None)
+    assert not failures
+    assert sorted(os.path.basename(p) for _, p, _ in results) == ["note_mais-2.pdf", "note_mais.pdf"]
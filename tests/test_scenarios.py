@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import TC, TIS
+from scenarios import SCENARIOS, Scenario, dataset_projection, production_sweep, project, project_frame, sweep
+
+
+def test_project_closed_form():
+    start = np.array([100.0, 50.0])
+    out = project(start, np.arange(-1, 4))
+    assert out.shape == (2, len(SCENARIOS), 5)
+    assert np.isnan(out[:, :, 0]).all()  # pas négatif
+    for j, s in enumerate(SCENARIOS):
+        for t in range(4):
+            expected = start * (1 + s.shock) * (1 + s.growth) ** t * (1 + s.linear * t)
+            np.testing.assert_allclose(out[:, j, t + 1], expected)
+
+
+def test_project_per_filiere_steps():
+    out = project([10.0, 10.0], np.array([[0, 1], [-1, 0]]), [Scenario("x", growth=0.1)])
+    np.testing.assert_allclose(out[0, 0], [10.0, 11.0])
+    assert np.isnan(out[1, 0, 0]) and out[1, 0, 1] == 10.0
+
+
+def test_project_frame_starts_at_each_last_year():
+    df = pd.DataFrame({"p": ["A", "A", "B"], "a": [2020, 2021, 2019], "TC": [0.5, 0.6, 0.2]})
+    proj = project_frame(df, "p", "a", {"TC": "TC"}, 2023, [Scenario("x", growth=0.5)])
+    assert proj.filieres == ("A", "B")
+    years, values = proj.series("TC", "A")
+    assert list(years) == [2021, 2022, 2023]
+    np.testing.assert_allclose(values["x"], [0.6, 0.9, 1.35])
+    years, _ = proj.series("TC", "B")
+    assert list(years) == [2019, 2020, 2021, 2022, 2023]
+    assert len(proj.to_frame()) == 3 + 5
+
+
+def test_project_frame_empty():
+    df = pd.DataFrame({"p": pd.Series(dtype=object), "a": pd.Series(dtype="int64"), "TC": pd.Series(dtype=float)})
+    proj = project_frame(df, "p", "a", {"TC": "TC"}, 2030)
+    assert proj.filieres == () and proj.to_frame().empty
+
+
+def test_sweep_matches_trajectory_and_targets():
+    cube = sweep(["A", "B"], [100.0, 100.0], [2020, 2022], [120.0, np.nan],
+                 growth=[0.0, 0.1], shock=[0.0, -0.5], years=[2021, 2022, 2023])
+    assert cube.values.shape == (2, 2, 2, 3)
+    # A, croissance 10 %, sans choc, 2022 : 100 × 1.1²
+    assert cube.values[0, 1, 0, 1] == pytest.approx(121.0, rel=1e-6)
+    np.testing.assert_allclose(cube.ratio("A", 2022), cube.values[0, :, :, 1] / 120.0)
+
+    reach = cube.reach_year("A")
+    assert reach[1, 0] == 2022          # 110 puis 121 >= 120
+    assert np.isnan(reach[0, 0])         # croissance nulle : jamais
+    assert np.isnan(reach[1, 1])         # choc de -50 %
+    # Seule A a une cible
+    np.testing.assert_array_equal(cube.share_reaching(2023), [[0.0, 0.0], [1.0, 0.0]])
+
+
+def test_production_sweep_uses_last_observation(small_dataset):
+    cube = production_sweep(small_dataset, [0.0], [0.0], [2023, 2024])
+    assert cube.filieres == ("Blé", "Riz")
+    np.testing.assert_allclose(cube.values[:, 0, 0, 0], [200.0, 350.0])
+    np.testing.assert_allclose(cube.target, [250.0, 700.0])
+
+
+def test_dataset_projection_matches_filtered_frame(small_dataset):
+    proj = dataset_projection(small_dataset, 2026)
+    df = small_dataset.frame.dropna(subset=[TIS, "Production nationale (en tonne)", "Importation (en tonne)"])
+    df[TC] = df[TC].fillna(0)
+    expected = project_frame.uncached(df, "produits", "Année", {TIS: TIS, TC: TC}, 2026)
+    assert proj.filieres == expected.filieres
+    pd.testing.assert_frame_equal(proj.to_frame(), expected.to_frame())
+
+
+@pytest.mark.parametrize("year", [2020, 2024, 2021.5])
+def test_sweep_rejects_years_outside_the_grid(year):
+    cube = sweep(["A"], [1.0], [2020], [2.0], growth=[0.1], shock=[0.0], years=[2021, 2022, 2023])
+    with pytest.raises(ValueError, match="hors du balayage"):
+        cube.ratio("A", year)
+    with pytest.raises(ValueError, match="hors du balayage"):
+        cube.share_reaching(year)
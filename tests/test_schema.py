@@ -0,0 +1,40 @@
+import pytest
+
+from schema import normalize, resolve_schema, schema_from_dict, schema_to_dict
+
+BD_COLUMNS = ["produits", "Taux de couverture", "Taux d'import-substitution", "Année",
+              "Importation (en tonne)", "Production nationale (en tonne)",
+              "Demande nationale (en tonne)", "cible_piisah_production"]
+
+
+def test_normalize():
+    assert normalize(" Année ") == "annee"
+    assert normalize("cible_piisah_production") == "cible piisah production"
+    assert normalize("Filière (libellé)") == "filiere libelle"
+
+
+def test_resolve_bd_global_columns():
+    schema = resolve_schema(BD_COLUMNS)
+    assert schema.produit == "produits"
+    assert schema.annee == "Année"
+    assert schema.importation == "Importation (en tonne)"
+    assert schema.production == "Production nationale (en tonne)"  # pas la cible
+    assert schema.cible == "cible_piisah_production"
+    assert schema.taux == "Taux de couverture"
+    assert schema.missing == ()
+
+
+def test_variants_missing_and_ambiguous():
+    schema = resolve_schema(["FILIÈRE", "year", "Import", "Prod.", "Importation (douanes)", "Importation (INS)"])
+    assert (schema.produit, schema.annee, schema.production) == ("FILIÈRE", "year", "Prod.")
+    # Alias le plus spécifique d'abord, première colonne retenue, ambiguïté signalée
+    assert schema.importation == "Importation (douanes)"
+    assert ("importation", ("Importation (douanes)", "Importation (INS)")) in schema.ambiguous
+    assert set(schema.missing) == {"cible", "taux"}
+    with pytest.raises(ValueError, match="cible"):
+        schema.require("produit", "cible")
+
+
+def test_dict_round_trip():
+    schema = resolve_schema(BD_COLUMNS + ["Taux brut"])
+    assert schema_from_dict(schema_to_dict(schema)) == schema
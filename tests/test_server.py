@@ -0,0 +1,79 @@
+import json
+import threading
+from http.client import HTTPConnection
+from http.server import ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from isub import server
+
+
+@pytest.fixture
+def api(small_dataset):
+    """Serveur sur un port libre ; `api(path, data_path=...)` -> (statut, en-têtes, JSON)."""
+    servers = []
+
+    def get(path, data_path=small_dataset.path, headers=None):
+        attrs = {"data_path": data_path, "cache": server.ResponseCache()}
+        handler = type("Handler", (server.ApiHandler,), attrs)
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        servers.append(httpd)
+        conn = HTTPConnection("127.0.0.1", httpd.server_port, timeout=10)
+        conn.request("GET", path, headers=headers or {})
+        resp = conn.getresponse()
+        body = resp.read()
+        conn.close()
+        return resp.status, dict(resp.getheaders()), json.loads(body) if body else None
+
+    yield get
+    for httpd in servers:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_etag_and_not_modified(api):
+    status, headers, body = api("/filieres")
+    assert status == 200 and body == {"filieres": ["Blé", "Riz"]}
+    etag = headers["ETag"]
+    assert headers["Cache-Control"] == "no-cache"
+
+    status, headers, body = api("/filieres", headers={"If-None-Match": f'"autre", {etag}'})
+    assert status == 304 and body is None
+    assert headers["ETag"] == etag and headers["Cache-Control"] == "no-cache"
+    # Requête différente, ETag différent
+    assert api("/series?filiere=Riz")[1]["ETag"] != etag
+
+
+def test_series_filter(api):
+    status, _, body = api("/series?filiere=Riz")
+    assert status == 200
+    assert [row["Année"] for row in body["donnees"]] == [2020, 2021, 2022, 2023]
+
+
+@pytest.mark.parametrize("path, status", [
+    ("/inconnu", 404),
+    ("/series?filiere=Inconnue", 404),
+    ("/scenarios?horizon=demain", 400),
+    ("/scenarios?horizon=3000", 400),
+])
+def test_client_errors(api, path, status):
+    got, _, body = api(path)
+    assert got == status and "erreur" in body
+
+
+def test_unusable_workbook_is_503(api, tmp_path):
+    path = tmp_path / "sans_colonnes.xlsx"
+    pd.DataFrame({"x": [1]}).to_excel(path, index=False)
+    status, _, body = api("/filieres", data_path=str(path))
+    assert status == 503 and body["erreur"].startswith("données indisponibles")
+    assert api("/filieres", data_path=str(tmp_path / "absent.xlsx"))[0] == 503
+
+
+def test_unexpected_error_is_json_500(api, monkeypatch):
+    def boom(dataset, query):
+        raise RuntimeError("panne")
+    monkeypatch.setitem(server.ROUTES, "/filieres", boom)
+    status, _, body = api("/filieres?x=1")
+    assert status == 500 and "panne" in body["erreur"]
@@ -0,0 +1,90 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+import dataset
+from dataset import SIDECAR_VERSION, _attach_snapshot, _publish_snapshot, load_dataset, read_pointer, snapshot_dir
+
+pytest.importorskip("pyarrow")
+
+
+def _workbook(path, riz=100.0):
+    pd.DataFrame({
+        "produits": ["Riz", "Riz", "Mil"],
+        "Année": [2022, 2023, 2023],
+        "Importation (en tonne)": [riz, "1 000,5", 50.0],
+        "Production nationale (en tonne)": [10.0, 20.0, 30.0],
+    }).to_excel(path, index=False)
+    return str(path)
+
+
+def _arrow_files(path):
+    return sorted(e for e in os.listdir(snapshot_dir(path)) if e.endswith(".arrow"))
+
+
+def test_publish_then_attach_round_trip(tmp_path):
+    path = _workbook(tmp_path / "BD.xlsx")
+    ds = load_dataset(path)
+    assert read_pointer(path) == {"file": _arrow_files(path)[0], "digest": ds.digest, "version": SIDECAR_VERSION}
+
+    attached = _attach_snapshot(ds.path, ds.digest)
+    pd.testing.assert_frame_equal(attached._frame, dataset._parse(ds.path, ds.digest)._frame)
+    assert attached.schema == ds.schema and attached.coerced == ds.coerced
+    assert attached.select(["Riz"])["Importation (en tonne)"].tolist() == [100.0, 1000.5]
+
+
+def test_version_switch_keeps_two_snapshots(tmp_path):
+    path = _workbook(tmp_path / "BD.xlsx")
+    digests = []
+    for riz in (1.0, 2.0, 3.0):
+        _workbook(path, riz)
+        ds = dataset._parse(os.path.abspath(path), dataset.file_digest(path))
+        _publish_snapshot(ds)
+        digests.append(ds.digest)
+        assert read_pointer(ds.path)["digest"] == ds.digest
+
+    assert len(_arrow_files(path)) == 2
+    assert _attach_snapshot(os.path.abspath(path), digests[0]) is None  # version remplacée
+    latest = _attach_snapshot(os.path.abspath(path), digests[-1])
+    assert latest.select(["Riz"], (2022, 2022))["Importation (en tonne)"].tolist() == [3.0]
+
+
+@pytest.mark.parametrize("pointer", [
+    {"version": SIDECAR_VERSION - 1},      # nettoyage plus ancien
+    {"digest": "0" * 64},                 # autre version du classeur
+    {"file": "absent.arrow"},             # fichier supprimé
+])
+def test_stale_pointer_is_ignored(tmp_path, pointer):
+    path = os.path.abspath(_workbook(tmp_path / "BD.xlsx"))
+    ds = load_dataset(path)
+    current = read_pointer(path)
+    with open(os.path.join(snapshot_dir(path), "CURRENT"), "w", encoding="utf-8") as f:
+        json.dump({**current, **pointer}, f)
+    assert _attach_snapshot(path, ds.digest) is None
+    # Le classeur est relu puis l'instantané republié
+    dataset._snapshots.pop(path)
+    assert load_dataset(path).frame.equals(ds.frame)
+    assert read_pointer(path) == current
+
+
+def test_snapshot_metadata_must_match_pointer(tmp_path):
+    path = os.path.abspath(_workbook(tmp_path / "BD.xlsx"))
+    ds = load_dataset(path)
+    other = _workbook(tmp_path / "autre.xlsx", riz=7.0)
+    assert load_dataset(other).digest != ds.digest
+    # CURRENT annonce la bonne empreinte mais désigne l'instantané d'un autre fichier
+    os.replace(os.path.join(snapshot_dir(other), read_pointer(other)["file"]),
+               os.path.join(snapshot_dir(path), read_pointer(path)["file"]))
+    assert _attach_snapshot(path, ds.digest) is None
+
+
+def test_read_only_cache_directory(tmp_path):
+    path = os.path.abspath(_workbook(tmp_path / "BD.xlsx"))
+    with open(snapshot_dir(path), "w") as f:  # impossible d'y créer le répertoire
+        f.write("")
+    ds = load_dataset(path)
+    assert ds.filieres == ("Mil", "Riz")
+    assert read_pointer(path) == {}
+    assert sorted(os.listdir(tmp_path)) == ["BD.xlsx", "BD.xlsx.snapshots"]  # aucun fichier temporaire
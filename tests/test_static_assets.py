@@ -0,0 +1,28 @@
+import hashlib
+import os
+import subprocess
+import sys
+
+import pytest
+
+import static_assets
+
+
+def test_import_does_not_load_the_data_stack():
+    code = "import sys, static_assets; print(sorted({'pandas', 'pyarrow', 'dataset'} & set(sys.modules)))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert out.stdout.strip() == "[]"
+
+
+def test_variant_is_resized_and_named_by_content(tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    src = tmp_path / "logo.png"
+    Image.new("RGB", (400, 200), "green").save(src)
+    monkeypatch.setattr(static_assets, "BUILD_DIR", str(tmp_path / "build"))
+
+    out = static_assets.optimized_asset(str(src), 100)
+    digest = hashlib.sha256(src.read_bytes()).hexdigest()[:12]
+    assert os.path.basename(out) == f"logo-{digest}-100.webp"
+    with Image.open(out) as im:
+        assert im.size == (100, 50)
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import clean_numeric, clean_numeric_frame, find_column, selection_csv_bytes, widen_floats
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1\u00a0234,5", 1234.5),          # espace insécable
+    ("1\u202f234\u202f567", 1234567),  # espace fine insécable
+    ("1\u2009234", 1234),              # espace fine
+    ("1 234 567,25", 1234567.25),
+    ("12,5", 12.5),                  # virgule décimale
+    ("3.5", 3.5),
+    ("1.234,5", 1234.5),             # point de milliers, virgule décimale
+    ("1,234.5", 1234.5),             # virgule de milliers, point décimal
+    ("1.234.567,89", 1234567.89),
+    ("1,234,567.89", 1234567.89),
+    ("1,234,567", 1234567),          # séparateur répété : milliers
+    ("1.234.567", 1234567),
+    ("12,5 %", 0.125),               # taux en ratio
+    ("12.5%", 0.125),
+    ("7", 7),
+])
+def test_clean_numeric_formats(text, expected):
+    assert clean_numeric(pd.Series([text], dtype=object))[0] == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("text", ["n.d.", "", "-", "abc"])
+def test_clean_numeric_unparseable_is_nan(text):
+    assert np.isnan(clean_numeric(pd.Series([text], dtype=object))[0])
+
+
+def test_numeric_columns_are_untouched():
+    s = pd.Series([1.5, 2.5])
+    assert clean_numeric(s) is s
+
+
+def test_clean_numeric_frame_mixed_object_columns():
+    df = pd.DataFrame({
+        "produits": ["Riz", "Blé", "Mais", "Soja"],
+        "Importation": pd.Series([1200.0, "1 234,5", None, "n.d."], dtype=object),
+        "Taux": pd.Series(["12,5 %", 0.3, "1,234.5", ""], dtype=object),
+        "Année": [2020, 2021, 2022, 2023],
+    })
+    out, report = clean_numeric_frame(df, exclude=["produits"])
+    assert out["Importation"].tolist()[:2] == [1200.0, 1234.5]
+    assert np.isnan(out["Importation"][2]) and np.isnan(out["Importation"][3])
+    assert out["Taux"].tolist()[:3] == pytest.approx([0.125, 0.3, 1234.5])
+    assert out["Année"] is df["Année"] or out["Année"].equals(df["Année"])
+    assert out["produits"].tolist() == df["produits"].tolist()
+    # Seules les valeurs non vides perdues sont signalées
+    assert report == {"Importation": ["n.d."]}
+
+
+def test_find_column_is_case_insensitive_and_ordered():
+    df = pd.DataFrame(columns=["Produits", "Année", "Importation (en tonne)"])
+    assert find_column(df, ["annee", "année"]) == "Année"
+    assert find_column(df, ["IMPORT"]) == "Importation (en tonne)"
+    assert find_column(df, ["cible"]) is None
+
+
+def test_widen_floats_uses_shortest_decimal():
+    df = pd.DataFrame({"x": np.array([0.1, 707247360.0], dtype="float32"), "y": [1, 2]})
+    out = widen_floats(df)
+    assert out["x"].dtype == "float64"
+    assert out["x"].tolist() == [0.1, 707247360.0]
+    assert df["x"].dtype == "float32"
+
+
+def test_selection_csv_bytes_matches_select(small_dataset):
+    csv = selection_csv_bytes(small_dataset, ["Riz"], (2021, 2022)).decode("utf-8").splitlines()
+    assert len(csv) == 3 and csv[1].startswith("Riz,")
+    assert selection_csv_bytes(small_dataset, ["Riz"], (2021, 2022)) == selection_csv_bytes.uncached(
+        small_dataset, ["Riz"], (2021, 2022))
+
+
+def test_clean_numeric_keeps_a_duplicate_index():
+    s = pd.Series(["1.234,5", "7", "1,234.5", "2"], index=[0, 0, 1, 1], dtype=object)
+    out = clean_numeric(s)
+    assert out.index.tolist() == [0, 0, 1, 1]
+    assert out.tolist() == [1234.5, 7.0, 1234.5, 2.0]
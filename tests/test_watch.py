@@ -0,0 +1,73 @@
+import os
+
+import pandas as pd
+
+import dataset
+from dataset import _watch, load_dataset
+
+
+class _Ticks:
+    """Remplace l'événement d'arrêt : chaque période exécute l'étape suivante, puis arrêt."""
+
+    def __init__(self, *steps):
+        self.steps = list(steps)
+
+    def wait(self, interval):
+        if not self.steps:
+            return True
+        self.steps.pop(0)()
+        return False
+
+
+def _workbook(path, riz=100.0, columns=True):
+    df = pd.DataFrame({"produits": ["Riz", "Riz"], "Année": [2022, 2023],
+                       "Importation (en tonne)": [riz, 5.0], "Production nationale (en tonne)": [1.0, 2.0]})
+    if not columns:
+        df = df.rename(columns={"produits": "x", "Année": "y"})
+    df.to_excel(path, index=False)
+    return os.path.abspath(path)
+
+
+def _touch(path, riz=None, columns=True):
+    """Réécrit le classeur avec une date de modification distincte."""
+    def step():
+        if riz is not None:
+            _workbook(path, riz, columns)
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    return step
+
+
+def _imports(path):
+    return dataset._snapshots[path].select(["Riz"], (2022, 2022))["Importation (en tonne)"].tolist()
+
+
+def test_reload_waits_for_a_stable_period(tmp_path, monkeypatch):
+    path = _workbook(tmp_path / "BD.xlsx")
+    load_dataset(path)
+    calls = []
+    monkeypatch.setattr(dataset, "_refresh", lambda p, sig: calls.append(sig))
+
+    seen = []
+    # Écriture en deux temps : rien n'est relu tant que la signature change d'une période à l'autre
+    _watch(path, 0, _Ticks(_touch(path, 1.0), _touch(path), lambda: seen.append(list(calls)), lambda: None))
+    assert seen == [[]]
+    assert calls == [dataset._signature(path)]  # une seule relecture, après une période stable
+
+
+def test_new_version_replaces_snapshot(tmp_path):
+    path = _workbook(tmp_path / "BD.xlsx")
+    load_dataset(path)
+    _watch(path, 0, _Ticks(_touch(path, 2.0), lambda: None))
+    assert _imports(path) == [2.0]
+    assert load_dataset(path).digest == dataset.file_digest(path)
+
+
+def test_invalid_file_keeps_previous_snapshot(tmp_path):
+    path = _workbook(tmp_path / "BD.xlsx")
+    before = load_dataset(path)
+    _watch(path, 0, _Ticks(_touch(path, 3.0, columns=False), lambda: None))
+    assert dataset._snapshots[path] is before
+    # Le fichier corrigé est ensuite relu normalement
+    _watch(path, 0, _Ticks(_touch(path, 4.0), lambda: None))
+    assert _imports(path) == [4.0]
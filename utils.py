@@ -1,6 +1,11 @@
+import numpy as np
 import pandas as pd
-from io import BytesIO
+from io import BytesIO, TextIOWrapper
+import csv
 import re
+import zipfile
+import xlsxwriter
+from memo import memoize
 
 def find_column(df: pd.DataFrame, candidates):
     for cand in candidates:
@@ -9,38 +14,189 @@ def find_column(df: pd.DataFrame, candidates):
                 return c
     return None
 
+# Nettoyage des nombres au format français en une seule passe :
+# espaces (normales, insécables, fines) retirés, virgule décimale -> point, "%" retiré
+_BLANKS = {" ": None, "\t": None, "\n": None, "\u00a0": None, "\u202f": None, "\u2009": None, "%": None}
+_NUMBER_TABLE = str.maketrans({**_BLANKS, ",": "."})
+_BLANK_TABLE = str.maketrans(_BLANKS)  # point décimal : la virgule n'est pas traduite
+
+def _needs_cleaning(series: pd.Series) -> bool:
+    # Les colonnes déjà numériques (float64/int64 renvoyées par openpyxl) sont laissées telles quelles
+    return not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series)
+
+def _parse_numbers(raw: pd.Series) -> pd.Series:
+    # Travail sur un index positionnel (l'index d'origine peut contenir des doublons)
+    text = raw.astype(str).reset_index(drop=True)
+    values = text.str.translate(_NUMBER_TABLE)
+    # Plusieurs séparateurs : le dernier est décimal, sauf s'il est répété
+    # ("1.234,5" et "1,234.5" -> 1234.5 ; "1,234,567" et "1.234.567" -> 1234567)
+    several = text.str.contains(r"[.,].*[.,]", regex=True)
+    if several.any():
+        sub = text[several]
+        comma_last = sub.str.rfind(",") > sub.str.rfind(".")
+        for rows, sep, other, table in ((comma_last, ",", ".", _NUMBER_TABLE),
+                                        (~comma_last, ".", ",", _BLANK_TABLE)):
+            part = sub[rows].str.replace(other, "", regex=False)
+            part = part.where(part.str.count(re.escape(sep)) <= 1, part.str.replace(sep, "", regex=False))
+            values[part.index] = part.str.translate(table)
+    out = pd.to_numeric(values, errors="coerce")
+    # "12,5 %" -> 0.125 (les taux sont stockés en ratio)
+    pct = text.str.contains("%", regex=False)
+    if pct.any():
+        out = out.where(~pct, out / 100)
+    out.index = raw.index
+    return out
+
 def clean_numeric(series: pd.Series):
-    return pd.to_numeric(series.astype(str)
-                         .str.replace(r"\s+", "", regex=True)
-                         .str.replace(",", "."), 
-                         errors="coerce")
+    if not _needs_cleaning(series):
+        return series
+    return _parse_numbers(series)
+
+def clean_numeric_frame(df: pd.DataFrame, exclude=()):
+    """
+    Nettoie toutes les colonnes non numériques de `df` en un seul passage
+    (les colonnes sont empilées puis reconverties ensemble).
+    Renvoie (DataFrame nettoyé, {colonne: valeurs brutes converties en NaN}).
+    """
+    cols = [c for c in df.columns if c not in exclude and _needs_cleaning(df[c])]
+    out = df.copy(deep=False)
+    if not cols:
+        return out, {}
+
+    raw = pd.Series(df[cols].to_numpy(dtype=object).ravel(order="F"))
+    parsed = _parse_numbers(raw).to_numpy(dtype="float64")
+
+    # Valeurs non vides perdues à la conversion
+    lost = (pd.isna(parsed) & raw.notna()
+            & (raw.astype(str).str.translate(_NUMBER_TABLE) != "")).to_numpy()
+
+    n = len(df)
+    raw = raw.to_numpy()
+    report = {}
+    for i, c in enumerate(cols):
+        block = slice(i * n, (i + 1) * n)
+        out[c] = parsed[block]
+        if lost[block].any():
+            report[c] = sorted({str(v) for v in raw[block][lost[block]]})
+    return out, report
+
+def widen_float(values):
+    """float32 -> float64 par l'écriture décimale la plus courte (0.1 et non 0.10000000149)."""
+    return np.asarray(values, dtype="float32").astype(str).astype("float64")
+
+def widen_floats(df: pd.DataFrame) -> pd.DataFrame:
+    """Copie superficielle où les colonnes float32 (base compactée) sont élargies pour l'export."""
+    cols = [c for c in df.columns if df[c].dtype == "float32"]
+    if not cols:
+        return df
+    out = df.copy(deep=False)
+    for c in cols:
+        out[c] = widen_float(out[c].to_numpy())
+    return out
 
 def clean_sheet_name(name: str):
     """Remplace les caractères interdits par un underscore"""
     return re.sub(r'[\[\]\:\*\?\/\\]', '_', str(name))[:31]  # Excel limite 31 caractères
 
-def to_excel_bytes(dfs):
+# Nombre de lignes converties à la fois lors des exports (mémoire bornée)
+EXPORT_CHUNK_ROWS = 50_000
+
+def _as_sheets(data, default_name="Données"):
+    """Normalise l'entrée en {nom_feuille: DataFrame | Series | str}."""
+    if isinstance(data, dict):
+        return data
+    return {default_name: data}
+
+def _columns(df_sheet):
+    """En-têtes et colonnes à écrire, sans copier les données."""
+    # Convertir Series en colonne unique
+    if isinstance(df_sheet, pd.Series):
+        return [clean_sheet_name(df_sheet.name if df_sheet.name is not None else 0)], [df_sheet]
+    # Convertir string en une cellule
+    if isinstance(df_sheet, str):
+        return ["Contenu"], [pd.Series([df_sheet])]
+    return [clean_sheet_name(c) for c in df_sheet.columns], [df_sheet.iloc[:, i] for i in range(df_sheet.shape[1])]
+
+def _iter_rows(columns, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Lignes de valeurs Python (None pour les manquants), converties par blocs."""
+    n = len(columns[0]) if columns else 0
+    for start in range(0, n, chunk_rows):
+        chunk = []
+        for col in columns:
+            part = col.iloc[start:start + chunk_rows]
+            if part.dtype == "float32":
+                part = pd.Series(widen_float(part.to_numpy()))
+            chunk.append(part.astype(object).where(part.notna(), None).tolist())
+        yield from zip(*chunk)
+
+@memoize
+def to_excel_bytes(dfs, sheet_name="Données"):
     """
-    Convertit un dictionnaire {nom_feuille: df} en fichier Excel en bytes.
-    Gère DataFrame, Series et str.
+    Convertit un DataFrame, une Series, un str ou un dictionnaire {nom_feuille: df}
+    en fichier Excel en bytes. Les lignes sont écrites au fil de l'eau
+    (mode constant_memory d'xlsxwriter), sans copie des DataFrame.
     """
     output = BytesIO()
-    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-        for sheet_name, df_sheet in dfs.items():
-            # Nettoyage du nom de feuille
-            sheet_name_clean = clean_sheet_name(sheet_name)
-            
-            # Convertir Series en DataFrame
-            if isinstance(df_sheet, pd.Series):
-                df_to_write = df_sheet.to_frame()
-                df_to_write.columns = [clean_sheet_name(df_to_write.columns[0])]
-            # Convertir string en DataFrame
-            elif isinstance(df_sheet, str):
-                df_to_write = pd.DataFrame([df_sheet], columns=["Contenu"])
-            # Si c'est déjà un DataFrame
-            else:
-                df_to_write = df_sheet.copy()
-                df_to_write.columns = [clean_sheet_name(c) for c in df_to_write.columns]
-            
-            df_to_write.to_excel(writer, sheet_name=sheet_name_clean, index=False)
+    workbook = xlsxwriter.Workbook(output, {"constant_memory": True,
+                                            "default_date_format": "dd/mm/yyyy",
+                                            "remove_timezone": True})
+    bold = workbook.add_format({"bold": True})
+    for name, df_sheet in _as_sheets(dfs, sheet_name).items():
+        # Nettoyage du nom de feuille
+        worksheet = workbook.add_worksheet(clean_sheet_name(name))
+        header, columns = _columns(df_sheet)
+        worksheet.write_row(0, 0, header, bold)
+        for r, row in enumerate(_iter_rows(columns), start=1):
+            worksheet.write_row(r, 0, row)
+    workbook.close()
+    return output.getvalue()
+
+@memoize
+def to_csv_zip_bytes(dfs, sheet_name="Données"):
+    """Archive ZIP contenant un CSV (UTF-8, séparateur ;) par feuille."""
+    output = BytesIO()
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, df_sheet in _as_sheets(dfs, sheet_name).items():
+            header, columns = _columns(df_sheet)
+            with zf.open(f"{clean_sheet_name(name)}.csv", "w") as raw:
+                text = TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+                writer = csv.writer(text, delimiter=";")
+                writer.writerow(header)
+                writer.writerows(_iter_rows(columns))
+                text.flush()
+                text.detach()
+    return output.getvalue()
+
+@memoize
+def to_parquet_bytes(data):
+    """DataFrame ou Series en fichier Parquet (bytes)."""
+    if isinstance(data, pd.Series):
+        data = data.to_frame()
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError("to_parquet_bytes attend un DataFrame ou une Series")
+    output = BytesIO()
+    data.to_parquet(output, index=False)
     return output.getvalue()
+
+@memoize
+def selection_csv_bytes(dataset, filieres, years):
+    """
+    CSV (UTF-8) de `dataset.select(filieres, years)`, construit une fois par
+    (version des données, sélection) : la clé ne hache que l'empreinte du jeu
+    de données et la sélection, pas les lignes.
+    """
+    return widen_floats(dataset.select(list(filieres), tuple(years))).to_csv(index=False).encode("utf-8")
+
+# Formats de téléchargement de la base complète
+_EXPORTS = {"xlsx": to_excel_bytes, "csv.zip": to_csv_zip_bytes, "parquet": to_parquet_bytes}
+
+@memoize
+def dataset_export_bytes(dataset, fmt: str):
+    """
+    Base complète (colonnes du classeur, cf. `Dataset.source_frame`) au format
+    "xlsx", "csv.zip" ou "parquet", construite une fois par (version des données,
+    format) : la clé ne hache que l'empreinte du jeu de données, pas les lignes.
+    """
+    if fmt not in _EXPORTS:
+        raise ValueError(f"format d'export inconnu : {fmt}")
+    return _EXPORTS[fmt].uncached(dataset.source_frame())